@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Benchmark de horarios libres: 20 veterinarios y meses de agenda ya ocupada
+Ejecuta: python benchmarks/bench_availability.py [tamaño]   (1k, 10k, 100k, 1M)
+"""
+
+import os
+import sys
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+
+# Agregar el directorio del proyecto al path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.availability import AvailabilityFinder
+from utils.database import Database
+from utils.dataset_generator import DatasetGenerator, parse_size
+from utils.event_manager import EventManager
+from utils.indexes import DataIndexes
+
+
+def main():
+    """Función principal"""
+    size = parse_size(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    with tempfile.TemporaryDirectory() as folder:
+        database = Database(os.path.join(folder, "bench.db"))
+        DatasetGenerator(size).load_into(database)
+        indexes = DataIndexes(database, EventManager())
+        finder = AvailabilityFinder(indexes)
+
+        vet_ids = [vet['id'] for vet in indexes.veterinarios.values()][:20]
+        # Buscar dentro del período generado, donde la agenda está más llena
+        ultima = max(date.fromisoformat(cita['fecha']) for cita in indexes.citas.values())
+        inicio = ultima - timedelta(days=180)
+        desde = datetime.combine(inicio, datetime.min.time())
+
+        print(f"Citas: {len(indexes.citas):,} | Veterinarios: {len(vet_ids)}")
+        print(f"{'Búsqueda':>24} | {'Primera (ms)':>12} | {'Siguientes (ms)':>15}")
+        print("-" * 58)
+        cases = (
+            ("1 vet, 6 turnos", vet_ids[:1], 30, 6),
+            ("20 vets, 6 turnos", vet_ids, 30, 6),
+            ("20 vets, 50 turnos 1 h", vet_ids, 60, 50),
+        )
+        for label, vets, duration, limit in cases:
+            begin = time.perf_counter()
+            finder.find(vets, inicio, ultima, duration, limit, desde)
+            first = time.perf_counter() - begin
+            begin = time.perf_counter()
+            for _ in range(20):
+                finder.find(vets, inicio, ultima, duration, limit, desde)
+            repeat = (time.perf_counter() - begin) / 20
+            print(f"{label:>24} | {first * 1000:>12.2f} | {repeat * 1000:>15.3f}")
+        database.close()
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
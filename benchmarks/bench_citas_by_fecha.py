@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Benchmark de citas por fecha: recorrido lineal vs índice ordenado por fecha
+(rangos de días y detección de cruces de horario de un veterinario)
+Ejecuta: python benchmarks/bench_citas_by_fecha.py [tamaño]   (1k, 10k, 100k, 1M)
+"""
+
+import os
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+# Agregar el directorio del proyecto al path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.database import Database
+from utils.dataset_generator import DatasetGenerator, parse_size
+from utils.event_manager import EventManager
+from utils.indexes import DataIndexes, cita_duration, minute_of_day
+
+
+def measure(function, repeat=20):
+    """Tiempo promedio por llamada en milisegundos"""
+    begin = time.perf_counter()
+    for _ in range(repeat):
+        result = function()
+    return (time.perf_counter() - begin) / repeat * 1000, len(result)
+
+
+def main():
+    """Función principal"""
+    size = parse_size(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    with tempfile.TemporaryDirectory() as folder:
+        database = Database(os.path.join(folder, "bench.db"))
+        DatasetGenerator(size).load_into(database)
+        indexes = DataIndexes(database, EventManager())
+        citas = list(indexes.citas.values())
+        index = indexes.citas_by_fecha
+
+        # Una cita existente: su día, su veterinario y su horario
+        muestra = citas[len(citas) // 2]
+        dia = date.fromisoformat(muestra['fecha'])
+        lunes = dia - timedelta(days=dia.weekday())
+        vet_id = muestra['id_veterinario']
+        hora = muestra['hora']
+
+        def scan_conflicts():
+            inicio = minute_of_day(hora)
+            return [c['id_cita'] for c in citas
+                    if c['id_veterinario'] == vet_id and c['fecha'] == dia.isoformat()
+                    and minute_of_day(c['hora']) < inicio + index.DURATION
+                    and inicio < minute_of_day(c['hora']) + cita_duration(c)]
+
+        def scan(inicio, fin, vet=None):
+            desde, hasta = inicio.isoformat(), fin.isoformat()
+            return [c['id_cita'] for c in citas
+                    if desde <= c['fecha'] <= hasta and (vet is None or c['id_veterinario'] == vet)]
+
+        cases = (
+            ("Día", lambda: scan(dia, dia), lambda: index.day(dia)),
+            ("Semana", lambda: scan(lunes, lunes + timedelta(days=6)), lambda: index.week(dia)),
+            ("Semana/vet", lambda: scan(lunes, lunes + timedelta(days=6), vet_id),
+             lambda: index.week(dia, vet_id)),
+            ("Cruce/vet", scan_conflicts,
+             lambda: index.overlapping(vet_id, dia, minute_of_day(hora))),
+        )
+
+        print(f"Citas: {len(citas):,}")
+        print(f"{'Consulta':>12} | {'Lineal (ms)':>12} | {'Índice (ms)':>12} | {'Resultados':>10}")
+        print("-" * 56)
+        for label, linear, indexed in cases:
+            linear_ms, count = measure(linear)
+            indexed_ms, _ = measure(indexed)
+            print(f"{label:>12} | {linear_ms:>12.2f} | {indexed_ms:>12.3f} | {count:>10,}")
+        database.close()
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Benchmark de arranque: índices cargados desde SQLite vs desde la instantánea mmap
+Ejecuta: python benchmarks/bench_cold_start.py [tamaño]   (1k, 10k, 100k, 1M)
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+# Agregar el directorio del proyecto al path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.database import Database
+from utils.dataset_generator import DatasetGenerator, parse_size
+from utils.event_manager import EventManager
+from utils.indexes import DataIndexes
+
+
+def start(path, use_snapshot):
+    """Abrir la base y construir los índices como al iniciar la aplicación"""
+    begin = time.perf_counter()
+    database = Database(path)
+    event_manager = EventManager()
+    database.attach_journal(event_manager)
+    snapshot = database.open_snapshot() if use_snapshot else None
+    indexes = DataIndexes(database, event_manager, snapshot)
+    elapsed = time.perf_counter() - begin
+
+    # Primera consulta (materializa un solo registro)
+    begin = time.perf_counter()
+    indexes.clientes.get(1)
+    first = time.perf_counter() - begin
+    return database, elapsed, first
+
+
+def main():
+    """Función principal"""
+    size = parse_size(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    with tempfile.TemporaryDirectory() as folder:
+        path = os.path.join(folder, "bench.db")
+        database = Database(path)
+        DatasetGenerator(size).load_into(database)
+        database.open_snapshot()
+        database.close()  # escribe la instantánea
+
+        print(f"Clientes: {size:,}")
+        print(f"{'Modo':>12} | {'Arranque (ms)':>14} | {'1.ª consulta (µs)':>18}")
+        print("-" * 52)
+        for label, use_snapshot in (("SQLite", False), ("Instantánea", True)):
+            database, elapsed, first = start(path, use_snapshot)
+            print(f"{label:>12} | {elapsed * 1000:>14.1f} | {first * 1e6:>18.1f}")
+            database.close()
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Benchmark de búsqueda por DNI o teléfono mientras se teclea: recorrido vs trie de dígitos
+Ejecuta: python benchmarks/bench_digit_search.py [tamaño]   (1k, 10k, 100k, 1M)
+"""
+
+import os
+import random
+import sys
+import tempfile
+import time
+
+# Agregar el directorio del proyecto al path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.database import Database
+from utils.dataset_generator import DatasetGenerator, parse_size
+from utils.event_manager import EventManager
+from utils.indexes import DataIndexes
+
+
+def measure(function, repeat=10):
+    """Tiempo promedio por llamada en milisegundos"""
+    begin = time.perf_counter()
+    for _ in range(repeat):
+        result = function()
+    return (time.perf_counter() - begin) / repeat * 1000, len(result)
+
+
+def main():
+    """Función principal"""
+    size = parse_size(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    with tempfile.TemporaryDirectory() as folder:
+        database = Database(os.path.join(folder, "bench.db"))
+        DatasetGenerator(size).load_into(database)
+        indexes = DataIndexes(database, EventManager())
+        clientes = list(indexes.clientes.values())
+        trie = indexes.digits['clientes']
+
+        begin = time.perf_counter()
+        trie.load(clientes)
+        print(f"Clientes: {len(clientes):,} | Construcción del trie: {(time.perf_counter() - begin) * 1000:.0f} ms")
+
+        # Se teclea un DNI y un teléfono existentes, dígito a dígito
+        cliente = random.Random(7).choice(clientes)
+        print(f"{'Consulta':>12} | {'Lineal (ms)':>12} | {'Trie (ms)':>12} | {'Resultados':>10}")
+        print("-" * 56)
+        for number in (cliente['dni'], cliente['telefono']):
+            for length in range(1, len(number) + 1):
+                prefix = number[:length]
+                linear_ms, count = measure(lambda: [
+                    c['id'] for c in clientes
+                    if c['dni'].startswith(prefix) or c['telefono'].startswith(prefix)
+                ])
+                trie_ms, _ = measure(lambda: trie.search(prefix))
+                print(f"{prefix:>12} | {linear_ms:>12.2f} | {trie_ms:>12.3f} | {count:>10,}")
+        database.close()
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
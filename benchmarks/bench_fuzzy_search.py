@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Benchmark de búsqueda aproximada: distancia de edición contra cada registro vs índice de trigramas
+Ejecuta: python benchmarks/bench_fuzzy_search.py [tamaño]   (1k, 10k, 100k, 1M)
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+# Agregar el directorio del proyecto al path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.database import Database
+from utils.dataset_generator import DatasetGenerator, parse_size
+from utils.event_manager import EventManager
+from utils.indexes import DataIndexes, FuzzyIndex, edit_distance, search_key
+
+QUERIES = ["Mendosa", "Gonzales", "Lusia", "juan peres", "Rodrigues Maria", "Fernandes"]
+TOP = 20
+
+
+def measure(function, repeat=5):
+    """Tiempo promedio por llamada en milisegundos"""
+    begin = time.perf_counter()
+    for _ in range(repeat):
+        result = function()
+    return (time.perf_counter() - begin) / repeat * 1000, result
+
+
+def main():
+    """Función principal"""
+    size = parse_size(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    with tempfile.TemporaryDirectory() as folder:
+        database = Database(os.path.join(folder, "bench.db"))
+        DatasetGenerator(size).load_into(database)
+        indexes = DataIndexes(database, EventManager())
+        clientes = list(indexes.clientes.values())
+        index = indexes.fuzzy['clientes']
+
+        begin = time.perf_counter()
+        index.load(clientes)
+        print(f"Clientes: {len(clientes):,} | Construcción del índice: {(time.perf_counter() - begin) * 1000:.0f} ms")
+        print(f"{'Consulta':>16} | {'Lineal (ms)':>12} | {'Índice (ms)':>12} | {'Parecidos':>10} | Iguales")
+        print("-" * 72)
+        for query in QUERIES:
+            def scan():
+                words = list(dict.fromkeys(search_key(query).split()))
+                scores = []
+                for c in clientes:
+                    fields = search_key(f"{c['nombres']} {c['apellidos']}").split()
+                    total = 0
+                    for word in words:
+                        limit = FuzzyIndex.max_distance(word)
+                        best = min(edit_distance(word, field, limit) for field in fields)
+                        if best > limit:
+                            break
+                        total += best
+                    else:
+                        scores.append((c['id'], total))
+                scores.sort(key=lambda item: (item[1], item[0]))
+                return scores
+            linear_ms, expected = measure(scan, repeat=1)
+            indexed_ms, found = measure(lambda: index.search(query, TOP))
+            same = "sí" if found == expected[:TOP] else "no"
+            print(f"{query:>16} | {linear_ms:>12.1f} | {indexed_ms:>12.3f} | {len(expected):>10,} | {same}")
+        database.close()
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark: búsqueda por ID con recorrido lineal vs índice de clave primaria
+Ejecuta: python benchmarks/bench_primary_index.py
+"""
+
+import os
+import random
+import sys
+import timeit
+
+# Agregar el directorio del proyecto al path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.indexes import PrimaryKeyIndex
+
+SIZES = [10, 100, 1_000, 10_000, 100_000]
+LOOKUPS = 1_000
+
+
+def linear_lookup(records, cliente_id):
+    """Búsqueda como la hacía get_cliente_by_id antes del índice"""
+    for cliente in records:
+        if cliente['id'] == cliente_id:
+            return cliente
+    return None
+
+
+def main():
+    """Función principal"""
+    print(f"{'Registros':>10} | {'Lineal (µs)':>12} | {'Índice (µs)':>12}")
+    print("-" * 42)
+
+    rng = random.Random(42)
+    for size in SIZES:
+        records = [{"id": i, "dni": f"{i:08d}"} for i in range(1, size + 1)]
+        index = PrimaryKeyIndex("id")
+        index.load(records)
+        ids = [rng.randint(1, size) for _ in range(LOOKUPS)]
+
+        # El recorrido lineal es lento en tablas grandes: se reducen las repeticiones
+        linear_ids = ids[:max(10, LOOKUPS * 100 // size)]
+        linear = timeit.timeit(lambda: [linear_lookup(records, i) for i in linear_ids], number=1)
+        indexed = timeit.timeit(lambda: [index.get(i) for i in ids], number=10)
+
+        linear_us = linear / len(linear_ids) * 1e6
+        indexed_us = indexed / (10 * LOOKUPS) * 1e6
+        print(f"{size:>10} | {linear_us:>12.3f} | {indexed_us:>12.3f}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+Benchmark de memoria: 100k registros como diccionarios vs registros con __slots__
+Ejecuta: python benchmarks/bench_record_memory.py [cantidad]
+"""
+
+import os
+import sys
+import tracemalloc
+
+# Agregar el directorio del proyecto al path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.dataset_generator import DatasetGenerator
+from utils.records import Cita, Cliente, Mascota
+
+
+def measure(build):
+    """Memoria (bytes) que queda ocupada por el resultado de build()"""
+    tracemalloc.start()
+    data = build()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return size, len(data)
+
+
+def main():
+    """Función principal"""
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    generator = DatasetGenerator(count)
+    # Los valores se generan antes de medir: solo cuenta el contenedor de cada registro
+    sources = [
+        ("Clientes", Cliente, list(generator.clientes())[:count]),
+        ("Mascotas", Mascota, list(generator.mascotas())[:count]),
+        ("Citas", Cita, list(generator.citas())[:count]),
+    ]
+
+    print(f"{'Entidad':>10} | {'dict (MB)':>10} | {'__slots__ (MB)':>14} | {'Ahorro':>7}")
+    print("-" * 52)
+    for name, record_type, rows in sources:
+        dict_size, n = measure(lambda: [dict(row) for row in rows])
+        slots_size, _ = measure(lambda: [record_type.from_dict(row) for row in rows])
+        saving = 100 * (1 - slots_size / dict_size)
+        print(f"{name:>10} | {dict_size / 2**20:>10.1f} | {slots_size / 2**20:>14.1f} | {saving:>6.0f}%")
+        print(f"{'':>10} | {dict_size / n:>8.0f} B | {slots_size / n:>12.0f} B | por registro")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Benchmark de fuentes: una CTkFont por celda vs el registro compartido del tema
+Ejecuta: python benchmarks/bench_table_fonts.py [filas]   (necesita una pantalla)
+"""
+
+import os
+import sys
+import time
+import tkinter
+import tracemalloc
+
+# Agregar el directorio del proyecto al path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import customtkinter as ctk
+
+from utils.theme import VeterinariaTheme
+from views.components.data_table import DataTable
+
+COLUMNS = ["N°", "DNI", "Nombres", "Apellidos", "Teléfono", "Email", "Estado", "Acciones"]
+
+
+def fresh_font(master, size=None, weight="normal", family=None, slant="roman"):
+    """Comportamiento anterior: una fuente nueva en cada llamada"""
+    options = {"weight": weight, "slant": slant}
+    if size is not None:
+        options["size"] = size
+    if family is not None:
+        options["family"] = family
+    return ctk.CTkFont(**options)
+
+
+def build_table(root, theme, rows):
+    """Crear una DataTable con todas sus filas y dibujarla"""
+    table = DataTable(root, COLUMNS, theme=theme, height=600)
+    table.pack(fill="both", expand=True)
+    for idx in range(rows):
+        table.add_row(
+            [str(idx + 1), f"{idx:08d}", "María José", "García López", "987654321",
+             "cliente@correo.com", "Activo" if idx % 3 else "Inactivo"],
+            [("👁️", None, theme.INFO), ("✏️", None, theme.ACCENT), ("🗑️", None, theme.DANGER)]
+        )
+    root.update()
+    return table
+
+
+def measure(root, theme, rows, font_factory):
+    """Fuentes creadas, fuentes vivas en Tk, memoria y tiempo de una tabla"""
+    created = [0]
+
+    def counting_font(master, size=None, weight="normal", family=None, slant="roman"):
+        created[0] += 1
+        return font_factory(master, size, weight, family, slant)
+
+    VeterinariaTheme.font = staticmethod(counting_font)
+    fonts_before = len(root.tk.call("font", "names"))
+    tracemalloc.start()
+    begin = time.perf_counter()
+    table = build_table(root, theme, rows)
+    elapsed = (time.perf_counter() - begin) * 1000
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    live_fonts = len(root.tk.call("font", "names")) - fonts_before
+    table.destroy()
+    root.update()
+    return created[0], live_fonts, peak / 1024 / 1024, elapsed
+
+
+def main():
+    """Función principal"""
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    try:
+        root = ctk.CTk()
+    except tkinter.TclError as error:
+        print(f"Se necesita una pantalla para este benchmark: {error}")
+        return 1
+    root.geometry("1200x700")
+    theme = VeterinariaTheme()
+    registry = VeterinariaTheme.__dict__["font"]
+    shared_font = VeterinariaTheme.font
+
+    print(f"DataTable con {rows:,} filas ({len(COLUMNS) - 1} celdas + 3 botones por fila)\n")
+    print(f"{'Fuentes':<14}{'CTkFont pedidas':>17}{'Fuentes Tk vivas':>18}{'Memoria pico':>15}{'Tiempo':>12}")
+    results = {}
+    for name, factory in (("por celda", fresh_font), ("compartidas", shared_font)):
+        calls, live, peak, elapsed = measure(root, theme, rows, factory)
+        results[name] = elapsed
+        print(f"{name:<14}{calls:>17,}{live:>18,}{peak:>12.1f} MB{elapsed:>9.0f} ms")
+
+    VeterinariaTheme.font = registry
+    print(f"\nTiempo de dibujo: {results['por celda'] / results['compartidas']:.2f}x más rápido con fuentes compartidas")
+    root.destroy()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
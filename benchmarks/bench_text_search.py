@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Benchmark de búsqueda de texto: recorrido normalizando cada campo vs índice invertido
+Ejecuta: python benchmarks/bench_text_search.py [tamaño]   (1k, 10k, 100k, 1M)
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+# Agregar el directorio del proyecto al path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.database import Database
+from utils.dataset_generator import DatasetGenerator, parse_size
+from utils.event_manager import EventManager
+from utils.indexes import DataIndexes, search_key
+
+QUERIES = ["ma", "mar", "garc", "perez", "lucia", "1234", "rodriguez"]
+
+
+def measure(function, repeat=10):
+    """Tiempo promedio por llamada en milisegundos"""
+    begin = time.perf_counter()
+    for _ in range(repeat):
+        result = function()
+    return (time.perf_counter() - begin) / repeat * 1000, len(result)
+
+
+def main():
+    """Función principal"""
+    size = parse_size(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    with tempfile.TemporaryDirectory() as folder:
+        database = Database(os.path.join(folder, "bench.db"))
+        DatasetGenerator(size).load_into(database)
+        indexes = DataIndexes(database, EventManager())
+        clientes = list(indexes.clientes.values())
+        index = indexes.text['clientes']
+
+        begin = time.perf_counter()
+        index.load(clientes)
+        print(f"Clientes: {len(clientes):,} | Construcción del índice: {(time.perf_counter() - begin) * 1000:.0f} ms")
+        print(f"{'Consulta':>12} | {'Lineal (ms)':>12} | {'Índice (ms)':>12} | {'Resultados':>10}")
+        print("-" * 56)
+        for query in QUERIES:
+            def scan():
+                key = search_key(query)
+                return [c['id'] for c in clientes
+                        if key in search_key(c['dni']) or key in search_key(c['nombres'])
+                        or key in search_key(c['apellidos'])]
+            linear_ms, count = measure(scan)
+            indexed_ms, _ = measure(lambda: index.search(query))
+            print(f"{query:>12} | {linear_ms:>12.2f} | {indexed_ms:>12.3f} | {count:>10,}")
+        database.close()
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -4,16 +4,21 @@ Aplicación Desktop con CustomTkinter
 """
 
 import customtkinter as ctk
+from tkinter import messagebox
 from views.dashboard_view import DashboardView
 from views.components.cliente_form_simple import ClienteFormDialog
 from views.mascotas_view_simple import MascotasViewSimple
 from views.citas_view_simple import CitasViewSimple
 from views.veterinarios_view import VeterinariosView
 from utils.theme import VeterinariaTheme
-from utils.mock_data import CLIENTES
-from views.components.data_table import DataTable
+from utils.database import get_database
+from utils.indexes import get_indexes
+from utils.search import DebouncedSearch, SearchSession
+from views.components.data_table import create_table
 from utils.animations import NotificationManager
+from utils.exporter import export_view
 from utils.event_manager import AppContext, AppEvents
+from utils.executor import get_query_executor
 
 ctk.set_appearance_mode("light")
 ctk.set_default_color_theme("blue")
@@ -37,12 +42,28 @@ class VeterinariaApp(ctk.CTk):
         self.current_view = None
         self.theme = VeterinariaTheme()
         
+        # Índices en memoria (se suscriben a los eventos antes que las vistas)
+        self.indexes = get_indexes()
+        
         # Crear interfaz
         self._create_widgets()
         
         # Mostrar vista inicial
         self.show_dashboard()
         
+        # El diario programa su fsync con after() de la ventana y se fuerza a disco al cerrarla
+        journal = get_database().journal
+        if journal:
+            journal.set_timer(self)
+        self.protocol("WM_DELETE_WINDOW", self._on_close)
+        
+    def _on_close(self):
+        """Escribir a disco los eventos pendientes del diario y cerrar la ventana"""
+        journal = get_database().journal
+        if journal:
+            journal.flush()
+        self.destroy()
+        
     def _center_window(self):
         """Centrar la ventana en la pantalla"""
         self.update_idletasks()
@@ -85,7 +106,7 @@ class VeterinariaApp(ctk.CTk):
         title_label = ctk.CTkLabel(
             logo_frame,
             text="🏥 VETERINARIA",
-            font=ctk.CTkFont(size=24, weight="bold"),
+            font=self.theme.font(master=self, size=24, weight="bold"),
             text_color="white"
         )
         title_label.pack()
@@ -93,7 +114,7 @@ class VeterinariaApp(ctk.CTk):
         subtitle_label = ctk.CTkLabel(
             logo_frame,
             text="Colitas Felices",
-            font=ctk.CTkFont(size=14),
+            font=self.theme.font(master=self, size=14),
             text_color=self.theme.COLORS["text_light"]
         )
         subtitle_label.pack()
@@ -105,7 +126,7 @@ class VeterinariaApp(ctk.CTk):
         ctk.CTkLabel(
             user_frame,
             text="👤 RECEPCIONISTA",
-            font=ctk.CTkFont(size=12, weight="bold"),
+            font=self.theme.font(master=self, size=12, weight="bold"),
             text_color="white"
         ).pack(pady=10)
         
@@ -135,7 +156,7 @@ class VeterinariaApp(ctk.CTk):
         exit_btn = ctk.CTkButton(
             self.sidebar,
             text="🚪 Salir",
-            font=ctk.CTkFont(size=14),
+            font=self.theme.font(master=self, size=14),
             fg_color=self.theme.COLORS["danger"],
             hover_color=self.theme.COLORS["danger_hover"],
             height=45,
@@ -148,7 +169,7 @@ class VeterinariaApp(ctk.CTk):
         btn = ctk.CTkButton(
             self.sidebar,
             text=f"{icon}  {text}",
-            font=ctk.CTkFont(size=14),
+            font=self.theme.font(master=self, size=14),
             fg_color="transparent",
             hover_color=self.theme.COLORS["primary_dark"],
             anchor="w",
@@ -222,8 +243,12 @@ class ClientesViewSimple(ctk.CTkScrollableFrame):
         super().__init__(parent, fg_color=app.theme.COLORS["bg"])
         self.app = app
         self.theme = app.theme
-        self.clientes = CLIENTES.copy()
-        self.filtered_clientes = self.clientes.copy()
+        self.database = get_database()
+        self.indexes = get_indexes()
+        self.filtered_clientes = list(self.indexes.clientes.ordered())
+        self.search_session = SearchSession('clientes')
+        self.search_controller = DebouncedSearch(self, self._filter, self._show_filtered,
+                                                 prepare=self._filter_state, background=True)
         
         self.context = AppContext()
         self.event_manager = self.context.event_manager
@@ -238,30 +263,32 @@ class ClientesViewSimple(ctk.CTkScrollableFrame):
     def _on_cliente_added(self, event):
         cliente = event.data.get('cliente')
         if cliente:
-            cliente['id'] = max([c.get('id', 0) for c in self.clientes] + [0]) + 1
-            self.clientes.append(cliente)
+            self.search_session.invalidate()
             self._apply_filters()
     
     def _on_cliente_updated(self, event):
         cliente = event.data.get('cliente')
         if cliente:
-            for i, c in enumerate(self.clientes):
-                if c['id'] == cliente['id']:
-                    self.clientes[i].update(cliente)
-                    break
+            # El índice ya tiene los cambios; la fila se corrige al instante y el filtro la reubica si hace falta
+            c = self.indexes.clientes.get(cliente['id'])
+            position = self.table.index_of(cliente['id'])
+            if c is not None and position is not None:
+                self.table.update_row(*self._table_row(position + 1, c))
+            self.search_session.invalidate()
             self._apply_filters()
     
     def _on_cliente_deleted(self, event):
         cliente_id = event.data.get('cliente_id')
         if cliente_id:
-            self.clientes = [c for c in self.clientes if c['id'] != cliente_id]
+            self.table.remove_row(cliente_id)
+            self.search_session.invalidate()
             self._apply_filters()
     
     def _create_widgets(self):
         header = ctk.CTkFrame(self, fg_color="transparent")
         header.pack(fill="x", padx=20, pady=(20, 10))
         
-        title = ctk.CTkLabel(header, text="GESTIÓN DE CLIENTES 👥", font=ctk.CTkFont(size=24, weight="bold"), text_color=self.theme.PRIMARY)
+        title = ctk.CTkLabel(header, text="GESTIÓN DE CLIENTES 👥", font=self.theme.font(master=self, size=24, weight="bold"), text_color=self.theme.PRIMARY)
         title.pack(side="left")
         
         btn_frame = ctk.CTkFrame(header, fg_color="transparent")
@@ -269,13 +296,14 @@ class ClientesViewSimple(ctk.CTkScrollableFrame):
         
         ctk.CTkButton(btn_frame, text="🔄", command=self._refresh, width=50, fg_color=self.theme.ACCENT, hover_color="#6d28d9").pack(side="right", padx=5)
         ctk.CTkButton(btn_frame, text="➕ Nuevo Cliente", command=self._add_cliente, fg_color="#10b981", hover_color="#059669", width=160).pack(side="right", padx=5)
+        ctk.CTkButton(btn_frame, text="📤 Exportar", command=self._export, fg_color="#6b7280", hover_color="#4b5563", width=120).pack(side="right", padx=5)
         
         search_frame = ctk.CTkFrame(self, fg_color="transparent")
         search_frame.pack(fill="x", padx=20, pady=10)
         
-        self.search_entry = ctk.CTkEntry(search_frame, placeholder_text="🔍 Buscar por DNI o nombre...", height=40)
+        self.search_entry = ctk.CTkEntry(search_frame, placeholder_text="🔍 Buscar por DNI, teléfono o nombre...", height=40)
         self.search_entry.pack(side="left", fill="x", expand=True, padx=(0, 10))
-        self.search_entry.bind('<KeyRelease>', lambda e: self._apply_filters())
+        self.search_entry.bind('<KeyRelease>', self.search_controller.schedule)
         
         self.filter_combo = ctk.CTkComboBox(search_frame, values=["Todos", "Activos", "Inactivos"], command=lambda v: self._apply_filters(), width=150)
         self.filter_combo.set("Todos")
@@ -286,63 +314,76 @@ class ClientesViewSimple(ctk.CTkScrollableFrame):
         self.table_container = ctk.CTkFrame(self, fg_color=self.theme.COLORS["surface"])
         self.table_container.pack(fill="both", expand=True, padx=20, pady=10)
         
-        self.count_label = ctk.CTkLabel(self.table_container, text="", font=ctk.CTkFont(size=12), text_color=self.theme.TEXT_SECONDARY)
-        self.count_label.pack(pady=10)
-    
-    def _update_table(self):
-        for widget in self.table_container.winfo_children():
-            if isinstance(widget, DataTable):
-                widget.destroy()
-        
+        self.count_label = ctk.CTkLabel(self.table_container, text="", font=self.theme.font(master=self, size=12), text_color=self.theme.TEXT_SECONDARY)
         self.count_label.pack(pady=10)
-        self.count_label.configure(text=f"Mostrando {len(self.filtered_clientes)} de {len(self.clientes)} clientes")
         
         columns = ["N°", "DNI", "Nombres", "Apellidos", "Teléfono", "Email", "Estado", "Acciones"]
         
-        self.table = DataTable(self.table_container, columns=columns, theme=self.theme, height=400)
+        self.table = create_table(self.table_container, columns=columns, theme=self.theme, height=400)
         self.table.pack(fill="both", expand=True, padx=10, pady=(0, 10))
-        
-        for idx, cliente in enumerate(self.filtered_clientes, 1):
-            row_data = [
-                str(idx),
-                cliente['dni'],
-                cliente['nombres'],
-                cliente['apellidos'],
-                cliente['telefono'],
-                cliente.get('email', 'N/A'),
-                cliente['estado']
-            ]
-            
-            actions = [
-                ("👁️", lambda c=cliente: self._view_cliente(c), self.theme.INFO),
-                ("✏️", lambda c=cliente: self._edit_cliente(c), self.theme.ACCENT),
-                ("🗑️", lambda c=cliente: self._delete_cliente(c), self.theme.DANGER)
-            ]
-            
-            self.table.add_row(row_data, actions)
     
-    def _apply_filters(self):
-        search = self.search_entry.get().lower()
-        estado_filter = self.filter_combo.get()
+    def _update_table(self):
+        self.count_label.configure(text=f"Mostrando {len(self.filtered_clientes)} de {len(self.indexes.clientes)} clientes")
+        # Reconciliar por ID: solo cambian las filas que entran, salen o se modifican
+        self.table.sync(self._table_row(idx, cliente) for idx, cliente in enumerate(self.filtered_clientes, 1))
+    
+    def _table_row(self, number, cliente):
+        row_data = [
+            str(number),
+            cliente['dni'],
+            cliente['nombres'],
+            cliente['apellidos'],
+            cliente['telefono'],
+            cliente.get('email', 'N/A'),
+            cliente['estado']
+        ]
         
-        self.filtered_clientes = [
-            c for c in self.clientes
-            if (search in c['dni'].lower() or search in c['nombres'].lower() or search in c['apellidos'].lower())
-            and (estado_filter == "Todos" or (estado_filter == "Activos" and c['estado'] == "Activo") or (estado_filter == "Inactivos" and c['estado'] == "Inactivo"))
+        actions = [
+            ("👁️", lambda c=cliente: self._view_cliente(c), self.theme.INFO),
+            ("✏️", lambda c=cliente: self._edit_cliente(c), self.theme.ACCENT),
+            ("🗑️", lambda c=cliente: self._delete_cliente(c), self.theme.DANGER)
         ]
         
+        return cliente['id'], row_data, actions, None
+    
+    def _filter_state(self):
+        # Tupla inmutable de registros: el ejecutor la recorre aunque lleguen eventos
+        return self.search_entry.get(), self.filter_combo.get(), self.indexes.clientes.ordered()
+    
+    def _filter(self, state, token):
+        query, estado_filter, todos = state
+        
+        def compute(matches):
+            # Con texto solo se traen los registros que coinciden
+            clientes = todos if matches is None else self.indexes.clientes.get_many(matches)
+            return [
+                c for c in clientes
+                if estado_filter == "Todos" or (estado_filter == "Activos" and c['estado'] == "Activo") or (estado_filter == "Inactivos" and c['estado'] == "Inactivo")
+            ]
+        
+        return (self.search_session.results(query, (estado_filter,), compute)
+                or self.search_session.similar(query, compute))
+    
+    def _show_filtered(self, clientes):
+        self.filtered_clientes = clientes
         self._update_table()
     
+    def _apply_filters(self):
+        self.search_controller.run_now()
+    
     def _clear_filters(self):
         self.search_entry.delete(0, 'end')
         self.filter_combo.set("Todos")
         self._apply_filters()
     
     def _refresh(self):
-        self.filtered_clientes = self.clientes.copy()
+        self.filtered_clientes = list(self.indexes.clientes.ordered())
         self._update_table()
         NotificationManager.show_success(self, "✓ Datos actualizados")
     
+    def _export(self):
+        export_view(self, 'clientes', self.filtered_clientes)
+    
     def _add_cliente(self):
         dialog = ClienteFormDialog(self, 'add', None, self.theme, self.event_manager)
         self.wait_window(dialog)
@@ -357,6 +398,7 @@ class ClientesViewSimple(ctk.CTkScrollableFrame):
     
     def _delete_cliente(self, cliente):
         if messagebox.askyesno("Confirmar", f"¿Eliminar a {cliente['nombres']} {cliente['apellidos']}?"):
+            self.database.clientes.delete(cliente['id'])
             self.event_manager.emit(AppEvents.CLIENTE_DELETED, {'cliente_id': cliente['id']})
             NotificationManager.show_success(self, "✓ Cliente eliminado")
 
@@ -365,6 +407,10 @@ def main():
     """Función principal"""
     app = VeterinariaApp()
     app.mainloop()
+    get_query_executor().shutdown()
+    
+    # Checkpoint final: confirma SQLite y vacía el diario
+    get_database().close()
 
 
 if __name__ == "__main__":
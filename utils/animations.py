@@ -5,6 +5,8 @@ Sistema de animaciones y efectos visuales
 import customtkinter as ctk
 from typing import Callable, Optional
 
+from .theme import VeterinariaTheme
+
 
 class AnimationManager:
     """Gestor de animaciones para widgets"""
@@ -196,10 +198,11 @@ class LoadingSpinner:
         self.parent = parent
         self.frame = None
         self.label = None
+        self.cancel_button = None
         self.animation_running = False
     
-    def show(self, message: str = "Cargando..."):
-        """Mostrar spinner"""
+    def show(self, message: str = "Cargando...", on_cancel: Optional[Callable] = None):
+        """Mostrar spinner (con botón Cancelar si se indica on_cancel)"""
         self.frame = ctk.CTkFrame(
             self.parent,
             fg_color="rgba(0, 0, 0, 0.7)",
@@ -210,14 +213,35 @@ class LoadingSpinner:
         self.label = ctk.CTkLabel(
             self.frame,
             text=message,
-            font=ctk.CTkFont(size=16),
+            font=VeterinariaTheme.font(master=self.parent, size=16),
             text_color="white"
         )
         self.label.pack(padx=30, pady=20)
         
+        if on_cancel:
+            self.cancel_button = ctk.CTkButton(
+                self.frame,
+                text="Cancelar",
+                width=100,
+                fg_color="#6b7280",
+                hover_color="#4b5563",
+                command=lambda: self._cancel(on_cancel)
+            )
+            self.cancel_button.pack(padx=30, pady=(0, 20))
+        
         self.animation_running = True
         self._animate()
     
+    def set_message(self, message: str):
+        """Cambiar el texto del spinner (p. ej. para mostrar el avance)"""
+        if self.label:
+            self.label.configure(text=message)
+    
+    def _cancel(self, on_cancel: Callable):
+        """Pedir la cancelación una sola vez"""
+        self.cancel_button.configure(state="disabled", text="Cancelando...")
+        on_cancel()
+    
     def _animate(self):
         """Animar el spinner"""
         if self.animation_running and self.label:
@@ -240,6 +264,7 @@ class LoadingSpinner:
             self.frame.destroy()
             self.frame = None
             self.label = None
+            self.cancel_button = None
 
 
 class NotificationManager:
@@ -280,7 +305,7 @@ class NotificationManager:
         label = ctk.CTkLabel(
             notification,
             text=message,
-            font=ctk.CTkFont(size=13),
+            font=VeterinariaTheme.font(master=parent, size=13),
             text_color="white"
         )
         label.pack(padx=20, pady=15)
@@ -0,0 +1,130 @@
+"""
+Búsqueda de horarios libres por veterinario o especialidad
+
+Los horarios de atención son plantillas por día de la semana; las horas
+ocupadas salen del índice de citas por fecha (AppointmentIndex), que da
+las citas de un veterinario en un día con dos búsquedas binarias. Así la
+búsqueda recorre días y veterinarios, no el historial de citas.
+"""
+
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .indexes import AppointmentIndex, DataIndexes, cita_duration, get_indexes, minute_of_day
+
+# Horario de atención por día de la semana (0 = lunes): lista de (inicio, fin)
+HORARIO_ATENCION: Dict[int, List[Tuple[str, str]]] = {
+    0: [("08:00", "13:00"), ("14:00", "18:00")],
+    1: [("08:00", "13:00"), ("14:00", "18:00")],
+    2: [("08:00", "13:00"), ("14:00", "18:00")],
+    3: [("08:00", "13:00"), ("14:00", "18:00")],
+    4: [("08:00", "13:00"), ("14:00", "18:00")],
+    5: [("09:00", "13:00")],
+    6: [],
+}
+
+# Horarios propios de algunos veterinarios (ID -> plantilla como la anterior)
+HORARIOS_VETERINARIO: Dict[int, Dict[int, List[Tuple[str, str]]]] = {}
+
+
+@dataclass
+class FreeSlot:
+    """Horario libre de un veterinario"""
+
+    vet_id: int
+    day: date
+    minute: int
+
+    @property
+    def fecha(self) -> str:
+        """Fecha en formato YYYY-MM-DD"""
+        return self.day.isoformat()
+
+    @property
+    def hora(self) -> str:
+        """Hora en formato HH:MM"""
+        return f"{self.minute // 60:02d}:{self.minute % 60:02d}"
+
+
+class AvailabilityFinder:
+    """Horarios libres a partir de las plantillas de atención y la agenda"""
+
+    def __init__(self, indexes: DataIndexes, horario: Optional[Dict[int, List[Tuple[str, str]]]] = None,
+                 horarios_veterinario: Optional[Dict[int, Dict[int, List[Tuple[str, str]]]]] = None):
+        self.indexes = indexes
+        self.horario = HORARIO_ATENCION if horario is None else horario
+        self.horarios_veterinario = HORARIOS_VETERINARIO if horarios_veterinario is None else horarios_veterinario
+
+    def find(self, vet_ids: Iterable[int], start: date, end: date, duration: Optional[int] = None,
+             limit: int = 6, not_before: Optional[datetime] = None) -> List[FreeSlot]:
+        """
+        Primeros horarios libres entre dos días (inclusive)
+
+        Args:
+            vet_ids: Veterinarios candidatos
+            start: Primer día
+            end: Último día
+            duration: Minutos del turno (por defecto la duración de una cita)
+            limit: Cantidad máxima de horarios
+            not_before: No proponer horarios anteriores (por defecto, ahora)
+
+        Returns:
+            Horarios en orden de fecha y hora (a igual hora, en el orden de vet_ids)
+        """
+        vet_ids = list(vet_ids)
+        duration = duration or AppointmentIndex.DURATION
+        not_before = not_before or datetime.now()
+        slots: List[FreeSlot] = []
+
+        day = max(start, not_before.date())
+        while day <= end and len(slots) < limit:
+            earliest = not_before.hour * 60 + not_before.minute if day == not_before.date() else 0
+            free = []
+            for order, vet_id in enumerate(vet_ids):
+                for minute in self._free_minutes(vet_id, day, duration):
+                    if minute >= earliest:
+                        free.append((minute, order, vet_id))
+            free.sort()
+            slots.extend(FreeSlot(vet_id, day, minute) for minute, _, vet_id in free[:limit - len(slots)])
+            day += timedelta(days=1)
+        return slots
+
+    def _free_minutes(self, vet_id: int, day: date, duration: int) -> Iterator[int]:
+        """Inicios libres de un veterinario en un día, dentro de su horario de atención"""
+        windows = self.horarios_veterinario.get(vet_id, self.horario).get(day.weekday(), [])
+        if not windows:
+            return
+        busy = self._busy_intervals(vet_id, day)
+        for window_start, window_end in windows:
+            current, end = minute_of_day(window_start), minute_of_day(window_end)
+            for taken, released in busy:
+                if released <= current:
+                    continue
+                while current + duration <= min(taken, end):
+                    yield current
+                    current += duration
+                current = max(current, released)
+                if current >= end:
+                    break
+            while current + duration <= end:
+                yield current
+                current += duration
+
+    def _busy_intervals(self, vet_id: int, day: date) -> List[Tuple[int, int]]:
+        """Intervalos (inicio, fin) en minutos, ordenados, de las citas no canceladas del día"""
+        citas = self.indexes.citas.get_many(self.indexes.citas_by_fecha.day(day, vet_id))
+        busy = []
+        for cita in citas:
+            if cita.get('estado') != 'Cancelada':
+                start = minute_of_day(cita.get('hora'))
+                busy.append((start, start + cita_duration(cita)))
+        return sorted(busy)
+
+
+def find_free_slots(vet_ids: Iterable[int], start: date, days: int = 30, duration: Optional[int] = None,
+                    limit: int = 6) -> List[FreeSlot]:
+    """Primeros horarios libres desde un día (u hoy, si ya pasó), con los índices de la aplicación"""
+    start = max(start, date.today())
+    finder = AvailabilityFinder(get_indexes())
+    return finder.find(vet_ids, start, start + timedelta(days=days - 1), duration, limit)
@@ -0,0 +1,374 @@
+"""
+Capa de persistencia con SQLite (repositorios por entidad)
+"""
+
+import os
+import sqlite3
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Type
+
+from .records import Cita, Cliente, Mascota, Record, Veterinario
+from .sequences import SequenceAllocator
+
+
+# Archivo de base de datos junto a main.py (se puede cambiar con VETERINARIA_DB)
+DB_PATH = os.environ.get("VETERINARIA_DB") or os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "veterinaria.db"
+)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS clientes (
+    id INTEGER PRIMARY KEY,
+    dni TEXT NOT NULL,
+    nombres TEXT NOT NULL,
+    apellidos TEXT NOT NULL,
+    telefono TEXT,
+    email TEXT,
+    direccion TEXT,
+    estado TEXT NOT NULL DEFAULT 'Activo'
+);
+CREATE INDEX IF NOT EXISTS idx_clientes_dni ON clientes (dni);
+CREATE INDEX IF NOT EXISTS idx_clientes_estado ON clientes (estado);
+
+CREATE TABLE IF NOT EXISTS mascotas (
+    id_mascota INTEGER PRIMARY KEY,
+    id_cliente INTEGER NOT NULL,
+    nombre_mascota TEXT NOT NULL,
+    especie TEXT,
+    raza TEXT,
+    sexo TEXT,
+    "edad_años" INTEGER DEFAULT 0,
+    edad_meses INTEGER DEFAULT 0,
+    peso_kg REAL,
+    color_pelaje TEXT,
+    estado TEXT NOT NULL DEFAULT 'Activo'
+);
+CREATE INDEX IF NOT EXISTS idx_mascotas_cliente ON mascotas (id_cliente);
+CREATE INDEX IF NOT EXISTS idx_mascotas_estado ON mascotas (estado);
+
+CREATE TABLE IF NOT EXISTS veterinarios (
+    id INTEGER PRIMARY KEY,
+    nombres TEXT NOT NULL,
+    apellidos TEXT NOT NULL,
+    dni TEXT,
+    telefono TEXT,
+    email TEXT,
+    especialidad TEXT,
+    num_colegiatura TEXT,
+    estado TEXT NOT NULL DEFAULT 'Activo'
+);
+CREATE INDEX IF NOT EXISTS idx_veterinarios_estado ON veterinarios (estado);
+
+CREATE TABLE IF NOT EXISTS citas (
+    id_cita INTEGER PRIMARY KEY,
+    fecha TEXT NOT NULL,
+    hora TEXT NOT NULL,
+    duracion INTEGER DEFAULT 30,
+    id_mascota INTEGER NOT NULL,
+    id_veterinario INTEGER NOT NULL,
+    motivo TEXT,
+    observaciones TEXT,
+    estado TEXT NOT NULL DEFAULT 'Programada'
+);
+CREATE INDEX IF NOT EXISTS idx_citas_mascota ON citas (id_mascota);
+CREATE INDEX IF NOT EXISTS idx_citas_veterinario ON citas (id_veterinario, fecha, hora);
+CREATE INDEX IF NOT EXISTS idx_citas_fecha ON citas (fecha, hora);
+CREATE INDEX IF NOT EXISTS idx_citas_estado ON citas (estado);
+"""
+
+
+def _quote(column: str) -> str:
+    """Citar nombre de columna (algunas llevan ñ)"""
+    return f'"{column}"'
+
+
+class Repository:
+    """Repositorio genérico con operaciones CRUD sobre una tabla"""
+
+    table: str = ""
+    key: str = "id"
+    record_type: Type[Record] = Record
+    columns: Tuple[str, ...] = ()
+
+    def __init__(self, database: "Database"):
+        self.db = database
+        self._select_sql = f"SELECT {', '.join(_quote(col) for col in self.columns)} FROM {self.table}"
+
+    def _select(self, where: str = "", params: Iterable[Any] = (), order: str = None) -> List[Record]:
+        """Ejecutar un SELECT y devolver los registros"""
+        sql = self._select_sql
+        if where:
+            sql += f" WHERE {where}"
+        sql += f" ORDER BY {order or _quote(self.key)}"
+        record_type = self.record_type
+        return [record_type(*row) for row in self.db.execute(sql, tuple(params))]
+
+    def get_all(self) -> List[Record]:
+        """Obtener todos los registros"""
+        return self._select()
+
+    def get_by_id(self, record_id: int) -> Optional[Record]:
+        """Obtener un registro por su clave primaria"""
+        rows = self._select(f"{_quote(self.key)} = ?", (record_id,))
+        return rows[0] if rows else None
+
+    def find_by(self, column: str, value: Any) -> List[Record]:
+        """Obtener registros cuyo campo sea igual al valor"""
+        if column not in self.columns:
+            raise KeyError(f"Columna desconocida en {self.table}: {column}")
+        return self._select(f"{_quote(column)} = ?", (value,))
+
+    def count(self, **filters: Any) -> int:
+        """Contar registros (opcionalmente filtrando por igualdad)"""
+        sql = f"SELECT COUNT(*) FROM {self.table}"
+        if filters:
+            sql += " WHERE " + " AND ".join(f"{_quote(col)} = ?" for col in filters)
+        return self.db.execute(sql, tuple(filters.values())).fetchone()[0]
+
+    def add(self, data: Dict[str, Any]) -> Record:
+        """Insertar un registro; asigna la clave primaria si no viene"""
+        record = self.record_type.from_dict(data)
+        if record[self.key] is None:
+            record[self.key] = self.db.sequences.next_id(self.table, self.key)
+
+        columns = [col for col in self.columns if col in data or col == self.key]
+        sql = (
+            f"INSERT INTO {self.table} ({', '.join(_quote(col) for col in columns)}) "
+            f"VALUES ({', '.join('?' for _ in columns)})"
+        )
+        self.db.execute(sql, tuple(record[col] for col in columns))
+        self.db.commit()
+        return record
+
+    def upsert(self, data: Dict[str, Any]) -> Record:
+        """Insertar o reemplazar un registro con clave primaria conocida"""
+        record = self.record_type.from_dict(data)
+        sql = (
+            f"INSERT OR REPLACE INTO {self.table} ({', '.join(_quote(col) for col in self.columns)}) "
+            f"VALUES ({', '.join('?' for _ in self.columns)})"
+        )
+        self.db.execute(sql, record.values())
+        self.db.commit()
+        return record
+
+    def add_many(self, records: Iterable[Dict[str, Any]]) -> int:
+        """Insertar varios registros en una sola transacción"""
+        placeholders = ", ".join("?" for _ in self.columns)
+        sql = f"INSERT INTO {self.table} ({', '.join(_quote(col) for col in self.columns)}) VALUES ({placeholders})"
+        max_id = None
+
+        def rows():
+            nonlocal max_id
+            for record in records:
+                record_id = record.get(self.key)
+                if record_id is not None and (max_id is None or record_id > max_id):
+                    max_id = record_id
+                yield tuple(record.get(col) for col in self.columns)
+
+        cursor = self.db.executemany(sql, rows())
+        self.db.commit()
+        # El bloque de IDs en memoria sigue valiendo salvo que el lote lo alcance
+        self.db.sequences.observe(self.table, max_id)
+        return cursor.rowcount
+
+    def update(self, data: Dict[str, Any]) -> bool:
+        """Actualizar los campos presentes en data del registro indicado"""
+        columns = [col for col in self.columns if col in data and col != self.key]
+        if not columns:
+            return False
+
+        sql = (
+            f"UPDATE {self.table} SET {', '.join(f'{_quote(col)} = ?' for col in columns)} "
+            f"WHERE {_quote(self.key)} = ?"
+        )
+        cursor = self.db.execute(sql, tuple(data[col] for col in columns) + (data[self.key],))
+        self.db.commit()
+        return cursor.rowcount > 0
+
+    def delete(self, record_id: int) -> bool:
+        """Eliminar un registro por su clave primaria"""
+        cursor = self.db.execute(f"DELETE FROM {self.table} WHERE {_quote(self.key)} = ?", (record_id,))
+        self.db.commit()
+        return cursor.rowcount > 0
+
+
+class ClienteRepository(Repository):
+    """Repositorio de clientes"""
+
+    table = "clientes"
+    key = "id"
+    record_type = Cliente
+    columns = Cliente._fields
+
+    def get_by_dni(self, dni: str) -> Optional[Cliente]:
+        """Obtener cliente por DNI"""
+        rows = self.find_by("dni", dni)
+        return rows[0] if rows else None
+
+
+class MascotaRepository(Repository):
+    """Repositorio de mascotas"""
+
+    table = "mascotas"
+    key = "id_mascota"
+    record_type = Mascota
+    columns = Mascota._fields
+
+    def get_by_cliente(self, cliente_id: int) -> List[Mascota]:
+        """Obtener mascotas de un cliente"""
+        return self.find_by("id_cliente", cliente_id)
+
+
+class VeterinarioRepository(Repository):
+    """Repositorio de veterinarios"""
+
+    table = "veterinarios"
+    key = "id"
+    record_type = Veterinario
+    columns = Veterinario._fields
+
+
+class CitaRepository(Repository):
+    """Repositorio de citas"""
+
+    table = "citas"
+    key = "id_cita"
+    record_type = Cita
+    columns = Cita._fields
+
+    def get_by_mascota(self, mascota_id: int) -> List[Cita]:
+        """Obtener citas de una mascota"""
+        return self.find_by("id_mascota", mascota_id)
+
+    def get_by_veterinario(self, vet_id: int) -> List[Cita]:
+        """Obtener citas de un veterinario ordenadas por fecha y hora"""
+        return self._select("id_veterinario = ?", (vet_id,), order="fecha, hora")
+
+
+class Database:
+    """Conexión SQLite con el esquema de la clínica"""
+
+    def __init__(self, path: str = DB_PATH):
+        self.path = path
+        self.connection = sqlite3.connect(path)
+        self.connection.row_factory = sqlite3.Row
+        self.connection.executescript(SCHEMA)
+        self._migrate()
+        self.sequences = SequenceAllocator(self)
+
+        # Con diario de eventos activo, SQLite se confirma cuando el diario pasa a disco
+        self.journal = None
+        self.deferred_commit = False
+
+        # Instantánea mmap abierta y número de checkpoint que refleja (-1: desactualizada)
+        self.snapshot = None
+        self._snapshot_seq: Optional[int] = None
+
+        self.clientes = ClienteRepository(self)
+        self.mascotas = MascotaRepository(self)
+        self.veterinarios = VeterinarioRepository(self)
+        self.citas = CitaRepository(self)
+
+    def _migrate(self):
+        """Agregar las columnas nuevas a bases de datos creadas con un esquema anterior"""
+        columns = {row[1] for row in self.connection.execute("PRAGMA table_info(citas)")}
+        if "duracion" not in columns:
+            self.connection.execute("ALTER TABLE citas ADD COLUMN duracion INTEGER DEFAULT 30")
+            self.connection.commit()
+
+    @property
+    def repositories(self) -> Tuple[Repository, ...]:
+        """Repositorios de todas las entidades"""
+        return (self.clientes, self.mascotas, self.veterinarios, self.citas)
+
+    def execute(self, sql: str, params: Tuple = ()) -> sqlite3.Cursor:
+        """Ejecutar una sentencia SQL"""
+        return self.connection.execute(sql, params)
+
+    def executemany(self, sql: str, params: Iterable[Tuple]) -> sqlite3.Cursor:
+        """Ejecutar una sentencia SQL para varios juegos de parámetros"""
+        return self.connection.executemany(sql, params)
+
+    def commit(self, force: bool = False):
+        """Confirmar la transacción actual (salvo que el diario la difiera)"""
+        if force or not self.deferred_commit:
+            self.connection.commit()
+        elif self.journal is not None:
+            # La confirma el diario en su próximo flush (a lo sumo fsync_interval después)
+            self.journal.schedule_commit()
+
+    def attach_journal(self, event_manager, fresh: bool = False) -> int:
+        """Activar el diario de eventos junto al archivo de la base de datos"""
+        from .journal import EventJournal, journal_path_for
+        self.journal = EventJournal(journal_path_for(self.path), self)
+        return self.journal.open(event_manager, fresh=fresh)
+
+    def journal_seq(self) -> int:
+        """Número del último evento del diario incluido en SQLite (0 sin diario)"""
+        try:
+            row = self.execute("SELECT valor FROM meta WHERE clave = 'journal_seq'").fetchone()
+        except sqlite3.OperationalError:
+            return 0
+        return int(row[0]) if row else 0
+
+    def open_snapshot(self):
+        """
+        Abrir la instantánea binaria si refleja el estado actual de SQLite
+
+        Returns:
+            Snapshot o None si no existe o está desactualizada; en ese caso
+            se vuelve a escribir al cerrar la base de datos
+        """
+        from .snapshot import load_snapshot
+        self.snapshot = load_snapshot(self, self.journal_seq())
+        self._snapshot_seq = self.snapshot.seq if self.snapshot is not None else -1
+        return self.snapshot
+
+    def invalidate_snapshot(self):
+        """Marcar la instantánea como desactualizada (cambios que no pasan por el diario)"""
+        self._snapshot_seq = -1
+
+    def close(self):
+        """Cerrar la conexión (con checkpoint final del diario y la instantánea al día)"""
+        if self.journal is not None:
+            self.journal.close()
+            self.journal = None
+        self.connection.commit()
+
+        if self.snapshot is not None:
+            self.snapshot.close()
+            self.snapshot = None
+        seq = self.journal_seq()
+        if self._snapshot_seq is not None and self._snapshot_seq != seq and self.path != ":memory:":
+            from .snapshot import snapshot_path_for, write_snapshot
+            write_snapshot(snapshot_path_for(self.path), self, seq)
+        self.connection.close()
+
+    def is_empty(self) -> bool:
+        """Verificar si la base de datos no tiene datos"""
+        return all(repo.count() == 0 for repo in self.repositories)
+
+    def seed(self, clientes: List[Dict], mascotas: List[Dict], veterinarios: List[Dict], citas: List[Dict]):
+        """Cargar datos iniciales"""
+        self.clientes.add_many(clientes)
+        self.mascotas.add_many(mascotas)
+        self.veterinarios.add_many(veterinarios)
+        self.citas.add_many(citas)
+
+
+_database: Optional[Database] = None
+
+
+def get_database() -> Database:
+    """Obtener la base de datos de la aplicación (se crea y se puebla la primera vez)"""
+    global _database
+    if _database is None:
+        _database = Database()
+        fresh = _database.is_empty()
+        if fresh:
+            from .mock_data import CLIENTES, MASCOTAS, VETERINARIOS, CITAS
+            _database.seed(CLIENTES, MASCOTAS, VETERINARIOS, CITAS)
+
+        from .event_manager import AppContext
+        _database.attach_journal(AppContext().event_manager, fresh=fresh)
+    return _database
@@ -0,0 +1,248 @@
+"""
+Generador determinista de datos sintéticos para pruebas de rendimiento
+
+Produce clientes, mascotas, veterinarios y citas coherentes entre sí
+(las claves foráneas siempre apuntan a registros existentes).
+
+Uso:
+    python -m utils.dataset_generator 100k --db veterinaria_100k.db
+    VETERINARIA_DB=veterinaria_100k.db python main.py
+"""
+
+import argparse
+import random
+import sys
+import time
+import unicodedata
+from datetime import date, timedelta
+from typing import Any, Dict, Iterator, List, Tuple
+
+# Tamaños predefinidos (número de clientes)
+SIZES = {
+    "1k": 1_000,
+    "10k": 10_000,
+    "100k": 100_000,
+    "1M": 1_000_000,
+}
+
+NOMBRES_MASCULINOS = [
+    "Juan", "Carlos", "José", "Luis", "Jorge", "Miguel", "Pedro", "Roberto", "Víctor",
+    "César", "Raúl", "Julio", "Alberto", "Manuel", "Jesús", "Fernando", "Ricardo",
+    "Walter", "Percy", "Hugo", "Edwin", "Wilmer", "Óscar", "Renzo", "Diego", "Joaquín",
+]
+NOMBRES_FEMENINOS = [
+    "María", "Rosa", "Ana", "Carmen", "Lucía", "Elena", "Patricia", "Gladys", "Milagros",
+    "Silvia", "Julia", "Flor", "Mónica", "Karina", "Roxana", "Jessica", "Yolanda",
+    "Sofía", "Valeria", "Camila", "Ximena", "Fiorella", "Maricielo", "Nataly",
+]
+APELLIDOS = [
+    "Quispe", "Flores", "Sánchez", "Rodríguez", "García", "Mamani", "Huamán", "Chávez",
+    "Ramos", "Torres", "Díaz", "Vargas", "Castillo", "Rojas", "Mendoza", "Gutiérrez",
+    "Condori", "Espinoza", "Vásquez", "Ríos", "Silva", "Cruz", "López", "Pérez",
+    "Ramírez", "Gonzales", "Salazar", "Huanca", "Paredes", "Cárdenas", "Ccahuana",
+    "Zevallos", "Ticona", "Apaza", "Villanueva", "Herrera", "Aguilar", "Medina",
+]
+CALLES = ["Av. Arequipa", "Av. Brasil", "Jr. Huancayo", "Calle Las Flores", "Av. Larco",
+          "Jr. Los Olivos", "Av. Javier Prado", "Calle Los Pinos", "Av. Angamos", "Jr. Junín"]
+DISTRITOS = ["Lima", "Miraflores", "San Isidro", "Surco", "San Borja", "Los Olivos",
+             "Comas", "La Molina", "Jesús María", "Lince", "Barranco", "San Miguel"]
+
+NOMBRES_MASCOTAS = [
+    "Max", "Luna", "Rocky", "Michi", "Toby", "Bella", "Firulais", "Canela", "Coco",
+    "Chispa", "Lola", "Bruno", "Pelusa", "Manchas", "Kira", "Simba", "Nala", "Zeus",
+    "Princesa", "Oso", "Tigre", "Pepa", "Chocolate", "Negro", "Copito", "Milo",
+]
+ESPECIES = {
+    # especie: (peso relativo, razas, rango de peso en kg)
+    "Perro": (60, ["Labrador", "Pastor Alemán", "Beagle", "Golden Retriever", "Shih Tzu",
+                   "Poodle", "Schnauzer", "Mestizo", "Pitbull", "Perro sin pelo del Perú"], (3.0, 45.0)),
+    "Gato": (30, ["Siamés", "Persa", "Angora", "Mestizo", "Bengalí"], (2.0, 7.5)),
+    "Ave": (4, ["Periquito", "Loro", "Canario"], (0.05, 1.2)),
+    "Conejo": (4, ["Cabeza de León", "Mini Lop", "Mestizo"], (1.0, 4.0)),
+    "Otro": (2, ["Hámster", "Cuy", "Tortuga"], (0.1, 2.0)),
+}
+COLORES = ["Negro", "Blanco", "Marrón", "Dorado", "Gris", "Tricolor", "Atigrado",
+           "Crema", "Negro y marrón", "Blanco con manchas"]
+
+ESPECIALIDADES = ["Medicina General", "Cirugía", "Dermatología", "Cardiología",
+                  "Oftalmología", "Traumatología", "Odontología", "Animales Exóticos"]
+MOTIVOS = ["Consulta general", "Vacunación", "Desparasitación", "Control post-operatorio",
+           "Revisión de piel", "Consulta por cojera", "Esterilización", "Limpieza dental",
+           "Control de peso", "Chequeo anual"]
+HORAS = [f"{h:02d}:{m:02d}" for h in range(8, 18) for m in (0, 30)]
+
+# Multiplicador coprimo con 90_000_000: genera DNIs únicos sin guardar los usados
+_DNI_MULTIPLIER = 48271
+_DNI_RANGE = 90_000_000
+
+
+def _ascii(text: str) -> str:
+    """Quitar tildes y ñ (para correos electrónicos)"""
+    normalized = unicodedata.normalize("NFKD", text)
+    return "".join(c for c in normalized if not unicodedata.combining(c)).lower().replace(" ", "")
+
+
+class DatasetGenerator:
+    """Generador de datos sintéticos reproducible a partir de una semilla"""
+
+    def __init__(self, num_clientes: int, seed: int = 2024,
+                 mascotas_por_cliente: float = 1.5, citas_por_mascota: float = 4.0,
+                 num_veterinarios: int = None, fecha_inicio: date = date(2022, 1, 1),
+                 anios: int = 3):
+        self.seed = seed
+        self.num_clientes = num_clientes
+        self.num_mascotas = round(num_clientes * mascotas_por_cliente)
+        self.num_citas = round(self.num_mascotas * citas_por_mascota)
+        self.num_veterinarios = num_veterinarios or max(3, min(50, num_clientes // 500))
+        self.fecha_inicio = fecha_inicio
+        self.dias = anios * 365
+        # Las citas posteriores a esta fecha quedan "Programada"
+        self.fecha_corte = fecha_inicio + timedelta(days=self.dias - 60)
+
+    def _rng(self, entidad: str) -> random.Random:
+        """Generador aleatorio independiente por entidad (mismo resultado en cada llamada)"""
+        return random.Random(f"{self.seed}-{entidad}")
+
+    def _dni(self, index: int, offset: int) -> str:
+        """DNI único de 8 dígitos para el índice dado"""
+        return str(10_000_000 + (index * _DNI_MULTIPLIER + offset) % _DNI_RANGE)
+
+    def clientes(self) -> Iterator[Dict[str, Any]]:
+        """Generar clientes"""
+        rng = self._rng("clientes")
+        offset = rng.randrange(_DNI_RANGE)
+        for i in range(1, self.num_clientes + 1):
+            nombres = rng.choice(NOMBRES_MASCULINOS if rng.random() < 0.5 else NOMBRES_FEMENINOS)
+            paterno, materno = rng.choice(APELLIDOS), rng.choice(APELLIDOS)
+            yield {
+                "id": i,
+                "dni": self._dni(i, offset),
+                "nombres": nombres,
+                "apellidos": f"{paterno} {materno}",
+                "telefono": f"9{rng.randrange(100_000_000):08d}",
+                "email": f"{_ascii(nombres)}.{_ascii(paterno)}{i}@email.com",
+                "direccion": f"{rng.choice(CALLES)} {rng.randint(100, 2999)}, {rng.choice(DISTRITOS)}",
+                "estado": "Activo" if rng.random() < 0.9 else "Inactivo",
+            }
+
+    def mascotas(self) -> Iterator[Dict[str, Any]]:
+        """Generar mascotas (cada una con un dueño existente)"""
+        rng = self._rng("mascotas")
+        especies = list(ESPECIES)
+        pesos = [ESPECIES[e][0] for e in especies]
+        for i in range(1, self.num_mascotas + 1):
+            especie = rng.choices(especies, pesos)[0]
+            _, razas, (peso_min, peso_max) = ESPECIES[especie]
+            # Todos los clientes tienen al menos una mascota; el resto se reparte al azar
+            id_cliente = i if i <= self.num_clientes else rng.randint(1, self.num_clientes)
+            yield {
+                "id_mascota": i,
+                "id_cliente": id_cliente,
+                "nombre_mascota": rng.choice(NOMBRES_MASCOTAS),
+                "especie": especie,
+                "raza": rng.choice(razas),
+                "sexo": rng.choice(["Macho", "Hembra"]),
+                "edad_años": rng.randint(0, 15),
+                "edad_meses": rng.randint(0, 11),
+                "peso_kg": round(rng.uniform(peso_min, peso_max), 1),
+                "color_pelaje": rng.choice(COLORES),
+                "estado": "Activo" if rng.random() < 0.95 else "Inactivo",
+            }
+
+    def veterinarios(self) -> Iterator[Dict[str, Any]]:
+        """Generar veterinarios"""
+        rng = self._rng("veterinarios")
+        offset = rng.randrange(_DNI_RANGE)
+        for i in range(1, self.num_veterinarios + 1):
+            nombres = rng.choice(NOMBRES_MASCULINOS + NOMBRES_FEMENINOS)
+            paterno, materno = rng.choice(APELLIDOS), rng.choice(APELLIDOS)
+            yield {
+                "id": i,
+                "nombres": nombres,
+                "apellidos": f"{paterno} {materno}",
+                "dni": self._dni(i, offset),
+                "telefono": f"9{rng.randrange(100_000_000):08d}",
+                "email": f"{_ascii(nombres)}.{_ascii(paterno)}{i}@vetclinic.com",
+                # Siempre al menos un médico general
+                "especialidad": ESPECIALIDADES[0] if i == 1 else rng.choice(ESPECIALIDADES),
+                "num_colegiatura": f"CMP-{10000 + i}",
+                "estado": "Activo" if i <= 3 or rng.random() < 0.9 else "Inactivo",
+            }
+
+    def citas(self) -> Iterator[Dict[str, Any]]:
+        """Generar citas repartidas en el rango de fechas"""
+        rng = self._rng("citas")
+        for i in range(1, self.num_citas + 1):
+            fecha = self.fecha_inicio + timedelta(days=rng.randrange(self.dias))
+            if fecha > self.fecha_corte:
+                estado = "Programada"
+            else:
+                estado = "Atendida" if rng.random() < 0.88 else "Cancelada"
+            yield {
+                "id_cita": i,
+                "fecha": fecha.isoformat(),
+                "hora": rng.choice(HORAS),
+                "duracion": 30,
+                "id_mascota": rng.randint(1, self.num_mascotas),
+                "id_veterinario": rng.randint(1, self.num_veterinarios),
+                "motivo": rng.choice(MOTIVOS),
+                "observaciones": "",
+                "estado": estado,
+            }
+
+    def to_lists(self) -> Tuple[List[Dict], List[Dict], List[Dict], List[Dict]]:
+        """Materializar los datos como listas (clientes, mascotas, veterinarios, citas)"""
+        return list(self.clientes()), list(self.mascotas()), list(self.veterinarios()), list(self.citas())
+
+    def apply_to_mock_data(self):
+        """Reemplazar las listas de utils.mock_data (antes de crear la base de datos)"""
+        from . import mock_data
+        clientes, mascotas, veterinarios, citas = self.to_lists()
+        mock_data.CLIENTES[:] = clientes
+        mock_data.MASCOTAS[:] = mascotas
+        mock_data.VETERINARIOS[:] = veterinarios
+        mock_data.CITAS[:] = citas
+
+    def load_into(self, database):
+        """Volcar los datos en una base de datos vacía sin materializarlos en memoria"""
+        database.clientes.add_many(self.clientes())
+        database.mascotas.add_many(self.mascotas())
+        database.veterinarios.add_many(self.veterinarios())
+        database.citas.add_many(self.citas())
+
+
+def parse_size(value: str) -> int:
+    """Convertir '10k', '1M' o un número en cantidad de clientes"""
+    if value in SIZES:
+        return SIZES[value]
+    return int(value.replace("_", ""))
+
+
+def main(argv: List[str] = None) -> int:
+    """Función principal"""
+    from .database import Database
+
+    parser = argparse.ArgumentParser(description="Generar una base de datos sintética")
+    parser.add_argument("size", help="Número de clientes o tamaño predefinido (1k, 10k, 100k, 1M)")
+    parser.add_argument("--db", required=True, help="Archivo SQLite de destino")
+    parser.add_argument("--seed", type=int, default=2024, help="Semilla (mismo valor, mismos datos)")
+    args = parser.parse_args(argv)
+
+    generator = DatasetGenerator(parse_size(args.size), seed=args.seed)
+    database = Database(args.db)
+    if not database.is_empty():
+        print(f"❌ ERROR: {args.db} ya contiene datos")
+        return 1
+
+    start = time.perf_counter()
+    generator.load_into(database)
+    database.close()
+
+    print(f"✓ {generator.num_clientes} clientes, {generator.num_mascotas} mascotas, "
+          f"{generator.num_veterinarios} veterinarios, {generator.num_citas} citas "
+          f"en {time.perf_counter() - start:.1f} s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,114 @@
+"""
+Ejecución de consultas fuera del hilo de Tk
+
+Las consultas pesadas (filtrar, ordenar, cruzar datos) corren en un pool de
+hilos; sus resultados vuelven por una cola que el hilo de Tk vacía con
+after(), así que los callbacks siempre tocan los widgets desde Tk.
+
+Reglas para el trabajo enviado:
+- No tocar widgets: leer sus valores antes de enviarlo.
+- No usar la base de datos: la conexión SQLite pertenece al hilo de Tk
+  (y sus cambios se confirman en lote); se consulta en memoria (índices).
+- Revisar token.cancelled en los bucles largos para abandonar a tiempo.
+"""
+
+import queue
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional, Tuple
+
+
+class CancelToken:
+    """Marca de una consulta; cancelada, su resultado se descarta"""
+
+    def __init__(self):
+        self.cancelled = False
+
+    def cancel(self):
+        """Marcar la consulta como cancelada (o superada por otra más nueva)"""
+        self.cancelled = True
+
+
+class QueryExecutor:
+    """Pool de hilos con cola de resultados para el hilo de Tk"""
+
+    DRAIN_INTERVAL = 15  # ms entre revisiones de la cola mientras hay consultas pendientes
+
+    def __init__(self, max_workers: int = 2):
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="consulta")
+        self._results: "queue.SimpleQueue[Tuple]" = queue.SimpleQueue()
+        self._pending = 0
+        self._draining = False
+
+    def submit(self, widget, work: Callable[[CancelToken], Any], on_done: Callable[[Any], None],
+               on_error: Optional[Callable[[Exception], None]] = None,
+               token: Optional[CancelToken] = None) -> CancelToken:
+        """
+        Enviar una consulta (llamar desde el hilo de Tk)
+
+        Args:
+            widget: Widget dueño del resultado (si se destruye, el resultado se descarta)
+            work: Función que corre en el pool; recibe el token
+            on_done: Recibe el resultado en el hilo de Tk
+            on_error: Recibe la excepción en el hilo de Tk (por defecto se relanza)
+            token: Token a usar (por defecto uno nuevo)
+
+        Returns:
+            El token de la consulta, para cancelarla
+        """
+        token = token or CancelToken()
+        self._pending += 1
+        self._pool.submit(self._run, widget, work, on_done, on_error, token)
+        if not self._draining:
+            self._draining = True
+            widget.winfo_toplevel().after(self.DRAIN_INTERVAL, lambda: self._drain(widget.winfo_toplevel()))
+        return token
+
+    def _run(self, widget, work, on_done, on_error, token: CancelToken):
+        """Correr la consulta en un hilo del pool y encolar su resultado"""
+        if token.cancelled:
+            self._results.put((widget, token, None, None, None))
+            return
+        try:
+            self._results.put((widget, token, on_done, work(token), None))
+        except Exception as error:
+            self._results.put((widget, token, on_error, None, error))
+
+    def _drain(self, root):
+        """Entregar los resultados listos en el hilo de Tk"""
+        try:
+            while True:
+                try:
+                    widget, token, callback, result, error = self._results.get_nowait()
+                except queue.Empty:
+                    break
+                self._pending -= 1
+                # Resultados viejos o de vistas ya cerradas: se descartan
+                if token.cancelled or not widget.winfo_exists():
+                    continue
+                if error is None:
+                    callback(result)
+                elif callback is not None:
+                    callback(error)
+                else:
+                    raise error
+        finally:
+            # Aunque un callback falle, la cola se sigue vaciando
+            if self._pending > 0:
+                root.after(self.DRAIN_INTERVAL, lambda: self._drain(root))
+            else:
+                self._draining = False
+
+    def shutdown(self):
+        """Detener el pool sin esperar a las consultas en curso"""
+        self._pool.shutdown(wait=False)
+
+
+_executor: Optional[QueryExecutor] = None
+
+
+def get_query_executor() -> QueryExecutor:
+    """Obtener el ejecutor de consultas de la aplicación"""
+    global _executor
+    if _executor is None:
+        _executor = QueryExecutor()
+    return _executor
@@ -0,0 +1,343 @@
+"""
+Exportación de los registros que muestra una vista a CSV, JSONL o XLSX
+
+Las filas se arman una por una (con los nombres de mascota, dueño y
+veterinario resueltos por los índices) y se escriben a medida que se
+generan. ExportTask hace la escritura en un hilo aparte y muestra el
+avance con LoadingSpinner sin bloquear la interfaz.
+"""
+
+import csv
+import json
+import os
+import re
+import threading
+import zipfile
+from datetime import date
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+from xml.sax.saxutils import escape
+
+from .animations import LoadingSpinner, NotificationManager
+from .indexes import get_indexes, index_lock
+from .mock_data import (
+    get_cliente_by_id, get_mascota_by_id, get_nombre_completo_cliente, get_veterinario_by_id
+)
+
+
+def _field(name: str) -> Callable[[Dict[str, Any]], Any]:
+    """Columna tomada directamente del registro"""
+    return lambda record: record.get(name)
+
+
+def _mascota(field: str) -> Callable[[Dict[str, Any]], Any]:
+    """Campo de la mascota de una cita"""
+    def getter(record):
+        mascota = get_mascota_by_id(record['id_mascota'])
+        return mascota[field] if mascota else None
+    return getter
+
+
+def _dueno_de_cita(record: Dict[str, Any]) -> Optional[str]:
+    """Nombre del dueño de la mascota de una cita"""
+    mascota = get_mascota_by_id(record['id_mascota'])
+    return get_nombre_completo_cliente(mascota['id_cliente']) if mascota else None
+
+
+def _dni_dueno(record: Dict[str, Any]) -> Optional[str]:
+    """DNI del dueño de una mascota"""
+    cliente = get_cliente_by_id(record['id_cliente'])
+    return cliente['dni'] if cliente else None
+
+
+def _veterinario(record: Dict[str, Any]) -> Optional[str]:
+    """Nombre del veterinario de una cita"""
+    vet = get_veterinario_by_id(record['id_veterinario'])
+    return f"{vet['nombres']} {vet['apellidos']}" if vet else None
+
+
+# entidad: [(encabezado, función que obtiene el valor)]
+EXPORT_COLUMNS: Dict[str, List[Tuple[str, Callable[[Dict[str, Any]], Any]]]] = {
+    "clientes": [
+        ("ID", _field("id")),
+        ("DNI", _field("dni")),
+        ("Nombres", _field("nombres")),
+        ("Apellidos", _field("apellidos")),
+        ("Teléfono", _field("telefono")),
+        ("Email", _field("email")),
+        ("Dirección", _field("direccion")),
+        ("Estado", _field("estado")),
+        ("Mascotas", lambda record: len(get_indexes().mascotas_by_cliente.get(record['id']))),
+    ],
+    "mascotas": [
+        ("ID", _field("id_mascota")),
+        ("Nombre", _field("nombre_mascota")),
+        ("Especie", _field("especie")),
+        ("Raza", _field("raza")),
+        ("Sexo", _field("sexo")),
+        ("Edad (años)", _field("edad_años")),
+        ("Edad (meses)", _field("edad_meses")),
+        ("Peso (kg)", _field("peso_kg")),
+        ("Color", _field("color_pelaje")),
+        ("Estado", _field("estado")),
+        ("Dueño", lambda record: get_nombre_completo_cliente(record['id_cliente'])),
+        ("DNI dueño", _dni_dueno),
+    ],
+    "citas": [
+        ("ID", _field("id_cita")),
+        ("Fecha", _field("fecha")),
+        ("Hora", _field("hora")),
+        ("Duración (min)", _field("duracion")),
+        ("Mascota", _mascota("nombre_mascota")),
+        ("Especie", _mascota("especie")),
+        ("Dueño", _dueno_de_cita),
+        ("Veterinario", _veterinario),
+        ("Motivo", _field("motivo")),
+        ("Observaciones", _field("observaciones")),
+        ("Estado", _field("estado")),
+    ],
+}
+
+FORMATS = (".csv", ".jsonl", ".xlsx")
+
+
+def export_headers(entity: str) -> List[str]:
+    """Encabezados de la exportación de una entidad"""
+    return [header for header, _ in EXPORT_COLUMNS[entity]]
+
+
+def export_rows(entity: str, records: Iterable[Dict[str, Any]]) -> Iterator[List[Any]]:
+    """Generar las filas a exportar con los campos relacionados ya resueltos"""
+    getters = [getter for _, getter in EXPORT_COLUMNS[entity]]
+    for record in records:
+        # Corre en el hilo de la exportación: los índices se leen con el lock
+        with index_lock.read():
+            row = [getter(record) for getter in getters]
+        yield row
+
+
+class ExportCancelled(Exception):
+    """La exportación se canceló antes de terminar"""
+
+
+def write_export(path: str, headers: Sequence[str], rows: Iterable[Sequence[Any]],
+                 progress: Optional[Callable[[int], None]] = None,
+                 cancelled: Optional[threading.Event] = None,
+                 progress_every: int = 500) -> int:
+    """
+    Escribir filas en el formato indicado por la extensión del archivo
+
+    Args:
+        path: Archivo .csv, .jsonl o .xlsx
+        headers: Encabezados de las columnas
+        rows: Filas (se consumen una por una)
+        progress: Callback con la cantidad de filas escritas
+        cancelled: Evento que detiene la exportación (el archivo se borra)
+
+    Returns:
+        Cantidad de filas escritas
+    """
+    extension = os.path.splitext(path)[1].lower()
+    writers = {".csv": _write_csv, ".jsonl": _write_jsonl, ".xlsx": _write_xlsx}
+    if extension not in writers:
+        raise ValueError(f"Formato no soportado: {extension} (use {', '.join(FORMATS)})")
+
+    written = 0
+
+    def counted(source: Iterable[Sequence[Any]]) -> Iterator[Sequence[Any]]:
+        nonlocal written
+        for row in source:
+            if cancelled is not None and cancelled.is_set():
+                raise ExportCancelled()
+            yield row
+            written += 1
+            if progress and written % progress_every == 0:
+                progress(written)
+
+    try:
+        writers[extension](path, headers, counted(rows))
+    except ExportCancelled:
+        os.remove(path)
+        raise
+    if progress:
+        progress(written)
+    return written
+
+
+def _write_csv(path: str, headers: Sequence[str], rows: Iterable[Sequence[Any]]):
+    """CSV con BOM para que Excel reconozca los acentos"""
+    with open(path, "w", newline="", encoding="utf-8-sig") as out:
+        writer = csv.writer(out)
+        writer.writerow(headers)
+        writer.writerows(rows)
+
+
+def _write_jsonl(path: str, headers: Sequence[str], rows: Iterable[Sequence[Any]]):
+    """Un objeto JSON por línea"""
+    with open(path, "w", encoding="utf-8") as out:
+        for row in rows:
+            out.write(json.dumps(dict(zip(headers, row)), ensure_ascii=False) + "\n")
+
+
+# Partes fijas de un libro XLSX de una sola hoja
+_XLSX_PARTS = {
+    "[Content_Types].xml": (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+        '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+        '<Default Extension="xml" ContentType="application/xml"/>'
+        '<Override PartName="/xl/workbook.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+        '<Override PartName="/xl/worksheets/sheet1.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+        '</Types>'
+    ),
+    "_rels/.rels": (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" Target="xl/workbook.xml" '
+        'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument"/>'
+        '</Relationships>'
+    ),
+    "xl/workbook.xml": (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+        'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+        '<sheets><sheet name="Datos" sheetId="1" r:id="rId1"/></sheets></workbook>'
+    ),
+    "xl/_rels/workbook.xml.rels": (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" Target="worksheets/sheet1.xml" '
+        'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet"/>'
+        '</Relationships>'
+    ),
+}
+
+# Caracteres de control que XML no admite
+_XML_INVALID = re.compile("[\x00-\x08\x0b\x0c\x0e-\x1f]")
+
+
+def _xlsx_row(number: int, row: Sequence[Any]) -> str:
+    """Fila de la hoja (textos en línea, sin tabla de cadenas compartidas)"""
+    cells = []
+    for value in row:
+        if value is None:
+            cells.append("<c/>")
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            cells.append(f"<c><v>{value}</v></c>")
+        else:
+            text = escape(_XML_INVALID.sub("", str(value)))
+            cells.append(f'<c t="inlineStr"><is><t xml:space="preserve">{text}</t></is></c>')
+    return f'<row r="{number}">{"".join(cells)}</row>'
+
+
+def _write_xlsx(path: str, headers: Sequence[str], rows: Iterable[Sequence[Any]]):
+    """Libro XLSX mínimo escrito en streaming dentro del zip"""
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as book:
+        for name, content in _XLSX_PARTS.items():
+            book.writestr(name, content)
+        with book.open("xl/worksheets/sheet1.xml", "w", force_zip64=True) as sheet:
+            sheet.write(
+                b'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+                b'<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main"><sheetData>'
+            )
+            sheet.write(_xlsx_row(1, headers).encode("utf-8"))
+            for number, row in enumerate(rows, start=2):
+                sheet.write(_xlsx_row(number, row).encode("utf-8"))
+            sheet.write(b"</sheetData></worksheet>")
+
+
+class ExportTask:
+    """Exportación en segundo plano con avance en un LoadingSpinner"""
+
+    POLL_MS = 100
+
+    def __init__(self, parent, entity: str, records: Iterable[Dict[str, Any]], path: str):
+        """
+        Args:
+            parent: Widget donde se muestra el spinner y las notificaciones
+            entity: 'clientes', 'mascotas' o 'citas'
+            records: Registros a exportar (p. ej. los filtrados de la vista)
+            path: Archivo de destino
+        """
+        self.parent = parent
+        self.entity = entity
+        self.path = path
+        # Copia de la lista (no de los registros): la vista puede seguir filtrando
+        self.records = list(records)
+        # Los índices se crean aquí si hace falta: usan la conexión SQLite del hilo de Tk
+        get_indexes()
+        self.cancelled = threading.Event()
+        self.spinner = LoadingSpinner(parent)
+
+        self._written = 0
+        self._error: Optional[Exception] = None
+        self._done = False
+
+    def start(self):
+        """Iniciar la exportación"""
+        self.spinner.show(self._message(), on_cancel=self.cancel)
+        threading.Thread(target=self._run, daemon=True).start()
+        self.parent.after(self.POLL_MS, self._poll)
+
+    def cancel(self):
+        """Detener la exportación (se descarta el archivo)"""
+        self.cancelled.set()
+
+    def _message(self) -> str:
+        """Texto del spinner"""
+        return f"Exportando {self._written:,} de {len(self.records):,}"
+
+    def _run(self):
+        """Escribir el archivo (hilo de trabajo; no toca widgets)"""
+        try:
+            write_export(
+                self.path,
+                export_headers(self.entity),
+                export_rows(self.entity, self.records),
+                progress=self._set_progress,
+                cancelled=self.cancelled,
+            )
+        except Exception as error:
+            self._error = error
+        finally:
+            self._done = True
+
+    def _set_progress(self, written: int):
+        """Avance reportado por el hilo de trabajo"""
+        self._written = written
+
+    def _poll(self):
+        """Actualizar el spinner desde el hilo de Tk hasta que termine"""
+        if not self._done:
+            self.spinner.set_message(self._message())
+            self.parent.after(self.POLL_MS, self._poll)
+            return
+
+        self.spinner.hide()
+        if isinstance(self._error, ExportCancelled):
+            NotificationManager.show_warning(self.parent, "Exportación cancelada")
+        elif self._error is not None:
+            NotificationManager.show_error(self.parent, f"❌ Error al exportar: {self._error}")
+        else:
+            NotificationManager.show_success(
+                self.parent, f"✓ {self._written:,} filas exportadas a {os.path.basename(self.path)}")
+
+
+def export_view(parent, entity: str, records: Iterable[Dict[str, Any]]) -> Optional[ExportTask]:
+    """Pedir el archivo de destino y exportar los registros que muestra una vista"""
+    from tkinter import filedialog
+
+    path = filedialog.asksaveasfilename(
+        parent=parent,
+        title="Exportar",
+        initialfile=f"{entity}_{date.today().isoformat()}.csv",
+        defaultextension=".csv",
+        filetypes=[("CSV", "*.csv"), ("JSON Lines", "*.jsonl"), ("Excel", "*.xlsx")],
+    )
+    if not path:
+        return None
+
+    task = ExportTask(parent, entity, records, path)
+    task.start()
+    return task
@@ -0,0 +1,362 @@
+"""
+Importación masiva de clientes, mascotas y citas desde CSV o JSONL
+
+El archivo se lee fila por fila y se inserta en lotes: la importación solo
+retiene el lote en curso, así que su consumo de memoria no depende del
+tamaño del archivo. Cada fila se valida con Validator y sus claves
+foráneas se resuelven con los índices; las filas rechazadas se escriben
+en un archivo JSONL de errores con su número de línea y el motivo.
+
+La importación no emite eventos: con la aplicación abierta hay que llamar
+a DataIndexes.reload() al terminar.
+
+Uso:
+    python -m utils.importer clientes clientes.csv --db veterinaria.db
+    python -m utils.importer mascotas mascotas.jsonl --db veterinaria.db
+"""
+
+import argparse
+import csv
+import json
+import os
+import sqlite3
+import sys
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterator, List, Optional, Set, Tuple
+
+from .snapshot import column_kinds
+from .validators import Validator
+
+# Valor de 'estado' cuando el archivo no lo trae (igual que el DEFAULT del esquema)
+DEFAULT_ESTADO = {
+    "clientes": "Activo",
+    "mascotas": "Activo",
+    "citas": "Programada",
+}
+
+
+def read_rows(path: str) -> Iterator[Tuple[int, Optional[Dict[str, Any]]]]:
+    """
+    Leer un CSV (con encabezados) o JSONL como generador
+
+    Yields:
+        (número de línea, fila); la fila es None si la línea no se pudo leer
+    """
+    extension = os.path.splitext(path)[1].lower()
+    if extension == ".csv":
+        with open(path, newline="", encoding="utf-8-sig") as source:
+            reader = csv.DictReader(source)
+            for row in reader:
+                yield reader.line_num, row
+    elif extension in (".jsonl", ".ndjson"):
+        with open(path, encoding="utf-8") as source:
+            for line_number, line in enumerate(source, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    row = json.loads(line)
+                except ValueError:
+                    row = None
+                yield line_number, row if isinstance(row, dict) else None
+    else:
+        raise ValueError(f"Formato no soportado: {extension} (use .csv o .jsonl)")
+
+
+@dataclass
+class ImportReport:
+    """Resultado de una importación"""
+
+    entity: str
+    total: int = 0
+    imported: int = 0
+    rejected: int = 0
+    seconds: float = 0.0
+    error_path: Optional[str] = None
+
+    @property
+    def rows_per_second(self) -> float:
+        """Filas procesadas por segundo"""
+        return self.total / self.seconds if self.seconds else 0.0
+
+
+class _RejectWriter:
+    """Archivo JSONL de filas rechazadas (se crea con el primer rechazo)"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = None
+
+    def write(self, line_number: Optional[int], problems: List[str], raw: Optional[Dict[str, Any]]):
+        """Registrar una fila rechazada con sus motivos"""
+        if self._file is None:
+            self._file = open(self.path, "w", encoding="utf-8")
+        entry = {"linea": line_number, "errores": problems, "fila": raw}
+        self._file.write(json.dumps(entry, ensure_ascii=False, default=str) + "\n")
+
+    def close(self):
+        """Cerrar el archivo si se llegó a crear"""
+        if self._file is not None:
+            self._file.close()
+
+
+class BulkImporter:
+    """Importador por lotes hacia los repositorios de la base de datos"""
+
+    ENTITIES = ("clientes", "mascotas", "citas")
+
+    def __init__(self, database, indexes, batch_size: int = 1000):
+        """
+        Args:
+            database: Database de destino
+            indexes: DataIndexes usados para resolver claves foráneas (las
+                filas de esta importación se buscan en SQLite por clave primaria)
+            batch_size: Filas por transacción
+        """
+        self.database = database
+        self.indexes = indexes
+        self.batch_size = batch_size
+
+    def import_file(self, entity: str, path: str, error_path: Optional[str] = None,
+                    progress: Optional[Callable[[ImportReport], None]] = None) -> ImportReport:
+        """
+        Importar un archivo completo
+
+        Args:
+            entity: 'clientes', 'mascotas' o 'citas'
+            path: Archivo .csv o .jsonl
+            error_path: Archivo de filas rechazadas (por defecto <archivo>.rechazados.jsonl)
+            progress: Callback llamado tras cada lote con el reporte parcial
+        """
+        if entity not in self.ENTITIES:
+            raise ValueError(f"Entidad desconocida: {entity}")
+
+        repo = getattr(self.database, entity)
+        kinds = dict(column_kinds(repo.record_type))
+        validate = getattr(self, f"_validate_{entity}")
+
+        report = ImportReport(entity, error_path=error_path or os.path.splitext(path)[0] + ".rechazados.jsonl")
+        errors = _RejectWriter(report.error_path)
+        batch: List[Dict[str, Any]] = []
+        pending_ids: Set[int] = set()
+        pending_keys: Set[str] = set()
+        start = time.perf_counter()
+
+        # Lo que la aplicación tuviera pendiente no se mezcla con los lotes
+        self.database.commit(force=True)
+        try:
+            for line_number, raw in read_rows(path):
+                report.total += 1
+                record, problems = self._convert(repo, kinds, raw)
+                if not problems:
+                    problems = validate(record, pending_keys)
+                if not problems:
+                    problems = self._assign_id(repo, record, pending_ids)
+
+                if problems:
+                    errors.write(line_number, problems, raw)
+                    report.rejected += 1
+                    continue
+
+                batch.append(record)
+                if len(batch) >= self.batch_size:
+                    self._flush(repo, batch, errors, report)
+                    batch, pending_ids, pending_keys = [], set(), set()
+                    report.seconds = time.perf_counter() - start
+                    if progress:
+                        progress(report)
+
+            if batch:
+                self._flush(repo, batch, errors, report)
+        finally:
+            errors.close()
+
+        report.seconds = time.perf_counter() - start
+        if not report.rejected:
+            report.error_path = None
+        # Las filas importadas no pasan por el diario: la instantánea queda vieja
+        self.database.invalidate_snapshot()
+        if progress:
+            progress(report)
+        return report
+
+    def _convert(self, repo, kinds: Dict[str, str], raw: Optional[Dict[str, Any]]) -> Tuple[Optional[Dict[str, Any]], List[str]]:
+        """Normalizar tipos de una fila leída del archivo"""
+        if raw is None:
+            return None, ["Línea ilegible"]
+
+        record: Dict[str, Any] = {}
+        problems = []
+        for column, value in raw.items():
+            if isinstance(value, str):
+                value = value.strip()
+            if value == "":
+                value = None
+            if column not in kinds:
+                # Columnas auxiliares (p. ej. dni_cliente) se conservan para la validación
+                record[column] = value
+                continue
+            try:
+                if value is not None and kinds[column] == "q":
+                    value = int(value)
+                elif value is not None and kinds[column] == "d":
+                    value = float(value)
+                elif value is not None:
+                    value = str(value)
+            except (TypeError, ValueError):
+                problems.append(f"{column}: número inválido")
+            record[column] = value
+
+        if record.get("estado") is None:
+            record["estado"] = DEFAULT_ESTADO[repo.table]
+        return record, problems
+
+    def _assign_id(self, repo, record: Dict[str, Any], pending_ids: Set[int]) -> List[str]:
+        """Usar el ID del archivo si está libre o pedir uno nuevo"""
+        record_id = record.get(repo.key)
+        if record_id is None:
+            record_id = self.database.sequences.next_id(repo.table, repo.key)
+            while record_id in pending_ids:
+                record_id = self.database.sequences.next_id(repo.table, repo.key)
+        elif record_id <= 0:
+            return [f"{repo.key}: debe ser positivo"]
+        elif record_id in pending_ids or self._exists(repo.table, record_id):
+            return [f"{repo.key}: {record_id} ya existe"]
+
+        record[repo.key] = record_id
+        pending_ids.add(record_id)
+        return []
+
+    def _flush(self, repo, batch: List[Dict[str, Any]], errors: _RejectWriter, report: ImportReport):
+        """Insertar un lote en una sola transacción"""
+        rows = [repo.record_type.from_dict({k: v for k, v in r.items() if k in repo.columns}) for r in batch]
+        try:
+            repo.add_many(rows)
+            self.database.commit(force=True)
+            report.imported += len(rows)
+        except sqlite3.IntegrityError:
+            # Un conflicto no previsto invalida el lote: se reintenta fila por fila
+            self.database.connection.rollback()
+            for row in rows:
+                try:
+                    repo.add_many([row])
+                    self.database.commit(force=True)
+                    report.imported += 1
+                except sqlite3.IntegrityError as error:
+                    self.database.connection.rollback()
+                    report.rejected += 1
+                    errors.write(None, [str(error)], row.to_dict())
+
+    def _exists(self, table: str, record_id: Any) -> bool:
+        """Verificar que exista el registro (índice en memoria y luego SQLite)"""
+        if not isinstance(record_id, int):
+            return False
+        return record_id in getattr(self.indexes, table) or \
+            getattr(self.database, table).get_by_id(record_id) is not None
+
+    @staticmethod
+    def _check(problems: List[str], column: str, result: Tuple[bool, Optional[str]]):
+        """Agregar el mensaje de un Validator si falló"""
+        valid, message = result
+        if not valid:
+            problems.append(f"{column}: {message}")
+
+    @staticmethod
+    def _required(problems: List[str], record: Dict[str, Any], *columns: str):
+        """Verificar campos obligatorios"""
+        for column in columns:
+            if record.get(column) is None:
+                problems.append(f"{column}: es obligatorio")
+
+    def _validate_clientes(self, record: Dict[str, Any], pending_keys: Set[str]) -> List[str]:
+        """Validar una fila de cliente"""
+        problems: List[str] = []
+        self._required(problems, record, "nombres", "apellidos")
+        self._check(problems, "dni", Validator.validate_dni(record.get("dni") or ""))
+        self._check(problems, "telefono", Validator.validate_phone(record.get("telefono") or ""))
+        self._check(problems, "email", Validator.validate_email(record.get("email") or ""))
+
+        dni = record.get("dni")
+        if not problems:
+            if dni in pending_keys or self.database.clientes.get_by_dni(dni):
+                problems.append(f"dni: {dni} ya está registrado")
+            else:
+                pending_keys.add(dni)
+        return problems
+
+    def _validate_mascotas(self, record: Dict[str, Any], pending_keys: Set[str]) -> List[str]:
+        """Validar una fila de mascota (el dueño puede venir como id_cliente o dni_cliente)"""
+        problems: List[str] = []
+        self._required(problems, record, "nombre_mascota")
+
+        dni_cliente = record.pop("dni_cliente", None)
+        if record.get("id_cliente") is None and dni_cliente:
+            cliente = self.database.clientes.get_by_dni(str(dni_cliente))
+            record["id_cliente"] = cliente["id"] if cliente else None
+        if not self._exists("clientes", record.get("id_cliente")):
+            problems.append(f"id_cliente: cliente inexistente ({record.get('id_cliente') or dni_cliente})")
+
+        if record.get("peso_kg") is not None:
+            self._check(problems, "peso_kg", Validator.validate_peso(str(record["peso_kg"])))
+        anios, meses = record.get("edad_años"), record.get("edad_meses")
+        if anios is not None or meses is not None:
+            self._check(problems, "edad", Validator.validate_edad(
+                "" if anios is None else str(anios), "" if meses is None else str(meses)))
+        record["edad_años"] = anios or 0
+        record["edad_meses"] = meses or 0
+        return problems
+
+    def _validate_citas(self, record: Dict[str, Any], pending_keys: Set[str]) -> List[str]:
+        """Validar una fila de cita"""
+        problems: List[str] = []
+        self._check(problems, "fecha", Validator.validate_fecha(record.get("fecha") or ""))
+        self._check(problems, "hora", Validator.validate_hora(record.get("hora") or ""))
+        if record.get("duracion") is not None and record["duracion"] <= 0:
+            problems.append(f"duracion: debe ser mayor que cero ({record['duracion']})")
+        if not self._exists("mascotas", record.get("id_mascota")):
+            problems.append(f"id_mascota: mascota inexistente ({record.get('id_mascota')})")
+        if not self._exists("veterinarios", record.get("id_veterinario")):
+            problems.append(f"id_veterinario: veterinario inexistente ({record.get('id_veterinario')})")
+        return problems
+
+
+def main(argv: List[str] = None) -> int:
+    """Función principal"""
+    from .database import Database
+    from .event_manager import EventManager
+    from .indexes import DataIndexes
+
+    parser = argparse.ArgumentParser(description="Importar datos desde CSV o JSONL")
+    parser.add_argument("entity", choices=BulkImporter.ENTITIES, help="Tipo de registro")
+    parser.add_argument("path", help="Archivo .csv o .jsonl")
+    parser.add_argument("--db", required=True, help="Archivo SQLite de destino")
+    parser.add_argument("--errors", help="Archivo de filas rechazadas")
+    parser.add_argument("--batch", type=int, default=1000, help="Filas por transacción")
+    args = parser.parse_args(argv)
+
+    database = Database(args.db)
+    event_manager = EventManager()
+    database.attach_journal(event_manager)
+    indexes = DataIndexes(database, event_manager, database.open_snapshot())
+
+    def show_progress(report: ImportReport):
+        print(f"\r  {report.total:,} filas ({report.rows_per_second:,.0f} filas/s)", end="", flush=True)
+
+    try:
+        report = BulkImporter(database, indexes, args.batch).import_file(
+            args.entity, args.path, args.errors, progress=show_progress)
+    except (OSError, ValueError) as error:
+        print(f"❌ ERROR: {error}")
+        database.close()
+        return 1
+    database.close()
+
+    print(f"\n✓ {report.imported:,} {args.entity} importados, {report.rejected:,} rechazados "
+          f"en {report.seconds:.1f} s ({report.rows_per_second:,.0f} filas/s)")
+    if report.error_path:
+        print(f"  Rechazos: {report.error_path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
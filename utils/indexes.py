@@ -0,0 +1,1219 @@
+"""
+Índices en memoria sincronizados con los eventos de la aplicación
+
+Si hay una instantánea al día, los índices se apoyan en ella: un registro
+se materializa la primera vez que se pide y los índices secundarios se
+construyen en su primera consulta.
+
+Las consultas pueden correr en el ejecutor (utils.executor) mientras el
+hilo de Tk aplica eventos: los eventos modifican los índices con
+index_lock.write() y las consultas de otros hilos leen con
+index_lock.read(); las cargas diferidas se hacen bajo otro lock y se
+marcan como hechas recién al terminar.
+"""
+
+import bisect
+import heapq
+import threading
+import unicodedata
+from collections import Counter
+from contextlib import contextmanager
+from datetime import date, timedelta
+from functools import lru_cache
+from typing import AbstractSet, Any, Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple, Union
+
+from .database import Database, get_database
+from .event_manager import AppContext, AppEvents, Event, EventManager
+from .snapshot import Snapshot, SnapshotTable
+
+# Una carga diferida a la vez: el otro hilo espera a que termine
+_load_lock = threading.RLock()
+
+
+class ReadWriteLock:
+    """Lock de lectura/escritura: varias lecturas a la vez o una sola escritura (no reentrante)"""
+
+    def __init__(self):
+        self._condition = threading.Condition(threading.Lock())
+        self._readers = 0
+        self._writing = False
+
+    @contextmanager
+    def read(self):
+        """Leer sin que otro hilo modifique los índices mientras tanto"""
+        with self._condition:
+            while self._writing:
+                self._condition.wait()
+            self._readers += 1
+        try:
+            yield
+        finally:
+            with self._condition:
+                self._readers -= 1
+                if not self._readers:
+                    self._condition.notify_all()
+
+    @contextmanager
+    def write(self):
+        """Modificar los índices cuando no hay lecturas en curso"""
+        with self._condition:
+            while self._writing or self._readers:
+                self._condition.wait()
+            self._writing = True
+        try:
+            yield
+        finally:
+            with self._condition:
+                self._writing = False
+                self._condition.notify_all()
+
+
+# Los eventos (hilo de Tk) escriben con write(); los hilos de trabajo leen con
+# read(). El hilo de Tk es el único que escribe, así que sus lecturas no lo usan
+index_lock = ReadWriteLock()
+
+
+class ForeignKeyIndex:
+    """Índice multivalor por clave foránea (id padre -> conjunto de IDs hijos)"""
+
+    def __init__(self, key: str, foreign_key: str):
+        self.key = key
+        self.foreign_key = foreign_key
+        # Columnas que se leen de la instantánea para la carga diferida
+        self.snapshot_columns = (foreign_key,)
+        self._children: Dict[Any, Set[int]] = {}
+        self._parent_of: Dict[int, Any] = {}
+        self._source: Optional[Callable[[], Iterable[Tuple[int, Any]]]] = None
+
+    def load(self, records: Iterable[Dict[str, Any]]):
+        """Cargar el índice desde cero"""
+        self._children = {}
+        self._parent_of = {}
+        self._source = None
+        for record in records:
+            self.put(record)
+
+    def load_lazy(self, source: Callable[[], Iterable[Tuple[int, Any]]]):
+        """Cargar el índice en su primer uso a partir de pares (id hijo, id padre)"""
+        self._children = {}
+        self._parent_of = {}
+        self._source = source
+
+    def _ensure_loaded(self):
+        """Construir el índice pendiente de carga"""
+        if self._source is None:
+            return
+        with _load_lock:
+            if self._source is None:
+                return
+            for child_id, parent_id in self._source():
+                self._parent_of[child_id] = parent_id
+                self._children.setdefault(parent_id, set()).add(child_id)
+            self._source = None
+
+    def put(self, record: Dict[str, Any]):
+        """Registrar (o mover) un hijo bajo su padre actual"""
+        self._ensure_loaded()
+        child_id = record[self.key]
+        parent_id = record.get(self.foreign_key)
+        if child_id in self._parent_of and self._parent_of[child_id] == parent_id:
+            return
+
+        self.remove(child_id)
+        self._parent_of[child_id] = parent_id
+        self._children.setdefault(parent_id, set()).add(child_id)
+
+    def remove(self, child_id: int):
+        """Quitar un hijo del índice"""
+        self._ensure_loaded()
+        if child_id not in self._parent_of:
+            return
+        parent_id = self._parent_of.pop(child_id)
+        children = self._children.get(parent_id)
+        if children is not None:
+            children.discard(child_id)
+            if not children:
+                del self._children[parent_id]
+
+    def get(self, parent_id: Any) -> AbstractSet[int]:
+        """IDs de los hijos de un padre (copia: no cambia si después se modifica el índice)"""
+        self._ensure_loaded()
+        return frozenset(self._children.get(parent_id, ()))
+
+
+class CountIndex:
+    """Cantidad de registros por valor de un campo (p. ej. estado -> total)"""
+
+    def __init__(self, key: str, field: str):
+        self.key = key
+        self.field = field
+        self.snapshot_columns = (field,)
+        self._counts: Counter = Counter()
+        self._value_of: Dict[int, Any] = {}
+        self._source: Optional[Callable[[], Iterable[Tuple[int, Any]]]] = None
+
+    def load(self, records: Iterable[Dict[str, Any]]):
+        """Cargar el índice desde cero"""
+        self._counts = Counter()
+        self._value_of = {}
+        self._source = None
+        for record in records:
+            self.put(record)
+
+    def load_lazy(self, source: Callable[[], Iterable[Tuple[int, Any]]]):
+        """Cargar el índice en su primer uso a partir de pares (id, valor)"""
+        self._counts = Counter()
+        self._value_of = {}
+        self._source = source
+
+    def _ensure_loaded(self):
+        """Construir el índice pendiente de carga"""
+        if self._source is None:
+            return
+        with _load_lock:
+            if self._source is None:
+                return
+            self._value_of = dict(self._source())
+            self._counts = Counter(self._value_of.values())
+            self._source = None
+
+    def put(self, record: Dict[str, Any]):
+        """Registrar un registro o su nuevo valor"""
+        self._ensure_loaded()
+        record_id = record[self.key]
+        value = record.get(self.field)
+        if record_id in self._value_of and self._value_of[record_id] == value:
+            return
+
+        self.remove(record_id)
+        self._value_of[record_id] = value
+        self._counts[value] += 1
+
+    def remove(self, record_id: int):
+        """Quitar un registro del conteo"""
+        self._ensure_loaded()
+        if record_id not in self._value_of:
+            return
+        value = self._value_of.pop(record_id)
+        self._counts[value] -= 1
+        if not self._counts[value]:
+            del self._counts[value]
+
+    def count(self, value: Any) -> int:
+        """Cantidad de registros con el valor dado"""
+        self._ensure_loaded()
+        return self._counts.get(value, 0)
+
+
+@lru_cache(maxsize=4096)
+def day_ordinal(fecha: str) -> Optional[int]:
+    """Día 'YYYY-MM-DD' como entero (date.toordinal); None si no es válido"""
+    try:
+        return date.fromisoformat(fecha).toordinal()
+    except (TypeError, ValueError):
+        return None
+
+
+@lru_cache(maxsize=2048)
+def minute_of_day(hora: str) -> int:
+    """Hora 'HH:MM' como minutos desde medianoche (0 si no es válida)"""
+    try:
+        horas, minutos = hora.split(":")[:2]
+        return int(horas) * 60 + int(minutos)
+    except (AttributeError, ValueError):
+        return 0
+
+
+def cita_duration(cita: Dict[str, Any]) -> int:
+    """Minutos que ocupa una cita (la duración estándar si no la tiene)"""
+    return cita.get('duracion') or AppointmentIndex.DURATION
+
+
+class AppointmentIndex:
+    """
+    Citas ordenadas por (fecha, hora), en total y por veterinario
+
+    Cada entrada es un entero (día ordinal * 1440 + minuto) << 32 | id, de
+    modo que las listas se ordenan y comparan como enteros; las consultas
+    por rango de días son dos búsquedas binarias: O(log n + k). La duración
+    de cada cita se guarda aparte, junto a su entrada.
+    """
+
+    ID_BITS = 32
+    MINUTES_PER_DAY = 24 * 60
+    DURATION = 30  # minutos que ocupa una cita sin duración propia
+
+    def __init__(self, key: str):
+        self.key = key
+        self.snapshot_columns = ('fecha', 'hora', 'id_veterinario', 'duracion')
+        self._all: List[int] = []
+        self._by_vet: Dict[Any, List[int]] = {}
+        # ID -> (entrada, veterinario, duración)
+        self._entries: Dict[int, Tuple[int, Any, int]] = {}
+        # Cota de la cita más larga (no baja al quitar citas; solo acota la búsqueda)
+        self._longest = self.DURATION
+        self._source: Optional[Callable[[], Iterable[Tuple[int, str, str, Any, Optional[int]]]]] = None
+
+    def _entry(self, day: int, minute: int, record_id: int) -> int:
+        """Clave de orden de una cita"""
+        return ((day * self.MINUTES_PER_DAY + minute) << self.ID_BITS) | record_id
+
+    def _day_start(self, day: int) -> int:
+        """Clave mínima de un día ordinal"""
+        return (day * self.MINUTES_PER_DAY) << self.ID_BITS
+
+    def load(self, records: Iterable[Dict[str, Any]]):
+        """Cargar el índice desde cero"""
+        self._source = None
+        self._build(
+            (record[self.key], record.get('fecha'), record.get('hora'), record.get('id_veterinario'),
+             record.get('duracion'))
+            for record in records
+        )
+
+    def load_lazy(self, source: Callable[[], Iterable[Tuple[int, str, str, Any, Optional[int]]]]):
+        """Cargar el índice en su primer uso a partir de tuplas (id, fecha, hora, id veterinario, duración)"""
+        self._build(())
+        self._source = source
+
+    def _build(self, rows: Iterable[Tuple[int, str, str, Any, Optional[int]]]):
+        """Construir las listas ordenadas (un solo sort)"""
+        entries: Dict[int, Tuple[int, Any, int]] = {}
+        # Fechas y horas se repiten mucho: cada texto distinto se convierte una vez
+        days: Dict[str, Optional[int]] = {}
+        minutes: Dict[str, int] = {}
+        longest = self.DURATION
+        for record_id, fecha, hora, vet_id, duration in rows:
+            day = days.get(fecha, -1)
+            if day == -1:
+                day = days[fecha] = day_ordinal(fecha)
+            if day is None:
+                continue
+            minute = minutes.get(hora)
+            if minute is None:
+                minute = minutes[hora] = minute_of_day(hora)
+            duration = duration or self.DURATION
+            if duration > longest:
+                longest = duration
+            entries[record_id] = (((day * self.MINUTES_PER_DAY + minute) << self.ID_BITS) | record_id, vet_id, duration)
+
+        self._entries = entries
+        self._longest = longest
+        self._all = sorted(entry for entry, _, _ in entries.values())
+
+        # Recorriendo la lista ordenada, cada lista por veterinario queda ordenada
+        mask = (1 << self.ID_BITS) - 1
+        self._by_vet = {}
+        for entry in self._all:
+            self._by_vet.setdefault(entries[entry & mask][1], []).append(entry)
+
+    def _ensure_loaded(self):
+        """Construir el índice pendiente de carga"""
+        if self._source is None:
+            return
+        with _load_lock:
+            if self._source is None:
+                return
+            self._build(self._source())
+            self._source = None
+
+    def put(self, record: Dict[str, Any]):
+        """Registrar una cita o moverla a su nueva fecha, hora, duración o veterinario"""
+        self._ensure_loaded()
+        record_id = record[self.key]
+        vet_id = record.get('id_veterinario')
+        duration = cita_duration(record)
+        day = day_ordinal(record.get('fecha'))
+        entry = None if day is None else self._entry(day, minute_of_day(record.get('hora')), record_id)
+        if self._entries.get(record_id) == (entry, vet_id, duration):
+            return
+
+        self.remove(record_id)
+        if entry is None:
+            return
+        self._entries[record_id] = (entry, vet_id, duration)
+        self._longest = max(self._longest, duration)
+        bisect.insort(self._all, entry)
+        bisect.insort(self._by_vet.setdefault(vet_id, []), entry)
+
+    def remove(self, record_id: int):
+        """Quitar una cita del índice"""
+        self._ensure_loaded()
+        current = self._entries.pop(record_id, None)
+        if current is None:
+            return
+        entry, vet_id, _ = current
+        for entries in (self._all, self._by_vet.get(vet_id)):
+            position = bisect.bisect_left(entries, entry)
+            if position < len(entries) and entries[position] == entry:
+                del entries[position]
+        if not self._by_vet.get(vet_id, True):
+            del self._by_vet[vet_id]
+
+    def between(self, start: date, end: date, vet_id: Any = None) -> List[int]:
+        """IDs de las citas entre dos días (inclusive), en orden de fecha y hora"""
+        self._ensure_loaded()
+        entries = self._all if vet_id is None else self._by_vet.get(vet_id, [])
+        low = bisect.bisect_left(entries, self._day_start(start.toordinal()))
+        high = bisect.bisect_left(entries, self._day_start(end.toordinal() + 1))
+        mask = (1 << self.ID_BITS) - 1
+        return [entry & mask for entry in entries[low:high]]
+
+    def overlapping(self, vet_id: Any, day: date, minute: int,
+                    duration: Optional[int] = None, exclude: Optional[int] = None) -> List[int]:
+        """
+        IDs de las citas del veterinario que se cruzan con [minuto, minuto + duración)
+
+        Las candidatas empiezan a menos de la cita más larga antes del
+        inicio (un rango contiguo de la lista ordenada); de ellas se quedan
+        las que terminan, según su propia duración, después del inicio.
+        """
+        self._ensure_loaded()
+        duration = duration or self.DURATION
+        entries = self._by_vet.get(vet_id, [])
+        start = day.toordinal() * self.MINUTES_PER_DAY + minute
+        low = bisect.bisect_left(entries, (start - self._longest + 1) << self.ID_BITS)
+        high = bisect.bisect_left(entries, (start + duration) << self.ID_BITS)
+        mask = (1 << self.ID_BITS) - 1
+        found = []
+        for entry in entries[low:high]:
+            record_id = entry & mask
+            if record_id != exclude and (entry >> self.ID_BITS) + self._entries[record_id][2] > start:
+                found.append(record_id)
+        return found
+
+    def day(self, day: date, vet_id: Any = None) -> List[int]:
+        """IDs de las citas de un día"""
+        return self.between(day, day, vet_id)
+
+    def week(self, day: date, vet_id: Any = None) -> List[int]:
+        """IDs de las citas de la semana (lunes a domingo) que contiene el día"""
+        monday = day - timedelta(days=day.weekday())
+        return self.between(monday, monday + timedelta(days=6), vet_id)
+
+    def __len__(self) -> int:
+        self._ensure_loaded()
+        return len(self._all)
+
+
+@lru_cache(maxsize=8192)
+def search_key(text: str) -> str:
+    """Texto sin tildes ni mayúsculas (NFKD + casefold): 'Pérez' -> 'perez'"""
+    if text.isascii():
+        return text.lower()
+    decomposed = unicodedata.normalize("NFKD", text)
+    return "".join(char for char in decomposed if not unicodedata.combining(char)).casefold()
+
+
+class TextIndex:
+    """
+    Índice invertido para buscar subcadenas en varios campos
+
+    Se indexan los valores distintos de los campos, normalizados con
+    search_key (sin tildes ni mayúsculas); los valores normalizados de cada
+    registro se guardan aquí y solo se recalculan con su evento de
+    modificación. Cada valor apunta a los registros que lo tienen, y cada
+    subcadena de 1 a 3 caracteres (n-grama) apunta a los valores que la
+    contienen. Una consulta corta es una sola búsqueda; una larga toma la
+    lista más corta entre sus trigramas y confirma la subcadena solo en esos
+    valores.
+    """
+
+    GRAM = 3
+
+    def __init__(self, key: str, fields: Tuple[str, ...]):
+        self.key = key
+        self.fields = tuple(fields)
+        self.snapshot_columns = self.fields
+        self._values_of: Dict[int, Tuple[str, ...]] = {}
+        self._ids_by_value: Dict[str, List[int]] = {}
+        self._postings: Dict[str, List[str]] = {}
+        self._source: Optional[Callable[[], Iterable[Tuple[Any, ...]]]] = None
+
+    @staticmethod
+    def normalize(value: str) -> str:
+        """Forma en que se comparan campos y consultas"""
+        return search_key(value)
+
+    def _grams(self, value: str) -> Set[str]:
+        """Subcadenas de 1 a GRAM caracteres de un valor"""
+        return {
+            value[i:i + n]
+            for n in range(1, self.GRAM + 1)
+            for i in range(len(value) - n + 1)
+        }
+
+    def load(self, records: Iterable[Dict[str, Any]]):
+        """Cargar el índice desde cero"""
+        self._source = None
+        self._build(
+            (record[self.key],) + tuple(record.get(field) for field in self.fields)
+            for record in records
+        )
+
+    def load_lazy(self, source: Callable[[], Iterable[Tuple[Any, ...]]]):
+        """Cargar el índice en su primer uso a partir de tuplas (id, *campos)"""
+        self._build(())
+        self._source = source
+
+    def _build(self, rows: Iterable[Tuple[Any, ...]]):
+        """Construir el índice (cada valor distinto se normaliza una vez)"""
+        self._values_of = {}
+        self._ids_by_value = {}
+        self._postings = {}
+        normalized: Dict[Any, str] = {}
+        for record_id, *fields in rows:
+            values = []
+            for field in fields:
+                if field is None:
+                    continue
+                value = normalized.get(field)
+                if value is None:
+                    value = normalized[field] = self.normalize(str(field))
+                values.append(value)
+            self._add(record_id, tuple(values))
+
+    def _ensure_loaded(self):
+        """Construir el índice pendiente de carga"""
+        if self._source is None:
+            return
+        with _load_lock:
+            if self._source is None:
+                return
+            self._build(self._source())
+            self._source = None
+
+    def _add(self, record_id: int, values: Tuple[str, ...]):
+        """Registrar los valores de un registro"""
+        self._values_of[record_id] = values
+        for value in values:
+            ids = self._ids_by_value.get(value)
+            if ids is None:
+                self._ids_by_value[value] = [record_id]
+                for gram in self._grams(value):
+                    self._postings.setdefault(gram, []).append(value)
+            else:
+                ids.append(record_id)
+
+    def put(self, record: Dict[str, Any]):
+        """Registrar un registro o actualizar sus valores"""
+        self._ensure_loaded()
+        record_id = record[self.key]
+        values = tuple(
+            self.normalize(str(record.get(field)))
+            for field in self.fields if record.get(field) is not None
+        )
+        if self._values_of.get(record_id) == values:
+            return
+        self.remove(record_id)
+        self._add(record_id, values)
+
+    def remove(self, record_id: int):
+        """Quitar un registro del índice"""
+        self._ensure_loaded()
+        for value in self._values_of.pop(record_id, ()):
+            ids = self._ids_by_value[value]
+            ids.remove(record_id)
+            if ids:
+                continue
+            # Último registro con ese valor: sale también de los n-gramas
+            del self._ids_by_value[value]
+            for gram in self._grams(value):
+                values = self._postings[gram]
+                values.remove(value)
+                if not values:
+                    del self._postings[gram]
+
+    def contains(self, record_id: int, key: str) -> bool:
+        """¿Algún campo del registro contiene la clave (ya normalizada)?"""
+        self._ensure_loaded()
+        return any(key in value for value in self._values_of.get(record_id, ()))
+
+    def search(self, query: str) -> Optional[Set[int]]:
+        """IDs con algún campo que contiene la consulta (None si la consulta está vacía)"""
+        if not query:
+            return None
+        self._ensure_loaded()
+        query = self.normalize(query)
+        if len(query) <= self.GRAM:
+            values: Iterable[str] = self._postings.get(query, ())
+        else:
+            postings = [self._postings.get(query[i:i + self.GRAM]) for i in range(len(query) - self.GRAM + 1)]
+            if not all(postings):
+                return set()
+            values = [value for value in min(postings, key=len) if query in value]
+
+        result: Set[int] = set()
+        for value in values:
+            result.update(self._ids_by_value[value])
+        return result
+
+
+class _TrieNode:
+    """Nodo del trie: tramo de dígitos desde el padre, hijos por primer dígito e IDs que terminan aquí"""
+
+    __slots__ = ("label", "children", "ids")
+
+    def __init__(self, label: str, children: Optional[Dict[str, "_TrieNode"]] = None,
+                 ids: Optional[List[int]] = None):
+        self.label = label
+        self.children = children
+        self.ids = ids
+
+
+class DigitTrie:
+    """
+    Trie de dígitos (compacto) para buscar por prefijo de DNI o teléfono
+
+    Cada arista guarda un tramo de dígitos y los nodos con un solo hijo se
+    fusionan, así que hay a lo sumo dos nodos por número. Llegar al nodo de
+    un prefijo cuesta tantos pasos como dígitos tiene; los registros que
+    coinciden son los del subárbol de ese nodo.
+    """
+
+    def __init__(self, key: str, fields: Tuple[str, ...]):
+        self.key = key
+        self.fields = tuple(fields)
+        self.snapshot_columns = self.fields
+        self._root = _TrieNode("", {})
+        self._keys_of: Dict[int, Tuple[str, ...]] = {}
+        self._source: Optional[Callable[[], Iterable[Tuple[Any, ...]]]] = None
+
+    @staticmethod
+    def normalize(value: str) -> str:
+        """Forma en que se comparan las consultas (el número sin espacios alrededor)"""
+        return value.strip()
+
+    @staticmethod
+    def accepts(query: str) -> bool:
+        """¿La consulta es un número (se busca en el trie)?"""
+        return query.strip().isdigit()
+
+    @staticmethod
+    def _numbers(fields: Iterable[Any]) -> Tuple[str, ...]:
+        """Números distintos (solo dígitos) de los campos de un registro"""
+        numbers: Dict[str, None] = {}
+        for field in fields:
+            if field is not None:
+                digits = str(field).strip()
+                if not digits.isdigit():
+                    digits = "".join(char for char in digits if char.isdigit())
+                if digits:
+                    numbers[digits] = None
+        return tuple(numbers)
+
+    def load(self, records: Iterable[Dict[str, Any]]):
+        """Cargar el índice desde cero"""
+        self._source = None
+        self._build(
+            (record[self.key],) + tuple(record.get(field) for field in self.fields)
+            for record in records
+        )
+
+    def load_lazy(self, source: Callable[[], Iterable[Tuple[Any, ...]]]):
+        """Cargar el índice en su primer uso a partir de tuplas (id, *campos)"""
+        self._build(())
+        self._source = source
+
+    def _build(self, rows: Iterable[Tuple[Any, ...]]):
+        """Construir el índice de una vez a partir de los números ordenados"""
+        self._keys_of = {}
+        pairs = []
+        for record_id, *fields in rows:
+            numbers = self._keys_of[record_id] = self._numbers(fields)
+            pairs.extend((number, record_id) for number in numbers)
+        pairs.sort()
+
+        # En orden, cada número comparte con el anterior un prefijo: la pila
+        # guarda el camino (nodo, dígitos hasta él) del número anterior
+        self._root = _TrieNode("", {})
+        path = [(self._root, 0)]
+        previous = ""
+        for number, record_id in pairs:
+            if number == previous:
+                path[-1][0].ids.append(record_id)
+                continue
+            common = 0
+            while common < len(previous) and common < len(number) and previous[common] == number[common]:
+                common += 1
+            while path[-1][1] > common:
+                node, _ = path.pop()
+                parent, depth = path[-1]
+                if depth < common:
+                    # El número se separa a mitad de la arista: se parte
+                    cut = common - depth
+                    middle = _TrieNode(node.label[:cut], {node.label[cut]: node})
+                    node.label = node.label[cut:]
+                    parent.children[middle.label[0]] = middle
+                    path.append((middle, common))
+            parent, depth = path[-1]
+            if parent.children is None:
+                parent.children = {}
+            leaf = parent.children[number[depth]] = _TrieNode(number[depth:], ids=[record_id])
+            path.append((leaf, len(number)))
+            previous = number
+
+    def _ensure_loaded(self):
+        """Construir el índice pendiente de carga"""
+        if self._source is None:
+            return
+        with _load_lock:
+            if self._source is None:
+                return
+            self._build(self._source())
+            self._source = None
+
+    def _insert(self, number: str, record_id: int):
+        """Agregar un número, partiendo la arista donde se separa de otro"""
+        node, i = self._root, 0
+        while i < len(number):
+            if node.children is None:
+                node.children = {}
+            child = node.children.get(number[i])
+            if child is None:
+                node.children[number[i]] = _TrieNode(number[i:], ids=[record_id])
+                return
+            label = child.label
+            if not number.startswith(label, i):
+                common = 1
+                while i + common < len(number) and label[common] == number[i + common]:
+                    common += 1
+                middle = _TrieNode(label[:common], {label[common]: child})
+                child.label = label[common:]
+                node.children[number[i]] = child = middle
+            node, i = child, i + len(child.label)
+        if node.ids is None:
+            node.ids = []
+        node.ids.append(record_id)
+
+    def _delete(self, number: str, record_id: int):
+        """Quitar un número; los nodos vacíos se borran y los de un solo hijo se fusionan"""
+        path = [self._root]
+        i = 0
+        while i < len(number):
+            node = path[-1]
+            child = node.children.get(number[i]) if node.children else None
+            if child is None or not number.startswith(child.label, i):
+                return
+            path.append(child)
+            i += len(child.label)
+
+        node = path[-1]
+        if not node.ids or record_id not in node.ids:
+            return
+        node.ids.remove(record_id)
+        if not node.ids:
+            node.ids = None
+        depth = len(path) - 1
+        while depth > 0:
+            node, parent = path[depth], path[depth - 1]
+            if node.ids or (node.children and len(node.children) > 1):
+                break
+            if node.children:
+                # Un solo hijo y ningún ID: el hijo toma su lugar
+                (child,) = node.children.values()
+                child.label = node.label + child.label
+                parent.children[node.label[0]] = child
+                break
+            del parent.children[node.label[0]]
+            depth -= 1
+
+    def put(self, record: Dict[str, Any]):
+        """Registrar un registro o actualizar sus números"""
+        self._ensure_loaded()
+        record_id = record[self.key]
+        numbers = self._numbers(record.get(field) for field in self.fields)
+        if self._keys_of.get(record_id) == numbers:
+            return
+        self.remove(record_id)
+        self._keys_of[record_id] = numbers
+        for number in numbers:
+            self._insert(number, record_id)
+
+    def remove(self, record_id: int):
+        """Quitar un registro del índice"""
+        self._ensure_loaded()
+        for number in self._keys_of.pop(record_id, ()):
+            self._delete(number, record_id)
+
+    def contains(self, record_id: int, key: str) -> bool:
+        """¿Algún número del registro empieza con la clave?"""
+        self._ensure_loaded()
+        return any(number.startswith(key) for number in self._keys_of.get(record_id, ()))
+
+    def search(self, query: str) -> Optional[Set[int]]:
+        """IDs con algún número que empieza con la consulta (None si la consulta está vacía)"""
+        prefix = self.normalize(query)
+        if not prefix:
+            return None
+        self._ensure_loaded()
+        node, i = self._root, 0
+        while i < len(prefix):
+            child = node.children.get(prefix[i]) if node.children else None
+            if child is None:
+                return set()
+            if prefix.startswith(child.label, i):
+                node, i = child, i + len(child.label)
+            elif child.label.startswith(prefix[i:]):
+                node, i = child, len(prefix)
+            else:
+                return set()
+
+        result: Set[int] = set()
+        pending = [node]
+        while pending:
+            node = pending.pop()
+            if node.ids:
+                result.update(node.ids)
+            if node.children:
+                pending.extend(node.children.values())
+        return result
+
+
+def edit_distance(a: str, b: str, limit: int) -> int:
+    """
+    Distancia de edición (inserción, borrado, sustitución o transposición de
+    dos letras vecinas) entre dos textos; limit + 1 si supera el límite
+    """
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    previous2: List[int] = []
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        current = [i]
+        for j, char_b in enumerate(b, 1):
+            cost = previous[j - 1] + (char_a != char_b)
+            if previous[j] + 1 < cost:
+                cost = previous[j] + 1
+            if current[j - 1] + 1 < cost:
+                cost = current[j - 1] + 1
+            if i > 1 and j > 1 and char_a == b[j - 2] and a[i - 2] == char_b and previous2[j - 2] + 1 < cost:
+                cost = previous2[j - 2] + 1
+            current.append(cost)
+        if min(current) > limit:
+            return limit + 1
+        previous2, previous = previous, current
+    return min(previous[-1], limit + 1)
+
+
+class FuzzyIndex:
+    """
+    Índice de palabras para búsquedas que toleran errores de tipeo
+
+    Cada campo se separa en palabras normalizadas con search_key; cada
+    palabra distinta apunta a los registros que la tienen, y cada trigrama
+    de la palabra (con un espacio a cada lado) a las palabras que lo
+    contienen. Una edición cambia a lo sumo cuatro trigramas (una
+    transposición), así que solo se mide la distancia de las palabras que
+    comparten suficientes trigramas con la consulta, no la de todas.
+    """
+
+    GRAM = 3
+
+    def __init__(self, key: str, fields: Tuple[str, ...]):
+        self.key = key
+        self.fields = tuple(fields)
+        self.snapshot_columns = self.fields
+        self._words_of: Dict[int, Tuple[str, ...]] = {}
+        self._ids_by_word: Dict[str, List[int]] = {}
+        self._postings: Dict[str, List[str]] = {}
+        self._source: Optional[Callable[[], Iterable[Tuple[Any, ...]]]] = None
+
+    @staticmethod
+    def max_distance(word: str) -> int:
+        """Errores tolerados según el largo de la palabra"""
+        if len(word) <= 3:
+            return 0
+        return 1 if len(word) <= 7 else 2
+
+    def _grams(self, word: str) -> Set[str]:
+        """Trigramas de la palabra rodeada de espacios"""
+        padded = f" {word} "
+        return {padded[i:i + self.GRAM] for i in range(len(padded) - self.GRAM + 1)}
+
+    def _words(self, fields: Iterable[Any]) -> Tuple[str, ...]:
+        """Palabras distintas (normalizadas) de los campos de un registro"""
+        words: Dict[str, None] = {}
+        for field in fields:
+            if field is not None:
+                words.update(dict.fromkeys(search_key(str(field)).split()))
+        return tuple(words)
+
+    def load(self, records: Iterable[Dict[str, Any]]):
+        """Cargar el índice desde cero"""
+        self._source = None
+        self._build(
+            (record[self.key],) + tuple(record.get(field) for field in self.fields)
+            for record in records
+        )
+
+    def load_lazy(self, source: Callable[[], Iterable[Tuple[Any, ...]]]):
+        """Cargar el índice en su primer uso a partir de tuplas (id, *campos)"""
+        self._build(())
+        self._source = source
+
+    def _build(self, rows: Iterable[Tuple[Any, ...]]):
+        """Construir el índice (cada combinación de campos se separa una vez)"""
+        self._words_of = {}
+        self._ids_by_word = {}
+        self._postings = {}
+        split: Dict[Tuple[Any, ...], Tuple[str, ...]] = {}
+        for record_id, *fields in rows:
+            fields = tuple(fields)
+            words = split.get(fields)
+            if words is None:
+                words = split[fields] = self._words(fields)
+            self._add(record_id, words)
+
+    def _ensure_loaded(self):
+        """Construir el índice pendiente de carga"""
+        if self._source is None:
+            return
+        with _load_lock:
+            if self._source is None:
+                return
+            self._build(self._source())
+            self._source = None
+
+    def _add(self, record_id: int, words: Tuple[str, ...]):
+        """Registrar las palabras de un registro"""
+        self._words_of[record_id] = words
+        for word in words:
+            ids = self._ids_by_word.get(word)
+            if ids is None:
+                self._ids_by_word[word] = [record_id]
+                for gram in self._grams(word):
+                    self._postings.setdefault(gram, []).append(word)
+            else:
+                ids.append(record_id)
+
+    def put(self, record: Dict[str, Any]):
+        """Registrar un registro o actualizar sus palabras"""
+        self._ensure_loaded()
+        record_id = record[self.key]
+        words = self._words(record.get(field) for field in self.fields)
+        if self._words_of.get(record_id) == words:
+            return
+        self.remove(record_id)
+        self._add(record_id, words)
+
+    def remove(self, record_id: int):
+        """Quitar un registro del índice"""
+        self._ensure_loaded()
+        for word in self._words_of.pop(record_id, ()):
+            ids = self._ids_by_word[word]
+            ids.remove(record_id)
+            if ids:
+                continue
+            # Último registro con esa palabra: sale también de los trigramas
+            del self._ids_by_word[word]
+            for gram in self._grams(word):
+                words = self._postings[gram]
+                words.remove(word)
+                if not words:
+                    del self._postings[gram]
+
+    def similar_words(self, word: str) -> Dict[str, int]:
+        """Palabras indexadas a distancia tolerable de una palabra normalizada (palabra -> distancia)"""
+        self._ensure_loaded()
+        limit = self.max_distance(word)
+        grams = self._grams(word)
+        shared: Counter = Counter()
+        for gram in grams:
+            shared.update(self._postings.get(gram, ()))
+        needed = max(1, len(grams) - (self.GRAM + 1) * limit)
+
+        result: Dict[str, int] = {}
+        for candidate, count in shared.items():
+            if count < needed:
+                continue
+            distance = edit_distance(word, candidate, limit)
+            if distance <= limit:
+                result[candidate] = distance
+        return result
+
+    def search(self, query: str, limit: int = 50) -> List[Tuple[int, int]]:
+        """
+        Registros parecidos a la consulta, del más parecido al menos
+
+        Cada palabra de la consulta debe parecerse a alguna palabra del
+        registro; el puntaje es la suma de las distancias de edición.
+
+        Returns:
+            Lista de (ID, distancia) con a lo sumo limit elementos
+        """
+        scores: Optional[Dict[int, int]] = None
+        for word in dict.fromkeys(search_key(query).split()):
+            best: Dict[int, int] = {}
+            for similar, distance in self.similar_words(word).items():
+                for record_id in self._ids_by_word[similar]:
+                    if distance < best.get(record_id, distance + 1):
+                        best[record_id] = distance
+            if scores is None:
+                scores = best
+            else:
+                scores = {record_id: score + best[record_id] for record_id, score in scores.items()
+                          if record_id in best}
+            if not scores:
+                return []
+        if scores is None:
+            return []
+        return heapq.nsmallest(limit, scores.items(), key=lambda item: (item[1], item[0]))
+
+
+SecondaryIndex = Union[ForeignKeyIndex, CountIndex, AppointmentIndex, TextIndex, DigitTrie, FuzzyIndex]
+
+
+class PrimaryKeyIndex:
+    """Índice por clave primaria (id -> registro) con búsqueda O(1)"""
+
+    def __init__(self, key: str):
+        self.key = key
+        self._records: Dict[int, Dict[str, Any]] = {}
+        self._secondary: List[SecondaryIndex] = []
+        self._ordered: Optional[Tuple[Dict[str, Any], ...]] = None  # Caché de ordered()
+
+        # Respaldo en la instantánea (registros aún no materializados)
+        self._snapshot: Optional[SnapshotTable] = None
+        self._removed: Set[int] = set()
+
+    def add_secondary(self, index: SecondaryIndex) -> SecondaryIndex:
+        """Asociar un índice secundario que se actualiza junto con este"""
+        if self._snapshot is not None:
+            index.load_lazy(self._snapshot_rows(self._snapshot, index.snapshot_columns))
+        else:
+            index.load(self._records.values())
+        self._secondary.append(index)
+        return index
+
+    def load(self, records: Iterable[Dict[str, Any]]):
+        """Cargar el índice desde cero"""
+        self._snapshot = None
+        self._removed = set()
+        self._records = {record[self.key]: record for record in records}
+        self._ordered = None
+        for index in self._secondary:
+            index.load(self._records.values())
+
+    def attach_snapshot(self, table: SnapshotTable):
+        """Cargar el índice desde una tabla de la instantánea sin materializar registros"""
+        self._snapshot = table
+        self._removed = set()
+        self._records = {}
+        self._ordered = None
+        for index in self._secondary:
+            index.load_lazy(self._snapshot_rows(table, index.snapshot_columns))
+
+    @staticmethod
+    def _snapshot_rows(table: SnapshotTable, columns: Tuple[str, ...]):
+        """Fuente de tuplas (id, *columnas) leída de la instantánea"""
+        return lambda: zip(table.ids(), *(table.column(column) for column in columns))
+
+    def _materialize(self):
+        """Traer a memoria todos los registros que siguen en la instantánea"""
+        if self._snapshot is None:
+            return
+        with _load_lock:
+            table = self._snapshot
+            if table is None:
+                return
+            # Mientras tanto get() sigue leyendo de la instantánea
+            for row, record_id in enumerate(table.ids()):
+                if record_id not in self._records and record_id not in self._removed:
+                    self._records[record_id] = table.record(row)
+            self._snapshot = None
+            self._removed = set()
+
+    def get(self, record_id: int) -> Optional[Dict[str, Any]]:
+        """Obtener registro por ID"""
+        record = self._records.get(record_id)
+        if record is None and self._snapshot is not None and record_id not in self._removed:
+            record = self._snapshot.get(record_id)
+            if record is not None:
+                self._records[record_id] = record
+        return record
+
+    def put(self, record: Dict[str, Any]) -> Dict[str, Any]:
+        """Insertar un registro o mezclar sus campos con el existente"""
+        record_id = record[self.key]
+        current = self.get(record_id)
+        if current is None or current is record:
+            if current is None:
+                self._ordered = None
+            self._records[record_id] = current = record
+        else:
+            current.update(record)
+        self._removed.discard(record_id)
+
+        for index in self._secondary:
+            index.put(current)
+        return current
+
+    def remove(self, record_id: int) -> Optional[Dict[str, Any]]:
+        """Quitar un registro del índice"""
+        for index in self._secondary:
+            index.remove(record_id)
+        record = self.get(record_id)
+        if record is not None:
+            self._ordered = None
+        if self._snapshot is not None:
+            with _load_lock:
+                self._removed.add(record_id)
+                self._records.pop(record_id, None)
+        else:
+            self._records.pop(record_id, None)
+        return record
+
+    def get_many(self, record_ids: Iterable[int]) -> List[Dict[str, Any]]:
+        """Obtener varios registros por ID (en orden de ID)"""
+        records = (self.get(record_id) for record_id in sorted(record_ids))
+        return [record for record in records if record is not None]
+
+    def ordered(self) -> Tuple[Dict[str, Any], ...]:
+        """Todos los registros en orden de ID (la tupla se rehace solo tras un alta o una baja)"""
+        ordered = self._ordered
+        if ordered is None:
+            self._materialize()
+            key = self.key
+            ordered = self._ordered = tuple(sorted(self._records.values(), key=lambda record: record[key]))
+        return ordered
+
+    def values(self) -> Iterator[Dict[str, Any]]:
+        """Iterar los registros indexados"""
+        self._materialize()
+        return iter(self._records.values())
+
+    def __contains__(self, record_id: int) -> bool:
+        return self.get(record_id) is not None
+
+    def __len__(self) -> int:
+        self._materialize()
+        return len(self._records)
+
+
+class DataIndexes:
+    """Índices de todas las entidades, actualizados con los eventos CLIENTE/MASCOTA/CITA"""
+
+    def __init__(self, database: Database, event_manager: EventManager,
+                 snapshot: Optional[Snapshot] = None):
+        self.database = database
+        self.event_manager = event_manager
+
+        self.clientes = PrimaryKeyIndex(database.clientes.key)
+        self.mascotas = PrimaryKeyIndex(database.mascotas.key)
+        self.veterinarios = PrimaryKeyIndex(database.veterinarios.key)
+        self.citas = PrimaryKeyIndex(database.citas.key)
+        if snapshot is not None:
+            self.attach_snapshot(snapshot)
+        else:
+            self.reload()
+
+        # Índices secundarios por clave foránea
+        self.mascotas_by_cliente = self.mascotas.add_secondary(
+            ForeignKeyIndex(database.mascotas.key, 'id_cliente'))
+        self.citas_by_mascota = self.citas.add_secondary(
+            ForeignKeyIndex(database.citas.key, 'id_mascota'))
+        self.citas_by_veterinario = self.citas.add_secondary(
+            ForeignKeyIndex(database.citas.key, 'id_veterinario'))
+        # Citas ordenadas por fecha y hora (agenda por día, semana o veterinario)
+        self.citas_by_fecha = self.citas.add_secondary(AppointmentIndex(database.citas.key))
+
+        # Búsqueda de texto por entidad (campos que se buscan en cada vista)
+        self.text = {
+            'clientes': self.clientes.add_secondary(
+                TextIndex(database.clientes.key, ('dni', 'nombres', 'apellidos'))),
+            'mascotas': self.mascotas.add_secondary(
+                TextIndex(database.mascotas.key, ('nombre_mascota', 'raza'))),
+            'veterinarios': self.veterinarios.add_secondary(
+                TextIndex(database.veterinarios.key, ('nombres', 'apellidos', 'especialidad'))),
+            'citas': self.citas.add_secondary(
+                TextIndex(database.citas.key, ('motivo',))),
+        }
+
+        # Búsqueda por prefijo de DNI o teléfono
+        self.digits = {
+            'clientes': self.clientes.add_secondary(
+                DigitTrie(database.clientes.key, ('dni', 'telefono'))),
+        }
+
+        # Búsqueda tolerante a errores de tipeo (nombres de clientes y mascotas)
+        self.fuzzy = {
+            'clientes': self.clientes.add_secondary(
+                FuzzyIndex(database.clientes.key, ('nombres', 'apellidos'))),
+            'mascotas': self.mascotas.add_secondary(
+                FuzzyIndex(database.mascotas.key, ('nombre_mascota',))),
+        }
+
+        # Cantidad de registros por estado (estadísticas del dashboard)
+        self.counts = {
+            'clientes': self.clientes.add_secondary(CountIndex(database.clientes.key, 'estado')),
+            'mascotas': self.mascotas.add_secondary(CountIndex(database.mascotas.key, 'estado')),
+            'veterinarios': self.veterinarios.add_secondary(CountIndex(database.veterinarios.key, 'estado')),
+            'citas': self.citas.add_secondary(CountIndex(database.citas.key, 'estado')),
+        }
+
+        # (evento, índice, clave del registro en event.data)
+        self._saved_events = [
+            (AppEvents.CLIENTE_ADDED, self.clientes, 'cliente'),
+            (AppEvents.CLIENTE_UPDATED, self.clientes, 'cliente'),
+            (AppEvents.MASCOTA_ADDED, self.mascotas, 'mascota'),
+            (AppEvents.MASCOTA_UPDATED, self.mascotas, 'mascota'),
+            (AppEvents.CITA_ADDED, self.citas, 'cita'),
+            (AppEvents.CITA_UPDATED, self.citas, 'cita'),
+        ]
+        # (evento, índice, clave del ID en event.data)
+        self._deleted_events = [
+            (AppEvents.CLIENTE_DELETED, self.clientes, 'cliente_id'),
+            (AppEvents.MASCOTA_DELETED, self.mascotas, 'mascota_id'),
+            (AppEvents.CITA_DELETED, self.citas, 'cita_id'),
+        ]
+
+        for event_name, index, data_key in self._saved_events:
+            event_manager.subscribe(event_name, self._make_saved_handler(index, data_key))
+        for event_name, index, data_key in self._deleted_events:
+            event_manager.subscribe(event_name, self._make_deleted_handler(index, data_key))
+
+    def reload(self):
+        """Recargar todos los índices desde la base de datos"""
+        with index_lock.write():
+            self.clientes.load(self.database.clientes.get_all())
+            self.mascotas.load(self.database.mascotas.get_all())
+            self.veterinarios.load(self.database.veterinarios.get_all())
+            self.citas.load(self.database.citas.get_all())
+
+    def attach_snapshot(self, snapshot: Snapshot):
+        """Apoyar los índices en la instantánea (sin leer los registros)"""
+        self.clientes.attach_snapshot(snapshot.tables[self.database.clientes.table])
+        self.mascotas.attach_snapshot(snapshot.tables[self.database.mascotas.table])
+        self.veterinarios.attach_snapshot(snapshot.tables[self.database.veterinarios.table])
+        self.citas.attach_snapshot(snapshot.tables[self.database.citas.table])
+
+    def _make_saved_handler(self, index: PrimaryKeyIndex, data_key: str):
+        """Crear callback para eventos de alta/modificación"""
+        def handler(event: Event):
+            record = event.data.get(data_key)
+            if record and index.key in record:
+                with index_lock.write():
+                    index.put(record)
+        return handler
+
+    def _make_deleted_handler(self, index: PrimaryKeyIndex, data_key: str):
+        """Crear callback para eventos de eliminación"""
+        def handler(event: Event):
+            record_id = event.data.get(data_key)
+            if record_id is not None:
+                with index_lock.write():
+                    index.remove(record_id)
+        return handler
+
+
+_indexes: Optional[DataIndexes] = None
+
+
+def get_indexes() -> DataIndexes:
+    """Obtener los índices de la aplicación (se construyen la primera vez)"""
+    global _indexes
+    if _indexes is None:
+        database = get_database()
+        _indexes = DataIndexes(database, AppContext().event_manager, database.open_snapshot())
+    return _indexes
@@ -0,0 +1,221 @@
+"""
+Diario de eventos (append-only) para persistencia a prueba de caídas
+
+Cada alta, modificación o baja que pasa por EventManager.emit se agrega
+al diario como una línea JSON numerada. Cada línea pasa al sistema
+operativo al agregarla; el fsync y la confirmación de SQLite se hacen en
+lote, a lo sumo fsync_interval después del evento (con un after() de Tk
+aunque no lleguen más eventos). En cada checkpoint se vacía el diario: la
+base de datos es la instantánea compactada y el diario solo guarda la cola
+de eventos posteriores. Al iniciar se reaplica esa cola, de modo que el
+arranque depende del tamaño del último tramo y no de la antigüedad de la
+clínica.
+"""
+
+import json
+import os
+import time
+from typing import Any, Dict
+
+from .event_manager import AppEvents, Event, EventManager
+from .records import Record
+
+# evento: (repositorio, operación, clave en event.data)
+JOURNALED_EVENTS = {
+    AppEvents.CLIENTE_ADDED: ("clientes", "upsert", "cliente"),
+    AppEvents.CLIENTE_UPDATED: ("clientes", "update", "cliente"),
+    AppEvents.CLIENTE_DELETED: ("clientes", "delete", "cliente_id"),
+    AppEvents.MASCOTA_ADDED: ("mascotas", "upsert", "mascota"),
+    AppEvents.MASCOTA_UPDATED: ("mascotas", "update", "mascota"),
+    AppEvents.MASCOTA_DELETED: ("mascotas", "delete", "mascota_id"),
+    AppEvents.CITA_ADDED: ("citas", "upsert", "cita"),
+    AppEvents.CITA_UPDATED: ("citas", "update", "cita"),
+    AppEvents.CITA_DELETED: ("citas", "delete", "cita_id"),
+}
+
+
+def journal_path_for(db_path: str) -> str:
+    """Ruta del diario asociado a un archivo de base de datos"""
+    return os.path.splitext(db_path)[0] + ".journal"
+
+
+def _to_json(value: Any) -> Any:
+    """Serializar registros dentro de los datos del evento"""
+    if isinstance(value, Record):
+        return value.to_dict()
+    raise TypeError(f"No serializable: {type(value).__name__}")
+
+
+class EventJournal:
+    """Diario JSONL con fsync por lotes y checkpoints sobre SQLite"""
+
+    SCHEMA = """
+    CREATE TABLE IF NOT EXISTS meta (
+        clave TEXT PRIMARY KEY,
+        valor TEXT NOT NULL
+    );
+    """
+
+    def __init__(self, path: str, database, fsync_batch: int = 32,
+                 fsync_interval: float = 1.0, checkpoint_every: int = 500):
+        self.path = path
+        self.db = database
+        self.fsync_batch = fsync_batch
+        self.fsync_interval = fsync_interval
+        self.checkpoint_every = checkpoint_every
+
+        self._file = None
+        self._seq = 0
+        self._pending_sync = 0
+        self._since_checkpoint = 0
+        self._last_sync = time.monotonic()
+        self._widget = None  # Widget de Tk cuyo after() programa el fsync diferido
+        self._timer = None
+        self.db.connection.executescript(self.SCHEMA)
+
+    def open(self, event_manager: EventManager, fresh: bool = False) -> int:
+        """
+        Recuperar la cola pendiente y empezar a registrar eventos
+
+        Args:
+            event_manager: Gestor cuyos eventos se registran
+            fresh: La base de datos es nueva; se descarta un diario anterior
+
+        Returns:
+            Cantidad de eventos reaplicados
+        """
+        self._seq = self.db.journal_seq()
+        replayed = 0
+        if fresh and os.path.exists(self.path):
+            os.remove(self.path)
+        elif os.path.exists(self.path):
+            replayed = self._replay()
+
+        self._file = open(self.path, "ab")
+        if replayed:
+            self.checkpoint()
+
+        # A partir de aquí las confirmaciones en SQLite las hace el checkpoint
+        self.db.deferred_commit = True
+        for event_name in JOURNALED_EVENTS:
+            event_manager.subscribe(event_name, self.append)
+        return replayed
+
+    def set_timer(self, widget):
+        """Programar el fsync diferido con after() del widget (hilo de Tk)"""
+        self._widget = widget
+        if self._pending_sync:
+            self._arm_timer()
+
+    def schedule_commit(self):
+        """Hay escrituras sin confirmar en SQLite: programar el flush que las confirma"""
+        self._arm_timer()
+
+    def _arm_timer(self):
+        """Programar un flush() a fsync_interval si no hay uno pendiente"""
+        if self._widget is not None and self._timer is None:
+            self._timer = self._widget.after(int(self.fsync_interval * 1000), self._on_timer)
+
+    def _on_timer(self):
+        """Escribir a disco lo que quedó pendiente desde el último fsync"""
+        self._timer = None
+        self.flush()
+
+    def append(self, event: Event):
+        """Agregar un evento al diario"""
+        if self._file is None or event.name not in JOURNALED_EVENTS:
+            return
+
+        self._seq += 1
+        entry = {"seq": self._seq, "event": event.name, "data": event.data}
+        line = json.dumps(entry, default=_to_json, ensure_ascii=False) + "\n"
+        self._file.write(line.encode("utf-8"))
+        # Sin buffer propio: si el proceso muere, la línea ya es del sistema operativo
+        self._file.flush()
+        self._pending_sync += 1
+        self._since_checkpoint += 1
+
+        if self._since_checkpoint >= self.checkpoint_every:
+            self.checkpoint()
+        elif (self._pending_sync >= self.fsync_batch or
+              time.monotonic() - self._last_sync >= self.fsync_interval):
+            self.flush()
+        else:
+            self._arm_timer()
+
+    def flush(self):
+        """Escribir a disco los eventos pendientes (fsync) y confirmar SQLite hasta el último"""
+        if self._file is None:
+            return
+        if self._pending_sync:
+            self._file.flush()
+            os.fsync(self._file.fileno())
+        elif not self.db.connection.in_transaction:
+            return
+        # Después del fsync se confirma SQLite: el lock de escritura no queda tomado
+        # hasta el checkpoint y ninguna fila confirmada precede a su evento en disco
+        self._commit_seq()
+        self._pending_sync = 0
+        self._last_sync = time.monotonic()
+
+    def _commit_seq(self):
+        """Confirmar SQLite junto con el número del último evento que incluye"""
+        self.db.execute(
+            "INSERT INTO meta (clave, valor) VALUES ('journal_seq', ?) "
+            "ON CONFLICT(clave) DO UPDATE SET valor = excluded.valor",
+            (str(self._seq),)
+        )
+        self.db.commit(force=True)
+
+    def checkpoint(self):
+        """Confirmar SQLite junto con el número del último evento y vaciar el diario"""
+        self._commit_seq()
+
+        # Si se cae entre el commit y el truncado, la cola se ignora por su número
+        if self._file is not None:
+            self._file.flush()
+            self._file.seek(0)
+            self._file.truncate()
+            os.fsync(self._file.fileno())
+        self._pending_sync = 0
+        self._since_checkpoint = 0
+        self._last_sync = time.monotonic()
+
+    def close(self):
+        """Checkpoint final y cierre del archivo"""
+        if self._file is None:
+            return
+        self.checkpoint()
+        self._file.close()
+        self._file = None
+        # La ventana ya no existe: el after() pendiente no llega a correr
+        self._widget = None
+        self._timer = None
+        self.db.deferred_commit = False
+
+    def _replay(self) -> int:
+        """Reaplicar en SQLite los eventos posteriores al último checkpoint"""
+        replayed = 0
+        with open(self.path, "rb") as journal:
+            for raw in journal:
+                try:
+                    entry = json.loads(raw)
+                except ValueError:
+                    # Última línea incompleta (caída a mitad de escritura)
+                    break
+                if entry["seq"] <= self._seq:
+                    continue
+                self._apply(entry["event"], entry["data"])
+                self._seq = entry["seq"]
+                replayed += 1
+        return replayed
+
+    def _apply(self, event_name: str, data: Dict[str, Any]):
+        """Aplicar un evento del diario en el repositorio correspondiente"""
+        repo_name, operation, data_key = JOURNALED_EVENTS[event_name]
+        repo = getattr(self.db, repo_name)
+        value = data.get(data_key)
+        if value is None:
+            return
+        getattr(repo, operation)(value)
+
@@ -1,7 +1,14 @@
 """
 Datos de prueba para la aplicación
+
+Las listas se usan para poblar la base de datos la primera vez;
+las funciones auxiliares consultan los índices en memoria (utils.indexes).
 """
 
+from datetime import date
+
+from .indexes import get_indexes, minute_of_day
+
 # Clientes
 CLIENTES = [
     {
@@ -191,6 +198,7 @@ CITAS = [
         "id_cita": 1,
         "fecha": "2024-12-06",
         "hora": "09:00",
+        "duracion": 30,
         "id_mascota": 1,
         "id_veterinario": 1,
         "motivo": "Consulta general y vacunación",
@@ -201,6 +209,7 @@ CITAS = [
         "id_cita": 2,
         "fecha": "2024-12-06",
         "hora": "10:30",
+        "duracion": 30,
         "id_mascota": 2,
         "id_veterinario": 2,
         "motivo": "Control post-operatorio",
@@ -211,6 +220,7 @@ CITAS = [
         "id_cita": 3,
         "fecha": "2024-12-06",
         "hora": "11:00",
+        "duracion": 30,
         "id_mascota": 3,
         "id_veterinario": 1,
         "motivo": "Consulta por cojera",
@@ -221,6 +231,7 @@ CITAS = [
         "id_cita": 4,
         "fecha": "2024-12-05",
         "hora": "14:00",
+        "duracion": 30,
         "id_mascota": 4,
         "id_veterinario": 3,
         "motivo": "Dermatología - Revisión de piel",
@@ -231,6 +242,7 @@ CITAS = [
         "id_cita": 5,
         "fecha": "2024-12-04",
         "hora": "09:30",
+        "duracion": 30,
         "id_mascota": 5,
         "id_veterinario": 1,
         "motivo": "Vacunación múltiple",
@@ -241,6 +253,7 @@ CITAS = [
         "id_cita": 6,
         "fecha": "2024-12-03",
         "hora": "16:00",
+        "duracion": 30,
         "id_mascota": 6,
         "id_veterinario": 2,
         "motivo": "Esterilización",
@@ -252,32 +265,24 @@ CITAS = [
 
 # Funciones auxiliares
 def get_cliente_by_id(cliente_id):
-    """Obtener cliente por ID"""
-    for cliente in CLIENTES:
-        if cliente['id'] == cliente_id:
-            return cliente
-    return None
+    """Obtener cliente por ID (O(1))"""
+    return get_indexes().clientes.get(cliente_id)
 
 
 def get_mascota_by_id(mascota_id):
-    """Obtener mascota por ID"""
-    for mascota in MASCOTAS:
-        if mascota['id_mascota'] == mascota_id:
-            return mascota
-    return None
+    """Obtener mascota por ID (O(1))"""
+    return get_indexes().mascotas.get(mascota_id)
 
 
 def get_veterinario_by_id(vet_id):
-    """Obtener veterinario por ID"""
-    for vet in VETERINARIOS:
-        if vet['id'] == vet_id:
-            return vet
-    return None
+    """Obtener veterinario por ID (O(1))"""
+    return get_indexes().veterinarios.get(vet_id)
 
 
 def get_mascotas_by_cliente(cliente_id):
-    """Obtener mascotas de un cliente"""
-    return [m for m in MASCOTAS if m['id_cliente'] == cliente_id]
+    """Obtener mascotas de un cliente (proporcional al número de mascotas)"""
+    indexes = get_indexes()
+    return indexes.mascotas.get_many(indexes.mascotas_by_cliente.get(cliente_id))
 
 
 def get_nombre_completo_cliente(cliente_id):
@@ -290,9 +295,31 @@ def get_nombre_completo_cliente(cliente_id):
 
 def get_citas_by_mascota(mascota_id):
     """Obtener citas de una mascota"""
-    return [c for c in CITAS if c['id_mascota'] == mascota_id]
+    indexes = get_indexes()
+    return indexes.citas.get_many(indexes.citas_by_mascota.get(mascota_id))
 
 
 def get_citas_by_veterinario(vet_id):
-    """Obtener citas de un veterinario"""
-    return [c for c in CITAS if c['id_veterinario'] == vet_id]
+    """Obtener citas de un veterinario ordenadas por fecha y hora"""
+    return get_citas_by_fecha(date.min, date.max, vet_id)
+
+
+def get_citas_by_fecha(inicio, fin=None, vet_id=None):
+    """Obtener citas entre dos fechas (inclusive), opcionalmente de un veterinario, en orden de fecha y hora"""
+    indexes = get_indexes()
+    ids = indexes.citas_by_fecha.between(inicio, fin or inicio, vet_id)
+    return [indexes.citas.get(cita_id) for cita_id in ids]
+
+
+def get_citas_en_conflicto(fecha, hora, vet_id, excluir_id=None, duracion=None):
+    """Citas no canceladas del veterinario que se cruzan con el horario dado (duración en minutos)"""
+    try:
+        dia = date.fromisoformat(fecha)
+    except (TypeError, ValueError):
+        # Fecha incompleta o inexistente (p. ej. mientras se escribe): no se cruza con nada
+        return []
+    indexes = get_indexes()
+    ids = indexes.citas_by_fecha.overlapping(vet_id, dia, minute_of_day(hora),
+                                              duration=duracion, exclude=excluir_id)
+    citas = (indexes.citas.get(cita_id) for cita_id in ids)
+    return [cita for cita in citas if cita and cita.get('estado') != 'Cancelada']
@@ -0,0 +1,160 @@
+"""
+Registros compactos (__slots__) para las entidades de la clínica
+
+Se comportan como diccionarios (registro['campo'], .get, .update, ...)
+para que las vistas existentes sigan funcionando, pero no admiten campos
+desconocidos: un error como 'edad_anios' lanza KeyError en lugar de
+crear un campo nuevo en silencio.
+"""
+
+from dataclasses import dataclass
+from typing import Any, Dict, FrozenSet, Iterator, Mapping, Optional, Tuple
+
+
+class Record:
+    """Base de los registros con acceso tipo diccionario"""
+
+    __slots__ = ()
+    _fields: Tuple[str, ...] = ()
+    _field_set: FrozenSet[str] = frozenset()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._fields = tuple(cls.__slots__)
+        cls._field_set = frozenset(cls._fields)
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> "Record":
+        """Crear un registro a partir de un diccionario (los campos faltantes quedan en None)"""
+        unknown = set(data) - cls._field_set
+        if unknown:
+            raise KeyError(f"Campos desconocidos para {cls.__name__}: {', '.join(sorted(unknown))}")
+        return cls(*(data.get(name) for name in cls._fields))
+
+    def _check(self, key: str):
+        """Verificar que el campo exista"""
+        if key not in self._field_set:
+            raise KeyError(f"{type(self).__name__} no tiene el campo '{key}'")
+
+    def __getitem__(self, key: str) -> Any:
+        self._check(key)
+        return getattr(self, key)
+
+    def __setitem__(self, key: str, value: Any):
+        self._check(key)
+        setattr(self, key, value)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._field_set
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._fields)
+
+    def __len__(self) -> int:
+        return len(self._fields)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Obtener un campo (default si el campo no existe)"""
+        if key not in self._field_set:
+            return default
+        return getattr(self, key)
+
+    def keys(self) -> Tuple[str, ...]:
+        """Nombres de los campos"""
+        return self._fields
+
+    def values(self) -> Tuple[Any, ...]:
+        """Valores de los campos"""
+        return tuple(getattr(self, name) for name in self._fields)
+
+    def items(self) -> Tuple[Tuple[str, Any], ...]:
+        """Pares (campo, valor)"""
+        return tuple((name, getattr(self, name)) for name in self._fields)
+
+    def update(self, other: Optional[Mapping[str, Any]] = None, **kwargs: Any):
+        """Actualizar campos como dict.update"""
+        for source in (other or {}, kwargs):
+            for key in source.keys():
+                self[key] = source[key]
+
+    def copy(self) -> "Record":
+        """Copia superficial del registro"""
+        return type(self)(*self.values())
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convertir a diccionario"""
+        return dict(self.items())
+
+
+@dataclass
+class Cliente(Record):
+    """Cliente de la clínica"""
+
+    __slots__ = ("id", "dni", "nombres", "apellidos", "telefono", "email", "direccion", "estado")
+    id: Optional[int]
+    dni: str
+    nombres: str
+    apellidos: str
+    telefono: str
+    email: str
+    direccion: str
+    estado: str
+
+
+@dataclass
+class Mascota(Record):
+    """Mascota registrada"""
+
+    __slots__ = (
+        "id_mascota", "id_cliente", "nombre_mascota", "especie", "raza", "sexo",
+        "edad_años", "edad_meses", "peso_kg", "color_pelaje", "estado"
+    )
+    id_mascota: Optional[int]
+    id_cliente: int
+    nombre_mascota: str
+    especie: str
+    raza: str
+    sexo: str
+    edad_años: int
+    edad_meses: int
+    peso_kg: float
+    color_pelaje: str
+    estado: str
+
+
+@dataclass
+class Veterinario(Record):
+    """Veterinario de la clínica"""
+
+    __slots__ = (
+        "id", "nombres", "apellidos", "dni", "telefono", "email",
+        "especialidad", "num_colegiatura", "estado"
+    )
+    id: Optional[int]
+    nombres: str
+    apellidos: str
+    dni: str
+    telefono: str
+    email: str
+    especialidad: str
+    num_colegiatura: str
+    estado: str
+
+
+@dataclass
+class Cita(Record):
+    """Cita programada"""
+
+    __slots__ = (
+        "id_cita", "fecha", "hora", "duracion", "id_mascota", "id_veterinario",
+        "motivo", "observaciones", "estado"
+    )
+    id_cita: Optional[int]
+    fecha: str
+    hora: str
+    duracion: Optional[int]  # minutos (None: duración estándar)
+    id_mascota: int
+    id_veterinario: int
+    motivo: str
+    observaciones: str
+    estado: str
@@ -0,0 +1,222 @@
+"""
+Búsqueda en las vistas: resultados cacheados por prefijo y ejecución diferida
+
+Mientras se escribe, cada consulta nueva extiende a la anterior y su
+resultado es un subconjunto del anterior: basta con filtrar esa lista (ya
+reducida) en lugar de la tabla completa. Al borrar caracteres se vuelve al
+resultado guardado del prefijo, sin recalcular nada. Si no hay
+coincidencias, similar() ofrece los nombres parecidos (errores de tipeo).
+
+DebouncedSearch espera a que el usuario deje de escribir antes de buscar y
+redibujar la tabla, puede calcular en el ejecutor de consultas
+(utils.executor) y descarta las consultas que quedaron viejas.
+"""
+
+import threading
+from typing import Any, Callable, Dict, Hashable, List, Optional, Set, Tuple, Union
+
+from .executor import CancelToken, get_query_executor
+from .indexes import DigitTrie, TextIndex, get_indexes, index_lock
+
+
+class SearchSession:
+    """
+    Pila de (clave de consulta, índice, resultado) para los filtros actuales de una vista
+
+    Las consultas numéricas se buscan por prefijo en el trie de DNI y
+    teléfono (si la entidad lo tiene); si ninguno empieza con esos dígitos,
+    se buscan en cualquier parte de los campos del índice de texto ("5678"
+    encuentra el DNI 12345678). Las demás consultas van al índice de texto.
+
+    Puede consultarse desde un hilo del ejecutor mientras el hilo de Tk la
+    invalida: la pila se toca con un lock y un resultado solo se guarda si
+    nada la invalidó mientras se calculaba. Los índices (y compute) se leen
+    con index_lock.read(), así los eventos no los modifican a mitad de la
+    búsqueda.
+    """
+
+    # Hasta este tamaño se refina revisando cada registro; más allá conviene
+    # pedir los IDs al índice y filtrar por pertenencia
+    REFINE_LIMIT = 5000
+    # Máximo de resultados de la búsqueda aproximada
+    FUZZY_LIMIT = 50
+
+    def __init__(self, entity: str, index: Optional[TextIndex] = None, digits: Optional[DigitTrie] = None):
+        self.entity = entity
+        self.index = index or get_indexes().text[entity]
+        self.digits = digits or get_indexes().digits.get(entity)
+        self._filters: Optional[Hashable] = None
+        self._stack: List[Tuple[str, Union[TextIndex, DigitTrie], List[Dict[str, Any]]]] = []
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    def invalidate(self):
+        """Olvidar los resultados (los datos de la vista cambiaron)"""
+        with self._lock:
+            self._generation += 1
+            self._stack = []
+
+    def _index_for(self, query: str) -> Union[TextIndex, DigitTrie]:
+        """Índice que responde la consulta (llamar con el lock)"""
+        if self.digits is None or not self.digits.accepts(query):
+            return self.index
+        # Si un prefijo numérico ya no tuvo resultados en el trie, esta consulta
+        # tampoco los tendrá: sigue en el índice de texto
+        key = self.index.normalize(query)
+        if any(index is self.index and self.digits.accepts(prefix) and key.startswith(prefix)
+               for prefix, index, _ in self._stack):
+            return self.index
+        return self.digits
+
+    def _pop_to_prefix(self, key: str, index: Union[TextIndex, DigitTrie]):
+        """Dejar en la pila solo los prefijos de la clave en el mismo índice (llamar con el lock)"""
+        while self._stack and (self._stack[-1][1] is not index or not key.startswith(self._stack[-1][0])):
+            self._stack.pop()
+
+    def results(self, query: str, filters: Hashable,
+                compute: Callable[[Optional[Set[int]]], List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+        """
+        Resultado de una consulta con los filtros dados
+
+        Args:
+            query: Texto de búsqueda
+            filters: Estado de los demás filtros (si cambia, se descarta la caché)
+            compute: Filtra la lista completa de la vista dado el conjunto de IDs
+                     que coinciden con el texto (None = sin texto)
+
+        Returns:
+            Copia de la lista filtrada (la vista puede reordenarla)
+        """
+        with self._lock:
+            if filters != self._filters:
+                self._generation += 1
+                self._stack = []
+                self._filters = filters
+            generation = self._generation
+            index = self._index_for(query)
+            key = index.normalize(query)
+            self._pop_to_prefix(key, index)
+            parent_key, _, parent = self._stack[-1] if self._stack else (None, None, None)
+
+        if parent_key == key:
+            return list(parent)
+        with index_lock.read():
+            if parent_key:
+                # Refinar el resultado del prefijo más largo ya calculado
+                id_key = index.key
+                if len(parent) <= self.REFINE_LIMIT:
+                    result = [record for record in parent if index.contains(record[id_key], key)]
+                else:
+                    matches = index.search(query)
+                    result = [record for record in parent if record[id_key] in matches]
+            else:
+                # Sin prefijo útil: se filtra la lista completa con el índice
+                result = compute(index.search(query))
+            if not result and index is self.digits:
+                # Ningún DNI ni teléfono empieza así: buscar los dígitos en cualquier parte
+                index = self.index
+                key = index.normalize(query)
+                result = compute(index.search(query))
+
+        with self._lock:
+            if generation == self._generation:
+                self._pop_to_prefix(key, index)
+                if not self._stack or self._stack[-1][0] != key:
+                    self._stack.append((key, index, result))
+        return list(result)
+
+    def similar(self, query: str,
+                compute: Callable[[Optional[Set[int]]], List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+        """
+        Registros con nombres parecidos a la consulta (tolera errores de tipeo)
+
+        Pensado para cuando results() no encuentra nada: "Mendosa" encuentra
+        a "Mendoza" y "Rocki" a "Rocky".
+
+        Args:
+            query: Texto de búsqueda
+            compute: El mismo filtro que recibe results()
+
+        Returns:
+            Los registros parecidos, del más parecido al menos
+        """
+        fuzzy = get_indexes().fuzzy.get(self.entity)
+        if fuzzy is None or not query.strip():
+            return []
+        with index_lock.read():
+            rank = {record_id: position for position, (record_id, _) in enumerate(fuzzy.search(query, self.FUZZY_LIMIT))}
+            if not rank:
+                return []
+            records = compute(set(rank))
+        id_key = self.index.key
+        return sorted(records, key=lambda record: rank[record[id_key]])
+
+
+class DebouncedSearch:
+    """
+    Búsqueda que se ejecuta tras un período sin teclear
+
+    Cada tecla reprograma el after() pendiente, así que una ráfaga de teclas
+    produce una sola búsqueda. prepare() corre en el hilo de Tk y lee los
+    widgets; search(estado, token) calcula el resultado y render() lo dibuja.
+    Si llega otra consulta antes de terminar, el token queda cancelado y su
+    resultado no se dibuja. Con background=True search() corre en el
+    ejecutor de consultas (no debe tocar widgets ni la base de datos).
+    """
+
+    DEFAULT_DELAY = 250  # ms sin teclear antes de buscar
+
+    def __init__(self, widget, search: Callable[[Any, CancelToken], Any],
+                 render: Callable[[Any], None], prepare: Optional[Callable[[], Any]] = None,
+                 delay: int = DEFAULT_DELAY, background: bool = False):
+        self.widget = widget
+        self.search = search
+        self.render = render
+        self.prepare = prepare
+        self.delay = delay
+        self.background = background
+        self._job = None
+        self._token: Optional[CancelToken] = None
+
+    def schedule(self, event=None):
+        """Reprogramar la búsqueda (para <KeyRelease> o trace de variables)"""
+        self.cancel()
+        self._job = self.widget.after(self.delay, self._start)
+
+    def run_now(self):
+        """Buscar ya, descartando lo pendiente (p. ej. al cambiar un combo)"""
+        self.cancel()
+        self._start()
+
+    def cancel(self):
+        """Cancelar la búsqueda programada y la que esté en curso"""
+        if self._job is not None:
+            self.widget.after_cancel(self._job)
+            self._job = None
+        if self._token is not None:
+            self._token.cancel()
+            self._token = None
+
+    def _start(self):
+        """Lanzar la búsqueda con un token nuevo"""
+        self._job = None
+        if not self.widget.winfo_exists():
+            return
+        token = self._token = CancelToken()
+        state = self.prepare() if self.prepare else None
+        if self.background:
+            get_query_executor().submit(
+                self.widget,
+                lambda token: self.search(state, token),
+                lambda result: self._finish(token, result),
+                token=token
+            )
+        else:
+            self._finish(token, self.search(state, token))
+
+    def _finish(self, token: CancelToken, result: Any):
+        """Dibujar el resultado si sigue siendo el de la última consulta"""
+        if token.cancelled:
+            return
+        self._token = None
+        self.render(result)
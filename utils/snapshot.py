@@ -0,0 +1,331 @@
+"""
+Instantánea binaria de los datos, abierta con mmap para un arranque rápido
+
+Formato (versión 1, orden de bytes nativo):
+
+    cabecera   magic 'VETSNAP' + versión (u8), orden de bytes (u8 'l'/'b'),
+               secuencia del diario (u64), número de tablas (u32)
+    por tabla  nombre, número de filas (u64), número de columnas (u16),
+               y por columna: nombre + tipo ('q' entero, 'd' real, 's' texto)
+               luego una región de ancho fijo por columna (8 bytes por fila;
+               los textos guardan desplazamiento u32 + largo u32 en el heap)
+               y al final el heap de textos UTF-8 (sin repetidos)
+
+Las filas se guardan ordenadas por clave primaria: buscar un ID es una
+búsqueda binaria sobre la columna de claves, y cada registro se construye
+recién cuando se pide. Abrir la instantánea no recorre los datos.
+"""
+
+import bisect
+import math
+import mmap
+import os
+import struct
+import sys
+import typing
+from array import array
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple, Type
+
+from .records import Record
+
+MAGIC = b"VETSNAP"
+VERSION = 1
+_BYTEORDER = b"l" if sys.byteorder == "little" else b"b"
+
+_HEADER = struct.Struct("=7sBcQI")
+_U16 = struct.Struct("=H")
+_U64 = struct.Struct("=Q")
+_INT = struct.Struct("=q")
+_FLOAT = struct.Struct("=d")
+_STR_REF = struct.Struct("=II")
+
+# Valores que representan NULL en columnas de ancho fijo
+_NULL_INT = -2 ** 63
+_NULL_STR = 0xFFFFFFFF
+
+
+def snapshot_path_for(db_path: str) -> str:
+    """Ruta de la instantánea asociada a un archivo de base de datos"""
+    return os.path.splitext(db_path)[0] + ".snapshot"
+
+
+def column_kinds(record_type: Type[Record]) -> List[Tuple[str, str]]:
+    """Tipo de almacenamiento de cada campo según las anotaciones del registro"""
+    hints = typing.get_type_hints(record_type)
+    kinds = []
+    for name in record_type._fields:
+        hint = hints[name]
+        options = getattr(hint, "__args__", (hint,))
+        if float in options:
+            kinds.append((name, "d"))
+        elif int in options:
+            kinds.append((name, "q"))
+        else:
+            kinds.append((name, "s"))
+    return kinds
+
+
+def _pad(length: int) -> int:
+    """Relleno hasta múltiplo de 8"""
+    return (-length) % 8
+
+
+class SnapshotTable:
+    """Tabla de la instantánea: columnas de ancho fijo sobre el mmap"""
+
+    def __init__(self, buffer: mmap.mmap, record_type: Type[Record], key: str,
+                 rows: int, columns: Dict[str, Tuple[str, int]], heap_offset: int):
+        self._buffer = buffer
+        self.record_type = record_type
+        self.key = key
+        self.rows = rows
+        self._columns = columns
+        self._heap = heap_offset
+        self._views: List[memoryview] = []
+
+        kind, offset = columns[key]
+        self._ids = self._view(offset, kind)
+
+    def _view(self, offset: int, kind: str) -> memoryview:
+        """Vista tipada de una región de ancho fijo"""
+        view = memoryview(self._buffer)[offset:offset + self.rows * 8].cast(kind)
+        self._views.append(view)
+        return view
+
+    def __len__(self) -> int:
+        return self.rows
+
+    def ids(self) -> Sequence[int]:
+        """Claves primarias en orden ascendente"""
+        return self._ids
+
+    def column(self, name: str) -> Sequence[Any]:
+        """Valores de una columna (los números sin materializar registros)"""
+        kind, offset = self._columns[name]
+        if kind != "s":
+            return self._view(offset, kind)
+
+        refs = self._view(offset, "I")
+        buffer, heap = self._buffer, self._heap
+        decoded: Dict[int, Optional[str]] = {}
+        values = []
+        for start, length in zip(refs[0::2], refs[1::2]):
+            # Los textos repetidos comparten posición en el heap: se decodifican una vez
+            value = decoded.get(start, decoded)
+            if value is decoded:
+                value = None if length == _NULL_STR else buffer[heap + start:heap + start + length].decode("utf-8")
+                decoded[start] = value
+            values.append(value)
+        refs.release()
+        self._views.remove(refs)
+        return values
+
+    def find(self, record_id: int) -> Optional[int]:
+        """Fila del registro con ese ID (búsqueda binaria)"""
+        row = bisect.bisect_left(self._ids, record_id)
+        if row < self.rows and self._ids[row] == record_id:
+            return row
+        return None
+
+    def get(self, record_id: int) -> Optional[Record]:
+        """Materializar el registro con ese ID"""
+        row = self.find(record_id)
+        return None if row is None else self.record(row)
+
+    def record(self, row: int) -> Record:
+        """Materializar la fila indicada"""
+        return self.record_type(*(self._read(name, row) for name in self.record_type._fields))
+
+    def records(self) -> Iterator[Record]:
+        """Materializar todas las filas en orden de ID"""
+        for row in range(self.rows):
+            yield self.record(row)
+
+    def _read(self, name: str, row: int) -> Any:
+        """Leer una celda"""
+        kind, offset = self._columns[name]
+        position = offset + row * 8
+        if kind == "q":
+            value = _INT.unpack_from(self._buffer, position)[0]
+            return None if value == _NULL_INT else value
+        if kind == "d":
+            value = _FLOAT.unpack_from(self._buffer, position)[0]
+            return None if math.isnan(value) else value
+
+        start, length = _STR_REF.unpack_from(self._buffer, position)
+        if length == _NULL_STR:
+            return None
+        start += self._heap
+        return self._buffer[start:start + length].decode("utf-8")
+
+    def release(self):
+        """Liberar las vistas sobre el mmap"""
+        for view in self._views:
+            view.release()
+        self._views = []
+
+
+class Snapshot:
+    """Instantánea abierta con mmap (solo lectura)"""
+
+    def __init__(self, path: str, record_types: Dict[str, Tuple[Type[Record], str]]):
+        """
+        Args:
+            path: Archivo de la instantánea
+            record_types: {tabla: (tipo de registro, clave primaria)}
+
+        Raises:
+            ValueError: si el archivo no es una instantánea válida de esta versión
+        """
+        self.path = path
+        self._file = open(path, "rb")
+        try:
+            self._buffer = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self._file.close()
+            raise ValueError("Instantánea vacía")
+
+        self.tables: Dict[str, SnapshotTable] = {}
+        try:
+            self._parse(record_types)
+        except (ValueError, KeyError, struct.error):
+            self.close()
+            raise ValueError(f"Instantánea inválida: {path}")
+
+    def _parse(self, record_types: Dict[str, Tuple[Type[Record], str]]):
+        """Leer cabeceras (no recorre las filas)"""
+        buffer = self._buffer
+        magic, version, byteorder, self.seq, count = _HEADER.unpack_from(buffer, 0)
+        if magic != MAGIC or version != VERSION or byteorder != _BYTEORDER:
+            raise ValueError("Versión u orden de bytes distinto")
+        position = _HEADER.size
+
+        for _ in range(count):
+            name, position = self._read_name(position)
+            rows = _U64.unpack_from(buffer, position)[0]
+            ncols = _U16.unpack_from(buffer, position + 8)[0]
+            position += 10
+
+            layout = []
+            for _ in range(ncols):
+                column, position = self._read_name(position)
+                layout.append((column, buffer[position:position + 1].decode("ascii")))
+                position += 1
+            position += _pad(position)
+
+            columns = {}
+            for column, kind in layout:
+                columns[column] = (kind, position)
+                position += rows * 8
+
+            heap_size = _U64.unpack_from(buffer, position)[0]
+            heap_offset = position + 8
+            position = heap_offset + heap_size + _pad(heap_size)
+
+            record_type, key = record_types[name]
+            if [c for c, _ in layout] != list(record_type._fields):
+                raise ValueError(f"Columnas distintas en {name}")
+            self.tables[name] = SnapshotTable(buffer, record_type, key, rows, columns, heap_offset)
+
+    def _read_name(self, position: int) -> Tuple[str, int]:
+        """Leer un nombre con prefijo de longitud"""
+        length = _U16.unpack_from(self._buffer, position)[0]
+        start = position + 2
+        return self._buffer[start:start + length].decode("utf-8"), start + length
+
+    def close(self):
+        """Cerrar el mmap y el archivo"""
+        for table in self.tables.values():
+            table.release()
+        self.tables = {}
+        self._buffer.close()
+        self._file.close()
+
+
+def _name_bytes(name: str) -> bytes:
+    """Nombre con prefijo de longitud"""
+    data = name.encode("utf-8")
+    return _U16.pack(len(data)) + data
+
+
+def write_snapshot(path: str, database, seq: int):
+    """Escribir la instantánea de todas las tablas (reemplazo atómico del archivo)"""
+    repos = database.repositories
+    tmp_path = path + ".tmp"
+
+    with open(tmp_path, "wb") as out:
+        out.write(_HEADER.pack(MAGIC, VERSION, _BYTEORDER, seq, len(repos)))
+        written = _HEADER.size
+
+        for repo in repos:
+            kinds = column_kinds(repo.record_type)
+            rows = repo.get_all()
+
+            header = bytearray(_name_bytes(repo.table))
+            header += _U64.pack(len(rows)) + _U16.pack(len(kinds))
+            for column, kind in kinds:
+                header += _name_bytes(column) + kind.encode("ascii")
+            header += b"\0" * _pad(written + len(header))
+            out.write(header)
+            written += len(header)
+
+            heap = bytearray()
+            # Textos repetidos (fechas, estados, especies...) se guardan una sola vez
+            offsets: Dict[bytes, int] = {}
+            for column, kind in kinds:
+                if kind == "q":
+                    data = array("q", (_NULL_INT if r[column] is None else r[column] for r in rows))
+                elif kind == "d":
+                    data = array("d", (math.nan if r[column] is None else r[column] for r in rows))
+                else:
+                    data = array("I")
+                    for r in rows:
+                        value = r[column]
+                        if value is None:
+                            data.extend((0, _NULL_STR))
+                            continue
+                        encoded = str(value).encode("utf-8")
+                        start = offsets.get(encoded)
+                        if start is None:
+                            start = offsets[encoded] = len(heap)
+                            heap += encoded
+                        data.extend((start, len(encoded)))
+                out.write(data.tobytes())
+                written += len(rows) * 8
+
+            out.write(_U64.pack(len(heap)))
+            out.write(heap)
+            out.write(b"\0" * _pad(len(heap)))
+            written += 8 + len(heap) + _pad(len(heap))
+
+        out.flush()
+        os.fsync(out.fileno())
+
+    os.replace(tmp_path, path)
+
+
+def load_snapshot(database, seq: int) -> Optional[Snapshot]:
+    """
+    Abrir la instantánea de la base de datos si está al día
+
+    Se considera al día si corresponde al mismo checkpoint del diario y
+    tiene la misma cantidad de filas por tabla que SQLite.
+    """
+    if database.path == ":memory:":
+        return None
+
+    path = snapshot_path_for(database.path)
+    repos = database.repositories
+    try:
+        snapshot = Snapshot(path, {repo.table: (repo.record_type, repo.key) for repo in repos})
+    except (OSError, ValueError):
+        return None
+
+    up_to_date = snapshot.seq == seq and all(
+        repo.table in snapshot.tables and len(snapshot.tables[repo.table]) == repo.count()
+        for repo in repos
+    )
+    if not up_to_date:
+        snapshot.close()
+        return None
+    return snapshot
@@ -2,6 +2,12 @@
 Tema y estilos de la aplicación
 """
 
+import tkinter
+import weakref
+from typing import Dict, Optional, Tuple
+
+import customtkinter as ctk
+
 
 class VeterinariaTheme:
     """Clase para gestionar el tema de la aplicación"""
@@ -75,6 +81,53 @@ class VeterinariaTheme:
         "small": ("Segoe UI", 10),
     }
     
+    # Colores por estado de cita: (borde y badge, fondo de la fila)
+    CITA_ESTADOS = {
+        "Programada": ("#2563eb", "#eff6ff"),  # Azul
+        "Atendida": ("#059669", "#f0fdf4"),    # Verde
+        "Cancelada": ("#dc2626", "#fef2f2"),   # Rojo
+    }
+    CITA_ESTADO_DEFAULT = ("#94a3b8", "white")
+    
+    # Fuentes ya creadas por ventana principal y (familia, tamaño, peso, inclinación);
+    # las comparten todas las vistas y se descartan junto con su ventana
+    _fonts: "weakref.WeakKeyDictionary[tkinter.Misc, Dict[Tuple, ctk.CTkFont]]" = weakref.WeakKeyDictionary()
+    
+    @classmethod
+    def font(cls, master: tkinter.Misc, size: Optional[int] = None, weight: str = "normal",
+             family: Optional[str] = None, slant: str = "roman") -> ctk.CTkFont:
+        """
+        Fuente compartida para un estilo
+        
+        Cada CTkFont es una fuente con nombre de Tk más sus callbacks de
+        escalado; crear una por celda dejaba miles de fuentes idénticas.
+        Las fuentes se guardan por ventana principal (la raíz de master): si
+        se cierra y se abre otra, se crean de nuevo.
+        
+        Args:
+            master: Widget que usará la fuente
+            size: Tamaño en puntos (None: el del tema de CustomTkinter)
+            weight: "normal" o "bold"
+            family: Familia (None: la del tema de CustomTkinter)
+            slant: "roman" o "italic"
+        """
+        fonts = cls._fonts.setdefault(master.nametowidget("."), {})
+        key = (family, size, weight, slant)
+        font = fonts.get(key)
+        if font is None:
+            options = {"weight": weight, "slant": slant}
+            if size is not None:
+                options["size"] = size
+            if family is not None:
+                options["family"] = family
+            font = fonts[key] = ctk.CTkFont(**options)
+        return font
+    
+    @classmethod
+    def cita_style(cls, estado: str) -> Tuple[str, str]:
+        """Colores (borde y badge, fondo) de una cita según su estado"""
+        return cls.CITA_ESTADOS.get(estado, cls.CITA_ESTADO_DEFAULT)
+    
     @staticmethod
     def get_stat_color(stat_type):
         """Obtener color según el tipo de estadística"""
@@ -3,6 +3,7 @@ Sistema de validación para formularios
 """
 
 import re
+from datetime import date
 from typing import Tuple, Optional
 
 
@@ -149,6 +150,11 @@ class Validator:
         if not re.match(pattern, fecha):
             return False, "Formato de fecha inválido (use YYYY-MM-DD)"
         
+        try:
+            date.fromisoformat(fecha)
+        except ValueError:
+            return False, "La fecha no existe"
+        
         return True, None
     
     @staticmethod
@@ -4,15 +4,30 @@ Vista de citas - Versión Completa Mejorada con diseño legible y Drag & Drop
 
 import customtkinter as ctk
 from tkinter import messagebox
-from datetime import datetime
-from utils.mock_data import CITAS, MASCOTAS, VETERINARIOS, get_mascota_by_id, get_veterinario_by_id
+from datetime import date, datetime, timedelta
+from utils.mock_data import (get_citas_by_fecha, get_citas_by_veterinario, get_citas_en_conflicto,
+                             get_mascota_by_id, get_veterinario_by_id)
+from utils.database import get_database
+from utils.indexes import cita_duration, get_indexes
 from utils.animations import NotificationManager
+from utils.availability import find_free_slots
+from utils.exporter import export_view
 from utils.event_manager import AppContext, AppEvents
+from utils.search import DebouncedSearch, SearchSession
+from utils.validators import Validator
+from views.components.data_table import ProgressiveRenderer, diff_rows
+from views.components.record_lookup import RecordLookup
 
 
 class CitaFormDialog(ctk.CTkToplevel):
     """Formulario de cita"""
     
+    DIAS = ["Lun", "Mar", "Mié", "Jue", "Vie", "Sáb", "Dom"]
+    # Duración de la cita (min); también es el turno que busca "Horarios libres"
+    DURACIONES = {"30 min": 30, "45 min": 45, "1 hora": 60, "1 h 30 min": 90}
+    # Días a revisar en la búsqueda de horarios libres
+    RANGOS = {"7 días": 7, "14 días": 14, "30 días": 30, "60 días": 60}
+    
     def __init__(self, parent, mode, cita, theme, event_manager):
         super().__init__(parent)
         
@@ -43,6 +58,10 @@ class CitaFormDialog(ctk.CTkToplevel):
         
         if mode == 'view':
             self._disable_fields()
+        else:
+            self.fecha_entry.bind('<KeyRelease>', self._check_conflict)
+            self.hora_entry.bind('<KeyRelease>', self._check_conflict)
+            self._check_conflict()
     
     def _create_widgets(self):
         """Crear widgets"""
@@ -56,7 +75,7 @@ class CitaFormDialog(ctk.CTkToplevel):
         ctk.CTkLabel(
             title_frame,
             text={'add': '➕ NUEVA CITA', 'edit': '✏️ EDITAR CITA', 'view': '👁️ VER CITA'}[self.mode],
-            font=ctk.CTkFont(size=16, weight="bold"),
+            font=self.theme.font(master=self, size=16, weight="bold"),
             text_color="white"
         ).pack(pady=15)
         
@@ -70,49 +89,78 @@ class CitaFormDialog(ctk.CTkToplevel):
         
         fecha_left = ctk.CTkFrame(fecha_frame, fg_color="transparent")
         fecha_left.pack(side="left", fill="both", expand=True, padx=(0, 5))
-        ctk.CTkLabel(fecha_left, text="Fecha (*)", anchor="w", font=ctk.CTkFont(weight="bold")).pack(fill="x")
+        ctk.CTkLabel(fecha_left, text="Fecha (*)", anchor="w", font=self.theme.font(master=self, weight="bold")).pack(fill="x")
         self.fecha_entry = ctk.CTkEntry(fecha_left, height=40, placeholder_text="YYYY-MM-DD")
         self.fecha_entry.insert(0, datetime.now().strftime("%Y-%m-%d"))
         self.fecha_entry.pack(fill="x")
         
         fecha_right = ctk.CTkFrame(fecha_frame, fg_color="transparent")
         fecha_right.pack(side="right", fill="both", expand=True, padx=(5, 0))
-        ctk.CTkLabel(fecha_right, text="Hora (*)", anchor="w", font=ctk.CTkFont(weight="bold")).pack(fill="x")
+        ctk.CTkLabel(fecha_right, text="Hora (*)", anchor="w", font=self.theme.font(master=self, weight="bold")).pack(fill="x")
         self.hora_entry = ctk.CTkEntry(fecha_right, height=40, placeholder_text="HH:MM")
         self.hora_entry.insert(0, "09:00")
         self.hora_entry.pack(fill="x")
         
+        duracion_frame = ctk.CTkFrame(form, fg_color="transparent")
+        duracion_frame.pack(fill="x", pady=5)
+        ctk.CTkLabel(duracion_frame, text="Duración", anchor="w", font=self.theme.font(master=self, weight="bold")).pack(side="left")
+        self.duracion_combo = ctk.CTkComboBox(duracion_frame, values=list(self.DURACIONES), state="readonly", width=130, height=32,
+                                              command=lambda v: self._check_conflict())
+        self.duracion_combo.set("30 min")
+        self.duracion_combo.pack(side="left", padx=10)
+        
+        # Aviso de choque de horario (se recalcula al cambiar fecha, hora, veterinario o estado)
+        self.conflict_label = ctk.CTkLabel(form, text="", anchor="w", justify="left", text_color=self.theme.DANGER)
+        self.conflict_label.pack(fill="x")
+        
+        # Horarios libres (se eligen con un clic)
+        if self.mode != 'view':
+            libres_frame = ctk.CTkFrame(form, fg_color="transparent")
+            libres_frame.pack(fill="x", pady=(5, 0))
+            ctk.CTkButton(libres_frame, text="🕐 Horarios libres", command=self._show_free_slots, fg_color="#6b7280", hover_color="#4b5563", width=150, height=32).pack(side="left")
+            self.especialidad_check = ctk.CTkCheckBox(libres_frame, text="Toda la especialidad")
+            self.especialidad_check.pack(side="left", padx=10)
+            
+            opciones_frame = ctk.CTkFrame(form, fg_color="transparent")
+            opciones_frame.pack(fill="x", pady=(5, 0))
+            ctk.CTkLabel(opciones_frame, text="Buscar en").pack(side="left")
+            self.rango_combo = ctk.CTkComboBox(opciones_frame, values=list(self.RANGOS), state="readonly", width=110, height=32)
+            self.rango_combo.set("30 días")
+            self.rango_combo.pack(side="left", padx=5)
+            
+            self.slots_frame = ctk.CTkFrame(form, fg_color="transparent")
+            self.slots_frame.pack(fill="x")
+        
         # Mascota
-        ctk.CTkLabel(form, text="Mascota (*)", anchor="w", font=ctk.CTkFont(weight="bold")).pack(fill="x", pady=(10, 2))
-        mascotas_activas = [m for m in MASCOTAS if m['estado'] == 'Activo']
-        opciones_mascotas = [f"{m['nombre_mascota']} - {m['especie']} ({m['id_mascota']})" for m in mascotas_activas]
-        self.mascota_combo = ctk.CTkComboBox(form, values=opciones_mascotas, state="readonly", height=40)
-        if opciones_mascotas:
-            self.mascota_combo.set(opciones_mascotas[0])
-        self.mascota_combo.pack(fill="x", pady=(0, 10))
+        ctk.CTkLabel(form, text="Mascota (*)", anchor="w", font=self.theme.font(master=self, weight="bold")).pack(fill="x", pady=(10, 2))
+        self.mascota_lookup = RecordLookup(form, 'mascotas', lambda m: f"{m['nombre_mascota']} - {m['especie']} ({m['id_mascota']})",
+                                           self.theme, placeholder="🔍 Nombre o raza de la mascota...")
+        self.mascota_lookup.pack(fill="x", pady=(0, 10))
         
         # Veterinario
-        ctk.CTkLabel(form, text="Veterinario (*)", anchor="w", font=ctk.CTkFont(weight="bold")).pack(fill="x", pady=(5, 2))
-        vets_activos = [v for v in VETERINARIOS if v['estado'] == 'Activo']
-        opciones_vets = [f"Dr(a). {v['nombres']} {v['apellidos']} - {v['especialidad']}" for v in vets_activos]
-        self.veterinario_combo = ctk.CTkComboBox(form, values=opciones_vets, state="readonly", height=40)
+        ctk.CTkLabel(form, text="Veterinario (*)", anchor="w", font=self.theme.font(master=self, weight="bold")).pack(fill="x", pady=(5, 2))
+        self.vets_activos = [v for v in get_indexes().veterinarios.ordered() if v['estado'] == 'Activo']
+        opciones_vets = [f"Dr(a). {v['nombres']} {v['apellidos']} - {v['especialidad']}" for v in self.vets_activos]
+        self.veterinario_combo = ctk.CTkComboBox(form, values=opciones_vets, state="readonly", height=40,
+                                                 command=lambda v: self._check_conflict())
         if opciones_vets:
             self.veterinario_combo.set(opciones_vets[0])
         self.veterinario_combo.pack(fill="x", pady=(0, 10))
         
         # Motivo
-        ctk.CTkLabel(form, text="Motivo (*)", anchor="w", font=ctk.CTkFont(weight="bold")).pack(fill="x", pady=(5, 2))
+        ctk.CTkLabel(form, text="Motivo (*)", anchor="w", font=self.theme.font(master=self, weight="bold")).pack(fill="x", pady=(5, 2))
         self.motivo_entry = ctk.CTkEntry(form, height=40, placeholder_text="Ej: Consulta general, Vacunación...")
         self.motivo_entry.pack(fill="x", pady=(0, 10))
         
         # Observaciones
-        ctk.CTkLabel(form, text="Observaciones", anchor="w", font=ctk.CTkFont(weight="bold")).pack(fill="x", pady=(5, 2))
+        ctk.CTkLabel(form, text="Observaciones", anchor="w", font=self.theme.font(master=self, weight="bold")).pack(fill="x", pady=(5, 2))
         self.observaciones_text = ctk.CTkTextbox(form, height=100)
         self.observaciones_text.pack(fill="x", pady=(0, 10))
         
         # Estado
-        ctk.CTkLabel(form, text="Estado", anchor="w", font=ctk.CTkFont(weight="bold")).pack(fill="x", pady=(5, 2))
-        self.estado_combo = ctk.CTkComboBox(form, values=["Programada", "Atendida", "Cancelada"], state="readonly", height=40)
+        ctk.CTkLabel(form, text="Estado", anchor="w", font=self.theme.font(master=self, weight="bold")).pack(fill="x", pady=(5, 2))
+        self.estado_combo = ctk.CTkComboBox(form, values=["Programada", "Atendida", "Cancelada"], state="readonly", height=40,
+                                            command=lambda v: self._check_conflict())
         self.estado_combo.set("Programada")
         self.estado_combo.pack(fill="x", pady=(0, 10))
         
@@ -133,14 +181,14 @@ class CitaFormDialog(ctk.CTkToplevel):
             self.fecha_entry.insert(0, self.cita.get('fecha', ''))
             self.hora_entry.delete(0, 'end')
             self.hora_entry.insert(0, self.cita.get('hora', ''))
+            self._set_duracion(cita_duration(self.cita))
             self.motivo_entry.insert(0, self.cita.get('motivo', ''))
             self.observaciones_text.insert("1.0", self.cita.get('observaciones', ''))
             self.estado_combo.set(self.cita.get('estado', 'Programada'))
             
             mascota = get_mascota_by_id(self.cita.get('id_mascota'))
             if mascota:
-                valor = f"{mascota['nombre_mascota']} - {mascota['especie']} ({mascota['id_mascota']})"
-                self.mascota_combo.set(valor)
+                self.mascota_lookup.set(mascota)
             
             vet = get_veterinario_by_id(self.cita.get('id_veterinario'))
             if vet:
@@ -153,31 +201,42 @@ class CitaFormDialog(ctk.CTkToplevel):
         self.hora_entry.configure(state="disabled")
         self.motivo_entry.configure(state="disabled")
         self.observaciones_text.configure(state="disabled")
-        for combo in [self.mascota_combo, self.veterinario_combo, self.estado_combo]:
+        for combo in [self.duracion_combo, self.veterinario_combo, self.estado_combo]:
             combo.configure(state="disabled")
+        self.mascota_lookup.disable()
     
     def _save(self):
         """Guardar"""
         if not self.fecha_entry.get().strip() or not self.hora_entry.get().strip():
             messagebox.showerror("Error", "Fecha y hora son obligatorias")
             return
+        for valid, error in (Validator.validate_fecha(self.fecha_entry.get().strip()),
+                             Validator.validate_hora(self.hora_entry.get().strip())):
+            if not valid:
+                messagebox.showerror("Error", error)
+                return
         if not self.motivo_entry.get().strip():
             messagebox.showerror("Error", "El motivo es obligatorio")
             return
         
-        mascota_str = self.mascota_combo.get()
-        id_mascota = int(mascota_str.split('(')[-1].replace(')', ''))
+        mascota = self.mascota_lookup.get()
+        if not mascota:
+            messagebox.showerror("Error", "Elija la mascota entre las sugerencias de la búsqueda")
+            return
         
-        vet_str = self.veterinario_combo.get()
-        vet = next((v for v in VETERINARIOS if f"{v['nombres']} {v['apellidos']}" in vet_str), None)
+        vet = self._selected_vet()
         if not vet:
             messagebox.showerror("Error", "Veterinario no encontrado")
             return
         
+        if self._show_conflict(vet):
+            return
+        
         self.result = {
             'fecha': self.fecha_entry.get().strip(),
             'hora': self.hora_entry.get().strip(),
-            'id_mascota': id_mascota,
+            'duracion': self._duracion(),
+            'id_mascota': mascota['id_mascota'],
             'id_veterinario': vet['id'],
             'motivo': self.motivo_entry.get().strip(),
             'observaciones': self.observaciones_text.get("1.0", "end-1c").strip(),
@@ -185,31 +244,159 @@ class CitaFormDialog(ctk.CTkToplevel):
         }
         
         if self.mode == 'add':
-            self.result['id_cita'] = max([c.get('id_cita', 0) for c in CITAS] + [0]) + 1
+            self.result = get_database().citas.add(self.result)
             self.event_manager.emit(AppEvents.CITA_ADDED, {'cita': self.result})
             NotificationManager.show_success(self.master, "✓ Cita agendada")
         else:
             self.result['id_cita'] = self.cita['id_cita']
+            get_database().citas.update(self.result)
             self.event_manager.emit(AppEvents.CITA_UPDATED, {'cita': self.result})
             NotificationManager.show_success(self.master, "✓ Cita actualizada")
         
         self.destroy()
+    
+    def _duracion(self):
+        """Duración elegida, en minutos"""
+        texto = self.duracion_combo.get()
+        return self.DURACIONES.get(texto) or int(texto.split()[0])
+    
+    def _set_duracion(self, minutos):
+        """Mostrar una duración (las que no están en la lista se agregan como 'N min')"""
+        texto = next((t for t, m in self.DURACIONES.items() if m == minutos), f"{minutos} min")
+        if texto not in self.DURACIONES:
+            self.duracion_combo.configure(values=list(self.DURACIONES) + [texto])
+        self.duracion_combo.set(texto)
+    
+    def _selected_vet(self):
+        """Veterinario elegido en el combo"""
+        vet_str = self.veterinario_combo.get()
+        return next((v for v in self.vets_activos if f"{v['nombres']} {v['apellidos']}" in vet_str), None)
+    
+    def _show_free_slots(self):
+        """Proponer los próximos horarios libres del veterinario (o de su especialidad)"""
+        for widget in self.slots_frame.winfo_children():
+            widget.destroy()
+        
+        vet = self._selected_vet()
+        if not vet:
+            return
+        vets = [vet]
+        if self.especialidad_check.get():
+            vets += [v for v in self.vets_activos if v['especialidad'] == vet['especialidad'] and v is not vet]
+        nombres = {v['id']: f"Dr(a). {v['apellidos']}" for v in vets}
+        
+        try:
+            inicio = date.fromisoformat(self.fecha_entry.get().strip())
+        except ValueError:
+            inicio = date.today()
+        duracion = self.duracion_combo.get()
+        dias = self.RANGOS[self.rango_combo.get()]
+        slots = find_free_slots([v['id'] for v in vets], inicio, days=dias, duration=self._duracion())
+        
+        if not slots:
+            ctk.CTkLabel(self.slots_frame, text=f"Sin turnos libres de {duracion} en los próximos {dias} días", text_color="gray").pack(anchor="w", pady=5)
+            return
+        for i, slot in enumerate(slots):
+            texto = f"{self.DIAS[slot.day.weekday()]} {slot.day:%d/%m} {slot.hora}"
+            if len(vets) > 1:
+                texto += f" · {nombres[slot.vet_id]}"
+            ctk.CTkButton(
+                self.slots_frame,
+                text=texto,
+                command=lambda s=slot: self._use_slot(s),
+                fg_color="transparent",
+                border_width=1,
+                border_color=self.theme.ACCENT,
+                text_color=self.theme.ACCENT,
+                hover_color="#ede9fe",
+                height=30
+            ).grid(row=i // 2, column=i % 2, padx=3, pady=3, sticky="ew")
+        self.slots_frame.grid_columnconfigure((0, 1), weight=1)
+    
+    def _use_slot(self, slot):
+        """Pasar el horario elegido al formulario"""
+        self.fecha_entry.delete(0, 'end')
+        self.fecha_entry.insert(0, slot.fecha)
+        self.hora_entry.delete(0, 'end')
+        self.hora_entry.insert(0, slot.hora)
+        vet = next((v for v in self.vets_activos if v['id'] == slot.vet_id), None)
+        if vet:
+            self.veterinario_combo.set(f"Dr(a). {vet['nombres']} {vet['apellidos']} - {vet['especialidad']}")
+        for widget in self.slots_frame.winfo_children():
+            widget.destroy()
+        self._check_conflict()
+    
+    def _conflict(self, vet):
+        """Primera cita del veterinario que se cruza con la fecha y hora del formulario (o None)"""
+        if self.estado_combo.get() == 'Cancelada':
+            return None
+        conflictos = get_citas_en_conflicto(
+            self.fecha_entry.get().strip(),
+            self.hora_entry.get().strip(),
+            vet['id'],
+            self.cita['id_cita'] if self.cita else None,
+            self._duracion()
+        )
+        return conflictos[0] if conflictos else None
+    
+    def _check_conflict(self, event=None):
+        """Mostrar el choque de horario mientras se completa el formulario"""
+        vet = self._selected_vet()
+        cita = self._conflict(vet) if vet else None
+        if cita is None:
+            self.conflict_label.configure(text="")
+            return
+        mascota = get_mascota_by_id(cita['id_mascota'])
+        nombre = mascota['nombre_mascota'] if mascota else "Desconocida"
+        self.conflict_label.configure(
+            text=f"⚠️ Horario ocupado: ya tiene una cita a las {cita['hora']} ({nombre} - {cita['motivo']})")
+    
+    def _show_conflict(self, vet):
+        """Avisar si el veterinario ya tiene una cita en ese horario"""
+        cita = self._conflict(vet)
+        if cita is None:
+            return False
+        
+        mascota = get_mascota_by_id(cita['id_mascota'])
+        nombre = mascota['nombre_mascota'] if mascota else "Desconocida"
+        messagebox.showerror(
+            "Horario ocupado",
+            f"Dr(a). {vet['nombres']} {vet['apellidos']} ya tiene una cita:\n\n"
+            f"📅 {cita['fecha']} a las {cita['hora']}\n"
+            f"🐾 {nombre} - {cita['motivo']}\n\n"
+            "Elija otro horario o veterinario."
+        )
+        return True
 
 
 class CitasViewSimple(ctk.CTkScrollableFrame):
     """Vista de citas con diseño mejorado y Drag & Drop"""
     
+    PERIODOS = ["Todas las fechas", "Hoy", "Esta semana", "Este mes"]
+    SCREENFUL = 10   # Filas que se crean enseguida; el resto va por tandas
+    
     def __init__(self, parent, app):
         super().__init__(parent, fg_color=app.theme.COLORS["bg"])
         self.app = app
         self.theme = app.theme
-        self.citas = CITAS.copy()
-        self.filtered_citas = self.citas.copy()
+        self.database = get_database()
+        self.indexes = get_indexes()
+        self.filtered_citas = list(self.indexes.citas.ordered())
+        self.search_session = SearchSession('citas')
+        self.search_controller = DebouncedSearch(self, self._filter, self._show_filtered,
+                                                 prepare=self._filter_state, background=True)
         
         # Drag and drop
         self.dragging_row = None
         self.drag_start_y = 0
         
+        # Filas mostradas, por ID de cita (para reconciliar en vez de reconstruir)
+        self._row_keys = []
+        self._row_entries = {}   # id_cita -> (valores, cita, None)
+        self._row_frames = {}    # id_cita -> frame de la fila
+        self._pending_rows = {}  # id_cita -> (valores, cita, None) de las filas por crear
+        self._renderer = ProgressiveRenderer(self)
+        
         # Contexto
         self.context = AppContext()
         self.event_manager = self.context.event_manager
@@ -225,22 +412,27 @@ class CitasViewSimple(ctk.CTkScrollableFrame):
     def _on_cita_added(self, event):
         cita = event.data.get('cita')
         if cita:
-            self.citas.append(cita)
+            self.search_session.invalidate()
             self._apply_filters()
     
     def _on_cita_updated(self, event):
         cita = event.data.get('cita')
         if cita:
-            for i, c in enumerate(self.citas):
-                if c['id_cita'] == cita['id_cita']:
-                    self.citas[i].update(cita)
-                    break
+            # El índice ya tiene los cambios; la fila se corrige al instante y el filtro la reubica si hace falta
+            c = self.indexes.citas.get(cita['id_cita'])
+            if c is not None and c['id_cita'] in self._row_frames:
+                self._replace_row(c)
+            self.search_session.invalidate()
             self._apply_filters()
     
     def _on_cita_deleted(self, event):
         cita_id = event.data.get('cita_id')
         if cita_id:
-            self.citas = [c for c in self.citas if c['id_cita'] != cita_id]
+            if cita_id in self._row_frames:
+                self._row_frames.pop(cita_id).destroy()
+                del self._row_entries[cita_id]
+            self._pending_rows.pop(cita_id, None)
+            self.search_session.invalidate()
             self._apply_filters()
     
     def _create_widgets(self):
@@ -249,7 +441,7 @@ class CitasViewSimple(ctk.CTkScrollableFrame):
         header = ctk.CTkFrame(self, fg_color="transparent")
         header.pack(fill="x", padx=20, pady=(20, 10))
         
-        title = ctk.CTkLabel(header, text="GESTIÓN DE CITAS 📅", font=ctk.CTkFont(size=24, weight="bold"), text_color=self.theme.ACCENT)
+        title = ctk.CTkLabel(header, text="GESTIÓN DE CITAS 📅", font=self.theme.font(master=self, size=24, weight="bold"), text_color=self.theme.ACCENT)
         title.pack(side="left")
         
         btn_frame = ctk.CTkFrame(header, fg_color="transparent")
@@ -257,6 +449,7 @@ class CitasViewSimple(ctk.CTkScrollableFrame):
         
         ctk.CTkButton(btn_frame, text="🔄", command=self._refresh, width=50, fg_color=self.theme.ACCENT, hover_color="#6d28d9").pack(side="right", padx=5)
         ctk.CTkButton(btn_frame, text="➕ Nueva Cita", command=self._add_cita, fg_color=self.theme.ACCENT, hover_color="#6d28d9", width=150).pack(side="right", padx=5)
+        ctk.CTkButton(btn_frame, text="📤 Exportar", command=self._export, fg_color="#6b7280", hover_color="#4b5563", width=120).pack(side="right", padx=5)
         
         # Tip de drag-drop
         tip_frame = ctk.CTkFrame(self, fg_color="#dbeafe", corner_radius=8)
@@ -264,7 +457,7 @@ class CitasViewSimple(ctk.CTkScrollableFrame):
         ctk.CTkLabel(
             tip_frame,
             text="💡 Arrastra las filas para reordenar las prioridades (mantén clic y arrastra)",
-            font=ctk.CTkFont(size=12),
+            font=self.theme.font(master=self, size=12),
             text_color="#1e40af"
         ).pack(pady=10)
         
@@ -274,7 +467,7 @@ class CitasViewSimple(ctk.CTkScrollableFrame):
         
         self.search_entry = ctk.CTkEntry(search_frame, placeholder_text="🔍 Buscar...", height=40)
         self.search_entry.pack(side="left", fill="x", expand=True, padx=(0, 10))
-        self.search_entry.bind('<KeyRelease>', lambda e: self._apply_filters())
+        self.search_entry.bind('<KeyRelease>', self.search_controller.schedule)
         
         self.filter_combo = ctk.CTkComboBox(
             search_frame,
@@ -285,65 +478,136 @@ class CitasViewSimple(ctk.CTkScrollableFrame):
         self.filter_combo.set("Todos los estados")
         self.filter_combo.pack(side="left", padx=5)
         
+        # Periodo y veterinario (consultas sobre el índice por fecha)
+        self.periodo_combo = ctk.CTkComboBox(
+            search_frame,
+            values=self.PERIODOS,
+            command=lambda v: self._apply_filters(),
+            width=160
+        )
+        self.periodo_combo.set(self.PERIODOS[0])
+        self.periodo_combo.pack(side="left", padx=5)
+        
+        self.vet_ids = {
+            f"{v['nombres']} {v['apellidos']}": v['id']
+            for v in self.indexes.veterinarios.ordered()
+        }
+        self.vet_combo = ctk.CTkComboBox(
+            search_frame,
+            values=["Todos los veterinarios"] + list(self.vet_ids),
+            command=lambda v: self._apply_filters(),
+            width=200
+        )
+        self.vet_combo.set("Todos los veterinarios")
+        self.vet_combo.pack(side="left", padx=5)
+        
         ctk.CTkButton(search_frame, text="🗑️ Limpiar", command=self._clear_filters, fg_color="#6b7280", hover_color="#4b5563", width=100).pack(side="left", padx=5)
         
         # Contenedor tabla
         self.table_container = ctk.CTkFrame(self, fg_color=self.theme.COLORS["surface"], corner_radius=10)
         self.table_container.pack(fill="both", expand=True, padx=20, pady=10)
         
-        self.count_label = ctk.CTkLabel(self.table_container, text="", font=ctk.CTkFont(size=12), text_color=self.theme.TEXT_SECONDARY)
+        self.count_label = ctk.CTkLabel(self.table_container, text="", font=self.theme.font(master=self, size=12), text_color=self.theme.TEXT_SECONDARY)
         self.count_label.pack(pady=10)
         
         # Frame para las filas
         self.rows_frame = ctk.CTkFrame(self.table_container, fg_color="transparent")
         self.rows_frame.pack(fill="both", expand=True, padx=10, pady=(0, 10))
-    
-    def _update_table(self):
-        """Actualizar tabla con diseño mejorado"""
-        for widget in self.rows_frame.winfo_children():
-            widget.destroy()
         
-        self.count_label.configure(text=f"📋 Mostrando {len(self.filtered_citas)} de {len(self.citas)} citas")
-        
-        # Header de la tabla
-        header_row = ctk.CTkFrame(self.rows_frame, fg_color=self.theme.ACCENT, height=45, corner_radius=8)
-        header_row.pack(fill="x", pady=(0, 5))
-        header_row.grid_columnconfigure((0, 1, 2, 3, 4, 5), weight=1)
+        # Header de la tabla (las filas se ubican debajo)
+        self.header_row = ctk.CTkFrame(self.rows_frame, fg_color=self.theme.ACCENT, height=45, corner_radius=8)
+        self.header_row.pack(fill="x", pady=(0, 5))
+        self.header_row.grid_columnconfigure((0, 1, 2, 3, 4, 5), weight=1)
         
         headers = ["📅 Fecha", "⏰ Hora", "🐾 Mascota", "💬 Motivo", "📊 Estado", "⚙️ Acciones"]
         for i, header in enumerate(headers):
             lbl = ctk.CTkLabel(
-                header_row,
+                self.header_row,
                 text=header,
                 text_color="white",
-                font=ctk.CTkFont(size=12, weight="bold")
+                font=self.theme.font(master=self, size=12, weight="bold")
             )
             lbl.grid(row=0, column=i, sticky="ew", padx=8, pady=10)
+    
+    def _update_table(self):
+        """Actualizar tabla: reconciliar las filas por ID de cita"""
+        self.count_label.configure(text=f"📋 Mostrando {len(self.filtered_citas)} de {len(self.indexes.citas)} citas")
+        
+        # Un resultado nuevo cancela las filas que faltaban del anterior
+        self._renderer.cancel()
+        old_keys = [key for key in self._row_keys if key in self._row_entries]
+        changes, keys, entries = diff_rows(
+            old_keys,
+            [self._row_entries[key] for key in old_keys],
+            ((cita['id_cita'], self._row_values(cita), cita, None) for cita in self.filtered_citas)
+        )
         
-        # Renderizar filas
-        for index, cita in enumerate(self.filtered_citas):
-            self._create_row(index, cita)
+        for key in changes.removed:
+            self._row_frames.pop(key).destroy()
+            del self._row_entries[key]
+        
+        # Las filas que cambian se rehacen y las movidas se reubican; las
+        # nuevas se crean por tandas, cada una debajo de la anterior
+        moved = set(changes.moved)
+        changed = set(changes.updated)
+        previous = self.header_row
+        self._pending_rows = {}
+        for key, entry in zip(keys, entries):
+            row = self._row_frames.get(key)
+            if row is None:
+                self._pending_rows[key] = entry
+                continue
+            if key in changed or entry[1] is not self._row_entries[key][1]:
+                row = self._replace_row(entry[1], entry[0])
+            if key in moved:
+                row.pack(fill="x", pady=4, padx=5, after=previous)
+            self._row_entries[key] = entry
+            previous = row
+        
+        self._row_keys = keys
+        self._renderer.start(self._create_pending_rows(keys), immediate=self.SCREENFUL)
+    
+    def _create_pending_rows(self, keys):
+        """Crear las filas nuevas en orden, una por paso del renderer"""
+        for position, key in enumerate(keys):
+            entry = self._pending_rows.pop(key, None)
+            if entry is None:
+                continue
+            # Debajo de la fila creada más cercana por arriba
+            previous = self.header_row
+            for before in range(position - 1, -1, -1):
+                if keys[before] in self._row_frames:
+                    previous = self._row_frames[keys[before]]
+                    break
+            row = self._row_frames[key] = self._create_row(entry[1])
+            row.pack(fill="x", pady=4, padx=5, after=previous)
+            self._row_entries[key] = entry
+            yield
     
-    def _create_row(self, index, cita):
-        """Crear una fila con diseño mejorado y bordes visibles"""
+    def _row_values(self, cita):
+        """Lo que muestra la fila de una cita (para saber si cambió)"""
+        mascota = get_mascota_by_id(cita['id_mascota'])
+        mascota_nom = mascota['nombre_mascota'] if mascota else "Desconocido"
+        return (cita['fecha'], cita['hora'], mascota_nom, cita['motivo'], cita['estado'])
+    
+    def _replace_row(self, cita, values=None):
+        """Rehacer la fila de una cita en su mismo lugar"""
+        key = cita['id_cita']
+        old_row = self._row_frames[key]
+        row = self._create_row(cita)
+        row.pack(fill="x", pady=4, padx=5, after=old_row)
+        old_row.destroy()
+        self._row_frames[key] = row
+        self._row_entries[key] = (values or self._row_values(cita), cita, None)
+        return row
+    
+    def _create_row(self, cita):
+        """Crear una fila con diseño mejorado y bordes visibles (sin ubicarla)"""
         mascota = get_mascota_by_id(cita['id_mascota'])
         mascota_nom = mascota['nombre_mascota'] if mascota else "Desconocido"
         
-        # Color de borde según estado (más oscuros para mejor visibilidad)
-        border_colors = {
-            'Programada': "#2563eb",  # Azul oscuro
-            'Atendida': "#059669",    # Verde oscuro
-            'Cancelada': "#dc2626"    # Rojo oscuro
-        }
-        border = border_colors.get(cita['estado'], "#94a3b8")
-        
-        # Color de fondo con tinte según estado
-        bg_colors = {
-            'Programada': "#eff6ff",  # Azul muy claro
-            'Atendida': "#f0fdf4",    # Verde muy claro
-            'Cancelada': "#fef2f2"    # Rojo muy claro
-        }
-        bg_color = bg_colors.get(cita['estado'], "white")
+        # Borde (oscuro, para mejor visibilidad) y fondo con tinte según estado
+        border, bg_color = self.theme.cita_style(cita['estado'])
         
         # Frame de la fila con borde grueso y visible
         row = ctk.CTkFrame(
@@ -354,7 +618,6 @@ class CitasViewSimple(ctk.CTkScrollableFrame):
             border_color=border,
             height=65
         )
-        row.pack(fill="x", pady=4, padx=5)  # Más espacio entre filas
         row.grid_columnconfigure((0, 1, 2, 3, 4, 5), weight=1)
         
         # Fecha con badge visual
@@ -364,7 +627,7 @@ class CitasViewSimple(ctk.CTkScrollableFrame):
         ctk.CTkLabel(
             fecha_frame,
             text=cita['fecha'],
-            font=ctk.CTkFont(size=11, weight="bold"),
+            font=self.theme.font(master=self, size=11, weight="bold"),
             text_color="#1e293b"
         ).pack()
         
@@ -372,7 +635,7 @@ class CitasViewSimple(ctk.CTkScrollableFrame):
         ctk.CTkLabel(
             row,
             text=cita['hora'],
-            font=ctk.CTkFont(size=12, weight="bold"),
+            font=self.theme.font(master=self, size=12, weight="bold"),
             text_color="#475569"
         ).grid(row=0, column=1, pady=12, padx=8)
         
@@ -383,7 +646,7 @@ class CitasViewSimple(ctk.CTkScrollableFrame):
         ctk.CTkLabel(
             mascota_frame,
             text=f"🐾 {mascota_nom}",
-            font=ctk.CTkFont(size=11),
+            font=self.theme.font(master=self, size=11),
             text_color="#475569"
         ).pack()
         
@@ -392,17 +655,13 @@ class CitasViewSimple(ctk.CTkScrollableFrame):
         ctk.CTkLabel(
             row,
             text=motivo_corto,
-            font=ctk.CTkFont(size=11),
+            font=self.theme.font(master=self, size=11),
             text_color="#64748b"
         ).grid(row=0, column=3, pady=12, padx=8)
         
-        # Badge Estado con más contraste
-        estado_colors = {
-            "Programada": ("#2563eb", "white"),   # Azul oscuro
-            "Atendida": ("#059669", "white"),     # Verde oscuro
-            "Cancelada": ("#dc2626", "white")     # Rojo oscuro
-        }
-        bg_color_badge, text_color = estado_colors.get(cita['estado'], ("#64748B", "white"))
+        # Badge Estado con más contraste (mismo color que el borde)
+        bg_color_badge = border if cita['estado'] in self.theme.CITA_ESTADOS else self.theme.TEXT_SECONDARY
+        text_color = "white"
         
         badge = ctk.CTkLabel(
             row,
@@ -412,7 +671,7 @@ class CitasViewSimple(ctk.CTkScrollableFrame):
             corner_radius=15,
             width=95,
             height=30,
-            font=ctk.CTkFont(size=11, weight="bold")
+            font=self.theme.font(master=self, size=11, weight="bold")
         )
         badge.grid(row=0, column=4, pady=12, padx=8)
         
@@ -428,7 +687,7 @@ class CitasViewSimple(ctk.CTkScrollableFrame):
             height=32,
             fg_color="#3b82f6",
             hover_color="#2563eb",
-            font=ctk.CTkFont(size=14),
+            font=self.theme.font(master=self, size=14),
             command=lambda: self._view_cita(cita)
         )
         btn_view.pack(side="left", padx=2)
@@ -441,7 +700,7 @@ class CitasViewSimple(ctk.CTkScrollableFrame):
             height=32,
             fg_color="#8b5cf6",
             hover_color="#7c3aed",
-            font=ctk.CTkFont(size=14),
+            font=self.theme.font(master=self, size=14),
             command=lambda: self._edit_cita(cita)
         )
         btn_edit.pack(side="left", padx=2)
@@ -454,36 +713,25 @@ class CitasViewSimple(ctk.CTkScrollableFrame):
             height=32,
             fg_color="#ef4444",
             hover_color="#dc2626",
-            font=ctk.CTkFont(size=14),
+            font=self.theme.font(master=self, size=14),
             command=lambda: self._delete_cita(cita)
         )
         btn_delete.pack(side="left", padx=2)
         
         # Setup Drag & Drop
-        self._setup_drag_drop(row, cita, index)
+        self._setup_drag_drop(row, cita)
         
         return row
     
-    def _setup_drag_drop(self, row_frame, cita, index):
+    def _setup_drag_drop(self, row_frame, cita):
         """Configurar drag-and-drop con efectos visuales mejorados"""
-        dragging_data = {"active": False, "start_y": 0, "start_index": index}
-        
-        # Guardar colores originales
-        original_border_colors = {
-            'Programada': "#2563eb",
-            'Atendida': "#059669",
-            'Cancelada': "#dc2626"
-        }
-        original_bg_colors = {
-            'Programada': "#eff6ff",
-            'Atendida': "#f0fdf4",
-            'Cancelada': "#fef2f2"
-        }
+        dragging_data = {"active": False, "start_y": 0, "start_index": 0}
         
         def on_press(event):
             dragging_data["active"] = True
             dragging_data["start_y"] = event.y_root
-            dragging_data["start_index"] = index
+            # La posición se busca al presionar: las filas se reubican sin recrearse
+            dragging_data["start_index"] = self.filtered_citas.index(cita)
             self.dragging_row = cita
             self.drag_start_y = event.y_root
             
@@ -511,8 +759,7 @@ class CitasViewSimple(ctk.CTkScrollableFrame):
         def on_release(event):
             if dragging_data["active"]:
                 # Restaurar apariencia original
-                original_border = original_border_colors.get(cita['estado'], "#94a3b8")
-                original_bg = original_bg_colors.get(cita['estado'], "white")
+                original_border, original_bg = self.theme.cita_style(cita['estado'])
                 
                 row_frame.configure(
                     cursor="arrow",
@@ -564,31 +811,88 @@ class CitasViewSimple(ctk.CTkScrollableFrame):
         row_frame.bind("<Enter>", on_enter)
         row_frame.bind("<Leave>", on_leave)
     
+    @staticmethod
+    def _rango_del_periodo(periodo, hoy):
+        """Primer y último día del periodo (None para "Todas las fechas")"""
+        if periodo == "Todas las fechas":
+            return None
+        if periodo == "Hoy":
+            return hoy, hoy
+        if periodo == "Esta semana":
+            inicio = hoy - timedelta(days=hoy.weekday())
+            return inicio, inicio + timedelta(days=6)
+        inicio = hoy.replace(day=1)
+        return inicio, (inicio + timedelta(days=32)).replace(day=1) - timedelta(days=1)
+    
+    def _citas_del_periodo(self, periodo, vet_id, hoy, todas):
+        """Citas del periodo y veterinario elegidos (todas: en orden de ID; si no, de fecha y hora)"""
+        # Siempre los registros del índice, los mismos objetos que muestran las filas
+        rango = self._rango_del_periodo(periodo, hoy)
+        if rango is None:
+            return todas if vet_id is None else get_citas_by_veterinario(vet_id)
+        return get_citas_by_fecha(rango[0], rango[1], vet_id)
+    
+    def _citas_coincidentes(self, matches, periodo, vet_id, hoy):
+        """Citas de la búsqueda dentro del periodo y veterinario (mismo orden que _citas_del_periodo)"""
+        citas = self.indexes.citas.get_many(matches)
+        rango = self._rango_del_periodo(periodo, hoy)
+        if vet_id is not None:
+            citas = [c for c in citas if c['id_veterinario'] == vet_id]
+        if rango is not None:
+            desde, hasta = rango[0].isoformat(), rango[1].isoformat()
+            citas = [c for c in citas if desde <= c['fecha'] <= hasta]
+        if rango is not None or vet_id is not None:
+            citas.sort(key=lambda c: (c['fecha'], c['hora']))
+        return citas
+    
+    def _filter_state(self):
+        """Texto de búsqueda, filtros y tupla inmutable de citas (se leen en el hilo de Tk)"""
+        vet = self.vet_combo.get()
+        return (self.search_entry.get(), self.filter_combo.get(), self.periodo_combo.get(),
+                vet, self.vet_ids.get(vet), date.today(), self.indexes.citas.ordered())
+    
+    def _filter(self, state, token):
+        """Lista filtrada según la búsqueda y los filtros (corre en el ejecutor)"""
+        query, estado, periodo, vet, vet_id, hoy, todas = state
+        filters = (estado, periodo, vet, hoy)
+        
+        def compute(matches):
+            # Con texto se parte de las coincidencias, no de todas las citas del periodo
+            if matches is None:
+                citas = self._citas_del_periodo(periodo, vet_id, hoy, todas)
+            else:
+                citas = self._citas_coincidentes(matches, periodo, vet_id, hoy)
+            return [c for c in citas if estado == "Todos los estados" or c['estado'] == estado]
+        
+        return self.search_session.results(query, filters, compute)
+    
+    def _show_filtered(self, citas):
+        """Mostrar el resultado de la búsqueda"""
+        self.filtered_citas = citas
+        self._update_table()
+    
     def _apply_filters(self):
         """Aplicar filtros"""
-        search = self.search_entry.get().lower()
-        estado = self.filter_combo.get()
-        
-        self.filtered_citas = [
-            c for c in self.citas
-            if (search in c['motivo'].lower())
-            and (estado == "Todos los estados" or c['estado'] == estado)
-        ]
-        
-        self._update_table()
+        self.search_controller.run_now()
     
     def _clear_filters(self):
         """Limpiar filtros"""
         self.search_entry.delete(0, 'end')
         self.filter_combo.set("Todos los estados")
+        self.periodo_combo.set(self.PERIODOS[0])
+        self.vet_combo.set("Todos los veterinarios")
         self._apply_filters()
     
     def _refresh(self):
         """Refrescar"""
-        self.filtered_citas = self.citas.copy()
+        self.filtered_citas = list(self.indexes.citas.ordered())
         self._update_table()
         NotificationManager.show_success(self, "✓ Datos actualizados")
     
+    def _export(self):
+        """Exportar las filas que se están mostrando"""
+        export_view(self, 'citas', self.filtered_citas)
+    
     def _add_cita(self):
         """Agregar"""
         dialog = CitaFormDialog(self, 'add', None, self.theme, self.event_manager)
@@ -607,5 +911,6 @@ class CitasViewSimple(ctk.CTkScrollableFrame):
     def _delete_cita(self, cita):
         """Eliminar"""
         if messagebox.askyesno("Confirmar", f"¿Cancelar cita del {cita['fecha']} a las {cita['hora']}?"):
+            self.database.citas.delete(cita['id_cita'])
             self.event_manager.emit(AppEvents.CITA_DELETED, {'cita_id': cita['id_cita']})
             NotificationManager.show_success(self, "✓ Cita cancelada")
\ No newline at end of file
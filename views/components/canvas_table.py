@@ -0,0 +1,187 @@
+"""
+Tabla dibujada en un Canvas - alternativa liviana a DataTable
+"""
+
+import tkinter as tk
+
+from utils.theme import VeterinariaTheme
+from views.components.data_table import ScrollingTable
+
+
+class CanvasDataTable(ScrollingTable):
+    """
+    Tabla dibujada en un único tk.Canvas
+
+    No crea widgets por fila ni por celda: el encabezado, las celdas, los
+    badges de estado y los botones de acción son ítems del Canvas, y solo se
+    dibujan las filas visibles. Los clics y el hover se resuelven con los
+    tags del Canvas. Mismo contrato add_row que DataTable.
+    """
+
+    HEADER_HEIGHT = 40
+    ROW_HEIGHT = 42
+    ROW_GAP = 4
+    BADGE_SIZE = (96, 24)
+    ACTION_SIZE = (34, 28)
+
+    def __init__(self, parent, columns, theme=None, height=400):
+        super().__init__(parent, columns, theme)
+        self._hover = None      # Posición (en pantalla) de la fila bajo el mouse
+        self._callbacks = {}    # ID de ítem del Canvas -> acción
+
+        colors = theme.COLORS if theme else {}
+        self._colors = {
+            "surface": colors.get("surface", "white"),
+            "row": colors.get("bg_card", "white"),
+            "hover": colors.get("hover", "#f1f5f9"),
+            "border": colors.get("border", "#e2e8f0"),
+            "header": theme.PRIMARY if theme else "#2563eb",
+            "text": theme.TEXT_PRIMARY if theme else "#1e293b",
+        }
+        self._font = VeterinariaTheme.font(master=self, size=11)
+        self._bold_font = VeterinariaTheme.font(master=self, size=11, weight="bold")
+        self._header_font = VeterinariaTheme.font(master=self, size=12, weight="bold")
+
+        self.canvas = tk.Canvas(self, height=height, bg=self._colors["surface"], highlightthickness=0)
+        self.canvas.pack(side="left", fill="both", expand=True)
+        self.canvas.bind("<Configure>", lambda event: self._schedule_refresh())
+        self.canvas.bind("<Motion>", self._on_motion)
+        self.canvas.bind("<Leave>", lambda event: self._set_hover(None))
+        self.canvas.bind("<Button-1>", self._on_click)
+        for sequence in ("<MouseWheel>", "<Button-4>", "<Button-5>"):
+            self.canvas.bind(sequence, self._on_mousewheel)
+
+    def _fully_visible(self):
+        """Filas que caben enteras debajo del encabezado"""
+        height = self.canvas.winfo_height()
+        if height <= 1:
+            height = int(self.canvas.cget("height"))
+        return max(1, (height - self.HEADER_HEIGHT) // self.ROW_HEIGHT)
+
+    def _refresh(self):
+        """Dibujar el encabezado y las filas visibles"""
+        self._refresh_job = None
+        if not self.winfo_exists():
+            return
+
+        canvas = self.canvas
+        canvas.delete("all")
+        self._callbacks = {}
+        self._hover = None
+        width = max(canvas.winfo_width(), 1)
+        column_width = width / max(len(self.columns), 1)
+
+        # Encabezado
+        self._rounded_rect(0, 0, width, self.HEADER_HEIGHT - self.ROW_GAP, 10, fill=self._colors["header"])
+        for idx, column in enumerate(self.columns):
+            canvas.create_text(
+                (idx + 0.5) * column_width, (self.HEADER_HEIGHT - self.ROW_GAP) / 2,
+                text=self._fit(column, column_width - 10, self._header_font),
+                font=self._header_font, fill="white"
+            )
+
+        for position in range(self._visible_slice()):
+            self._draw_row(position, self.rows[self._first + position], width, column_width)
+
+    def _draw_row(self, position, entry, width, column_width):
+        """Dibujar una fila en su posición de pantalla"""
+        canvas = self.canvas
+        data, actions, estado_colors = entry
+        top = self.HEADER_HEIGHT + position * self.ROW_HEIGHT
+        middle = top + (self.ROW_HEIGHT - self.ROW_GAP) / 2
+        self._rounded_rect(
+            2, top, width - 2, top + self.ROW_HEIGHT - self.ROW_GAP, 8,
+            fill=self._colors["row"], outline=self._colors["border"], tags=("fondo", f"fondo{position}")
+        )
+
+        cells = len(self.columns) - (1 if actions else 0)
+        for idx, value in enumerate(data[:cells]):
+            x = (idx + 0.5) * column_width
+            if self.columns[idx] == "Estado":
+                bg_color, text_color = self._estado_colors(value, estado_colors)
+                badge_width, badge_height = self.BADGE_SIZE
+                self._rounded_rect(
+                    x - badge_width / 2, middle - badge_height / 2,
+                    x + badge_width / 2, middle + badge_height / 2, 12, fill=bg_color
+                )
+                canvas.create_text(x, middle, text=value, font=self._bold_font, fill=text_color)
+            else:
+                canvas.create_text(
+                    x, middle, text=self._fit(str(value), column_width - 10, self._font),
+                    font=self._font, fill=self._colors["text"]
+                )
+
+        if actions:
+            action_width, action_height = self.ACTION_SIZE
+            left = (len(data[:cells]) + 0.5) * column_width - (len(actions) * (action_width + 4) - 4) / 2
+            for icon, callback, color in actions:
+                button = self._rounded_rect(
+                    left, middle - action_height / 2, left + action_width, middle + action_height / 2, 6,
+                    fill=color, tags="accion"
+                )
+                label = canvas.create_text(left + action_width / 2, middle, text=icon, font=self._font, tags="accion")
+                self._callbacks[button] = self._callbacks[label] = callback
+                left += action_width + 4
+
+    def _rounded_rect(self, x1, y1, x2, y2, radius, **options):
+        """Rectángulo con esquinas redondeadas (polígono suavizado)"""
+        radius = min(radius, (x2 - x1) / 2, (y2 - y1) / 2)
+        points = (
+            x1 + radius, y1, x2 - radius, y1, x2, y1, x2, y1 + radius,
+            x2, y2 - radius, x2, y2, x2 - radius, y2, x1 + radius, y2,
+            x1, y2, x1, y2 - radius, x1, y1 + radius, x1, y1,
+        )
+        options.setdefault("outline", "")
+        return self.canvas.create_polygon(points, smooth=True, **options)
+
+    @staticmethod
+    def _fit(text, width, font):
+        """Recortar el texto con '…' si no entra en el ancho"""
+        if font.measure(text) <= width:
+            return text
+        low, high = 0, len(text)
+        while low < high:
+            middle = (low + high + 1) // 2
+            if font.measure(text[:middle] + "…") <= width:
+                low = middle
+            else:
+                high = middle - 1
+        return text[:low] + "…"
+
+    def _row_at(self, y):
+        """Posición en pantalla de la fila bajo la coordenada y (o None)"""
+        if y < self.HEADER_HEIGHT:
+            return None
+        position = int((y - self.HEADER_HEIGHT) // self.ROW_HEIGHT)
+        if self._first + position >= len(self.rows):
+            return None
+        return position
+
+    def _set_hover(self, position):
+        """Resaltar la fila bajo el mouse (solo se recolorean los dos fondos afectados)"""
+        if position == self._hover:
+            return
+        if self._hover is not None:
+            self.canvas.itemconfigure(f"fondo{self._hover}", fill=self._colors["row"])
+        if position is not None:
+            self.canvas.itemconfigure(f"fondo{position}", fill=self._colors["hover"])
+        self._hover = position
+
+    def _on_motion(self, event):
+        """Hover de filas y cursor de mano sobre las acciones"""
+        self._set_hover(self._row_at(event.y))
+        over_action = any(item in self._callbacks for item in self.canvas.find_withtag("current"))
+        self.canvas.configure(cursor="hand2" if over_action else "")
+
+    def _on_click(self, event):
+        """Ejecutar la acción bajo el mouse"""
+        for item in self.canvas.find_withtag("current"):
+            callback = self._callbacks.get(item)
+            if callback is not None:
+                callback()
+                return
+
+    def _on_mousewheel(self, event):
+        """Desplazar y resaltar la fila que queda bajo el mouse"""
+        super()._on_mousewheel(event)
+        self._set_hover(self._row_at(event.y))
@@ -8,6 +8,7 @@ from utils.validators import Validator
 from utils.animations import NotificationManager
 from utils.event_manager import AppEvents
 from utils.mock_data import get_mascotas_by_cliente
+from utils.database import get_database
 
 
 class ValidatedEntry(ctk.CTkEntry):
@@ -114,7 +115,7 @@ class ClienteFormDialog(ctk.CTkToplevel):
         ctk.CTkLabel(
             personal_header,
             text="DATOS PERSONALES",
-            font=ctk.CTkFont(size=13, weight="bold"),
+            font=self.theme.font(master=self, size=13, weight="bold"),
             text_color="white"
         ).pack(pady=8)
         
@@ -178,7 +179,7 @@ class ClienteFormDialog(ctk.CTkToplevel):
         ctk.CTkLabel(
             contact_header,
             text="DATOS DE CONTACTO",
-            font=ctk.CTkFont(size=13, weight="bold"),
+            font=self.theme.font(master=self, size=13, weight="bold"),
             text_color="white"
         ).pack(pady=8)
         
@@ -231,7 +232,7 @@ class ClienteFormDialog(ctk.CTkToplevel):
             ctk.CTkLabel(
                 mascotas_header,
                 text="MASCOTAS REGISTRADAS",
-                font=ctk.CTkFont(size=13, weight="bold"),
+                font=self.theme.font(master=self, size=13, weight="bold"),
                 text_color="white"
             ).pack(pady=8)
             
@@ -245,26 +246,26 @@ class ClienteFormDialog(ctk.CTkToplevel):
                 header_row = ctk.CTkFrame(mascotas_frame, fg_color="#5b9bd5", corner_radius=8)
                 header_row.pack(fill="x", padx=10, pady=10)
                 
-                ctk.CTkLabel(header_row, text="NOMBRE", font=ctk.CTkFont(size=11, weight="bold"), text_color="white", width=150).pack(side="left", padx=10, pady=8)
-                ctk.CTkLabel(header_row, text="ESPECIE", font=ctk.CTkFont(size=11, weight="bold"), text_color="white", width=100).pack(side="left", padx=10)
-                ctk.CTkLabel(header_row, text="RAZA", font=ctk.CTkFont(size=11, weight="bold"), text_color="white", width=150).pack(side="left", padx=10)
-                ctk.CTkLabel(header_row, text="EDAD", font=ctk.CTkFont(size=11, weight="bold"), text_color="white", width=80).pack(side="left", padx=10)
+                ctk.CTkLabel(header_row, text="NOMBRE", font=self.theme.font(master=self, size=11, weight="bold"), text_color="white", width=150).pack(side="left", padx=10, pady=8)
+                ctk.CTkLabel(header_row, text="ESPECIE", font=self.theme.font(master=self, size=11, weight="bold"), text_color="white", width=100).pack(side="left", padx=10)
+                ctk.CTkLabel(header_row, text="RAZA", font=self.theme.font(master=self, size=11, weight="bold"), text_color="white", width=150).pack(side="left", padx=10)
+                ctk.CTkLabel(header_row, text="EDAD", font=self.theme.font(master=self, size=11, weight="bold"), text_color="white", width=80).pack(side="left", padx=10)
                 
                 # Datos
                 for mascota in mascotas:
                     data_row = ctk.CTkFrame(mascotas_frame, fg_color="white")
                     data_row.pack(fill="x", padx=10, pady=2)
                     
-                    ctk.CTkLabel(data_row, text=mascota['nombre_mascota'], font=ctk.CTkFont(size=11), width=150).pack(side="left", padx=10, pady=5)
-                    ctk.CTkLabel(data_row, text=mascota['especie'], font=ctk.CTkFont(size=11), width=100).pack(side="left", padx=10)
-                    ctk.CTkLabel(data_row, text=mascota['raza'], font=ctk.CTkFont(size=11), width=150).pack(side="left", padx=10)
+                    ctk.CTkLabel(data_row, text=mascota['nombre_mascota'], font=self.theme.font(master=self, size=11), width=150).pack(side="left", padx=10, pady=5)
+                    ctk.CTkLabel(data_row, text=mascota['especie'], font=self.theme.font(master=self, size=11), width=100).pack(side="left", padx=10)
+                    ctk.CTkLabel(data_row, text=mascota['raza'], font=self.theme.font(master=self, size=11), width=150).pack(side="left", padx=10)
                     edad_str = f"{mascota['edad_años']}a {mascota['edad_meses']}m"
-                    ctk.CTkLabel(data_row, text=edad_str, font=ctk.CTkFont(size=11), width=80).pack(side="left", padx=10)
+                    ctk.CTkLabel(data_row, text=edad_str, font=self.theme.font(master=self, size=11), width=80).pack(side="left", padx=10)
             else:
                 ctk.CTkLabel(
                     mascotas_frame,
                     text="📝 No hay mascotas registradas para este cliente",
-                    font=ctk.CTkFont(size=12),
+                    font=self.theme.font(master=self, size=12),
                     text_color="#64748b"
                 ).pack(pady=20)
         
@@ -277,7 +278,7 @@ class ClienteFormDialog(ctk.CTkToplevel):
             save_btn = ctk.CTkButton(
                 buttons_frame,
                 text="✓ FINALIZAR REGISTRO" if self.mode == "add" else "💾 GUARDAR CAMBIOS",
-                font=ctk.CTkFont(size=13, weight="bold"),
+                font=self.theme.font(master=self, size=13, weight="bold"),
                 fg_color="#10b981",
                 hover_color="#059669",
                 height=45,
@@ -289,7 +290,7 @@ class ClienteFormDialog(ctk.CTkToplevel):
             cancel_btn = ctk.CTkButton(
                 buttons_frame,
                 text="✗ CANCELAR",
-                font=ctk.CTkFont(size=13, weight="bold"),
+                font=self.theme.font(master=self, size=13, weight="bold"),
                 fg_color="#6b7280",
                 hover_color="#4b5563",
                 height=45,
@@ -301,7 +302,7 @@ class ClienteFormDialog(ctk.CTkToplevel):
             close_btn = ctk.CTkButton(
                 main_container,
                 text="✓ CERRAR",
-                font=ctk.CTkFont(size=13, weight="bold"),
+                font=self.theme.font(master=self, size=13, weight="bold"),
                 fg_color="#6b7280",
                 hover_color="#4b5563",
                 height=45,
@@ -314,7 +315,7 @@ class ClienteFormDialog(ctk.CTkToplevel):
         label = ctk.CTkLabel(
             parent,
             text=text,
-            font=ctk.CTkFont(size=10, weight="bold"),
+            font=self.theme.font(master=self, size=10, weight="bold"),
             text_color="#64748b",
             anchor="w"
         )
@@ -391,9 +392,11 @@ class ClienteFormDialog(ctk.CTkToplevel):
         
         if self.mode == "edit":
             cliente_data["id"] = self.cliente["id"]
+            get_database().clientes.update(cliente_data)
             self.event_manager.emit(AppEvents.CLIENTE_UPDATED, {'cliente': cliente_data})
             NotificationManager.show_success(self.master, "✓ Cliente actualizado correctamente")
         else:
+            cliente_data = get_database().clientes.add(cliente_data)
             self.event_manager.emit(AppEvents.CLIENTE_ADDED, {'cliente': cliente_data})
             NotificationManager.show_success(self.master, "✓ Cliente agregado correctamente")
         
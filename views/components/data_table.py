@@ -2,51 +2,249 @@
 Componente de tabla de datos - Simple y funcional
 """
 
+import abc
+import os
+import time
+from bisect import bisect_left
+from dataclasses import dataclass, field
+from typing import Hashable, Iterable, Iterator, List, Sequence, Tuple
+
 import customtkinter as ctk
 
+from utils.theme import VeterinariaTheme
 
-class DataTable(ctk.CTkFrame):
-    """Tabla de datos con método add_row"""
+# Tablas de los listados: "widgets" (VirtualDataTable) o "canvas" (CanvasDataTable)
+TABLE_BACKEND = os.environ.get("VETERINARIA_TABLAS", "widgets")
+
+
+@dataclass
+class RowChanges:
+    """Claves de las filas que cambiaron en una reconciliación"""
     
-    def __init__(self, parent, columns, theme=None, height=400):
-        super().__init__(parent, fg_color="transparent")
-        
-        self.columns = columns
-        self.theme = theme
-        self.rows = []
-        
-        # Contenedor scrollable
-        self.scroll_frame = ctk.CTkScrollableFrame(
-            self,
-            fg_color=theme.COLORS["surface"] if theme else "white",
-            height=height
-        )
-        self.scroll_frame.pack(fill="both", expand=True)
+    inserted: List[Hashable] = field(default_factory=list)
+    removed: List[Hashable] = field(default_factory=list)
+    moved: List[Hashable] = field(default_factory=list)
+    updated: List[Hashable] = field(default_factory=list)
+    
+    def __bool__(self):
+        return bool(self.inserted or self.removed or self.moved or self.updated)
+
+
+def _stable_positions(positions: Sequence[int]) -> set:
+    """Índices de la subsecuencia creciente más larga (las filas que no se mueven)"""
+    tails: List[int] = []       # Último valor de cada largo posible
+    tail_index: List[int] = []  # Índice en positions de ese valor
+    parent = [-1] * len(positions)
+    for idx, position in enumerate(positions):
+        length = bisect_left(tails, position)
+        if length == len(tails):
+            tails.append(position)
+            tail_index.append(idx)
+        else:
+            tails[length] = position
+            tail_index[length] = idx
+        parent[idx] = tail_index[length - 1] if length else -1
+    
+    stable = set()
+    idx = tail_index[-1] if tail_index else -1
+    while idx != -1:
+        stable.add(idx)
+        idx = parent[idx]
+    return stable
+
+
+def diff_rows(old_keys: Sequence[Hashable], old_entries: Sequence[Tuple],
+              rows: Iterable[Tuple]) -> Tuple[RowChanges, List[Hashable], List[Tuple]]:
+    """
+    Comparar las filas mostradas con las nuevas, por clave
+    
+    Args:
+        old_keys: Clave de cada fila mostrada (None si no tiene)
+        old_entries: (data, actions, estado_colors) de cada fila mostrada
+        rows: Filas nuevas como (key, data, actions, estado_colors)
+    
+    Returns:
+        (cambios, claves nuevas, entradas nuevas). Una fila se considera
+        actualizada si cambian sus datos o sus colores; las acciones se
+        reemplazan sin contar como cambio (dependen del registro, no de lo
+        que se muestra).
+    """
+    old_positions = {key: pos for pos, key in enumerate(old_keys) if key is not None}
+    changes = RowChanges()
+    keys: List[Hashable] = []
+    entries: List[Tuple] = []
+    kept_keys: List[Hashable] = []
+    kept_positions: List[int] = []
+    
+    for key, data, actions, estado_colors in rows:
+        position = old_positions.pop(key, None)
+        if position is None:
+            changes.inserted.append(key)
+        else:
+            old_data, _, old_colors = old_entries[position]
+            if old_data != data or old_colors != estado_colors:
+                changes.updated.append(key)
+            kept_keys.append(key)
+            kept_positions.append(position)
+        keys.append(key)
+        entries.append((data, actions, estado_colors))
+    
+    changes.removed = list(old_positions)
+    # Caso común (filtrar más o menos): el orden relativo no cambia
+    if any(a > b for a, b in zip(kept_positions, kept_positions[1:])):
+        stable = _stable_positions(kept_positions)
+        changes.moved = [key for idx, key in enumerate(kept_keys) if idx not in stable]
+    return changes, keys, entries
+
+
+_DONE = object()  # Fin de los pasos de un dibujo
+
+
+class ProgressiveRenderer:
+    """
+    Dibujo por tandas con presupuesto de tiempo
+    
+    Avanza un iterador (cada paso crea una fila) en tandas de BUDGET_MS con
+    after(), así el loop de Tk atiende eventos entre tanda y tanda. Empezar
+    otro dibujo cancela el que estaba en curso.
+    """
+    
+    BUDGET_MS = 8   # Tiempo por tanda (medio frame a 60 Hz)
+    
+    def __init__(self, widget, budget_ms: int = BUDGET_MS):
+        self.widget = widget
+        self.budget = budget_ms / 1000
+        self._steps = None
+        self._job = None
+    
+    @property
+    def running(self) -> bool:
+        """Si queda un dibujo en curso"""
+        return self._steps is not None
+    
+    def start(self, steps: Iterator, immediate: int = 0):
+        """
+        Empezar un dibujo (cancela el anterior)
         
-        # Crear header
-        self._create_header()
+        Args:
+            steps: Iterador cuyo next() hace un paso del dibujo
+            immediate: Pasos que se hacen ya (la primera pantalla)
+        """
+        self.cancel()
+        self._steps = steps
+        for _ in range(immediate):
+            if next(steps, _DONE) is _DONE:
+                self._steps = None
+                return
+        self._job = self.widget.after(1, self._run)
+    
+    def cancel(self):
+        """Abandonar el dibujo en curso"""
+        if self._job is not None:
+            self.widget.after_cancel(self._job)
+            self._job = None
+        self._steps = None
     
-    def _create_header(self):
+    def _run(self):
+        """Hacer pasos hasta agotar el presupuesto y dejar el resto para después"""
+        self._job = None
+        if not self.widget.winfo_exists():
+            self._steps = None
+            return
+        deadline = time.perf_counter() + self.budget
+        while time.perf_counter() < deadline:
+            if next(self._steps, _DONE) is _DONE:
+                self._steps = None
+                return
+        self._job = self.widget.after(1, self._run)
+
+
+class _TableRows:
+    """Claves de las filas, encabezado y colores de estado (comunes a DataTable y ScrollingTable)"""
+    
+    def _create_header(self, parent, uniform=None):
         """Crear encabezado"""
         header = ctk.CTkFrame(
-            self.scroll_frame,
+            parent,
             fg_color=self.theme.PRIMARY if self.theme else "#2563eb",
             corner_radius=10
         )
         header.pack(fill="x", pady=(0, 10))
+        self.header = header
         
         for idx, col in enumerate(self.columns):
             label = ctk.CTkLabel(
                 header,
                 text=col,
-                font=ctk.CTkFont(size=12, weight="bold"),
+                font=VeterinariaTheme.font(master=self, size=12, weight="bold"),
                 text_color="white",
                 anchor="center"
             )
             label.grid(row=0, column=idx, padx=5, pady=10, sticky="ew")
-            header.grid_columnconfigure(idx, weight=1)
+            header.grid_columnconfigure(idx, weight=1, uniform=uniform)
+    
+    def index_of(self, key):
+        """Posición de la fila con esa clave (o None)"""
+        if self._positions is None:
+            self._positions = {k: pos for pos, k in enumerate(self.keys) if k is not None}
+        return self._positions.get(key)
     
-    def add_row(self, data, actions=None, estado_colors=None):
+    def _append_key(self, key):
+        """Registrar la clave de una fila agregada al final"""
+        if key is not None and self._positions is not None:
+            self._positions[key] = len(self.keys)
+        self.keys.append(key)
+    
+    def _forget_key(self, position):
+        """Quitar la clave de una fila eliminada"""
+        key = self.keys.pop(position)
+        if self._positions is not None:
+            if position == len(self.keys):
+                self._positions.pop(key, None)
+            else:
+                # Las filas siguientes cambian de posición: se recalcula al consultar
+                self._positions = None
+    
+    def _estado_colors(self, value, estado_colors=None):
+        """Colores (fondo, texto) del badge de estado"""
+        if estado_colors and value in estado_colors:
+            colors = estado_colors[value]
+            return colors["bg"], colors["text"]
+        if self.theme:
+            return (self.theme.SUCCESS if value == "Activo" else self.theme.TEXT_SECONDARY), "white"
+        return ("#10b981" if value == "Activo" else "#64748b"), "white"
+
+
+class DataTable(_TableRows, ctk.CTkFrame):
+    """Tabla de datos con método add_row"""
+    
+    ROW_HEIGHT_HINT = 46   # Alto aproximado de una fila (para calcular la primera pantalla)
+    
+    def __init__(self, parent, columns, theme=None, height=400):
+        super().__init__(parent, fg_color="transparent")
+        
+        self.columns = columns
+        self.theme = theme
+        self.rows = []          # Frame de cada fila (None mientras espera su tanda)
+        self.keys = []          # Clave de cada fila (None si se agregó sin clave)
+        self._widgets = []      # _RowWidgets de cada fila (None mientras espera su tanda)
+        self._positions = None  # Clave -> posición (se arma al consultarla)
+        self._pending = {}      # Clave -> entrada de las filas que sync aún no creó
+        self._renderer = ProgressiveRenderer(self)
+        self._screenful = height // self.ROW_HEIGHT_HINT + 1
+        
+        # Contenedor scrollable
+        self.scroll_frame = ctk.CTkScrollableFrame(
+            self,
+            fg_color=theme.COLORS["surface"] if theme else "white",
+            height=height
+        )
+        self.scroll_frame.pack(fill="both", expand=True)
+        
+        # Crear header
+        self._create_header(self.scroll_frame)
+    
+    def add_row(self, data, actions=None, estado_colors=None, key=None):
         """
         Agregar fila
         
@@ -54,16 +252,29 @@ class DataTable(ctk.CTkFrame):
             data: Lista con datos de la fila
             actions: Lista de tuplas (icon, callback, color)
             estado_colors: Diccionario {estado: {"bg": color, "text": color}}
+            key: Clave de la fila (ID del registro) para update_row, remove_row y sync
         
         Returns:
             Frame de la fila (para drag & drop)
         """
+        widgets = self._build_row((data, actions, estado_colors))
+        widgets.frame.pack(fill="x", pady=2, padx=5)
+        
+        self._append_key(key)
+        self._widgets.append(widgets)
+        self.rows.append(widgets.frame)
+        return widgets.frame
+    
+    def _build_row(self, entry):
+        """Crear los widgets de una fila"""
+        data, actions, estado_colors = entry
         row_frame = ctk.CTkFrame(
             self.scroll_frame,
             fg_color=self.theme.COLORS["bg_card"] if self.theme else "white",
             corner_radius=8
         )
-        row_frame.pack(fill="x", pady=2, padx=5)
+        widgets = _RowWidgets(row_frame, [], None)
+        widgets.entry = entry
         
         # Datos
         for idx, value in enumerate(data):
@@ -74,21 +285,12 @@ class DataTable(ctk.CTkFrame):
             
             if col_name == "Estado":
                 # Badge de estado con colores personalizables
-                if estado_colors and value in estado_colors:
-                    colors = estado_colors[value]
-                    bg_color = colors["bg"]
-                    text_color = colors["text"]
-                elif self.theme:
-                    bg_color = self.theme.SUCCESS if value == "Activo" else self.theme.TEXT_SECONDARY
-                    text_color = "white"
-                else:
-                    bg_color = "#10b981" if value == "Activo" else "#64748b"
-                    text_color = "white"
+                bg_color, text_color = self._estado_colors(value, estado_colors)
                 
                 badge = ctk.CTkLabel(
                     row_frame,
                     text=value,
-                    font=ctk.CTkFont(size=11, weight="bold"),
+                    font=VeterinariaTheme.font(master=self, size=11, weight="bold"),
                     text_color=text_color,
                     fg_color=bg_color,
                     corner_radius=12,
@@ -96,27 +298,29 @@ class DataTable(ctk.CTkFrame):
                     width=100
                 )
                 badge.grid(row=0, column=idx, padx=5, pady=8)
+                widgets.cells.append(badge)
             else:
                 # Texto normal
                 label = ctk.CTkLabel(
                     row_frame,
                     text=str(value),
-                    font=ctk.CTkFont(size=11),
+                    font=VeterinariaTheme.font(master=self, size=11),
                     text_color=self.theme.TEXT_PRIMARY if self.theme else "#1e293b",
                     anchor="center"
                 )
                 label.grid(row=0, column=idx, padx=5, pady=8, sticky="ew")
+                widgets.cells.append(label)
             
             row_frame.grid_columnconfigure(idx, weight=1)
         
         # Botones de acción
         if actions:
-            actions_frame = ctk.CTkFrame(row_frame, fg_color="transparent")
-            actions_frame.grid(row=0, column=len(data), padx=5, pady=8)
+            widgets.actions_frame = ctk.CTkFrame(row_frame, fg_color="transparent")
+            widgets.actions_frame.grid(row=0, column=len(data), padx=5, pady=8)
             
             for icon, callback, color in actions:
                 btn = ctk.CTkButton(
-                    actions_frame,
+                    widgets.actions_frame,
                     text=icon,
                     width=35,
                     height=30,
@@ -125,12 +329,476 @@ class DataTable(ctk.CTkFrame):
                     command=callback
                 )
                 btn.pack(side="left", padx=2)
+                widgets.buttons.append(btn)
+        
+        return widgets
+    
+    def _update_row(self, widgets, entry):
+        """Mostrar datos nuevos en los widgets de una fila (solo los que cambian)"""
+        old_data, old_actions, old_colors = widgets.entry
+        data, actions, estado_colors = entry
+        if len(data) != len(old_data) or _action_styles(actions) != _action_styles(old_actions):
+            # Cambió la forma de la fila: se reemplaza en su lugar
+            new_widgets = self._build_row(entry)
+            new_widgets.frame.pack(fill="x", pady=2, padx=5, after=widgets.frame)
+            widgets.frame.destroy()
+            return new_widgets
+        
+        widgets.entry = entry
+        for idx, cell in enumerate(widgets.cells):
+            value = data[idx]
+            if self.columns[idx] == "Estado":
+                if value != old_data[idx] or estado_colors != old_colors:
+                    bg_color, text_color = self._estado_colors(value, estado_colors)
+                    cell.configure(text=value, fg_color=bg_color, text_color=text_color)
+            elif value != old_data[idx]:
+                cell.configure(text=str(value))
+        if actions is not old_actions:
+            for button, (_, callback, _) in zip(widgets.buttons, actions or []):
+                button.configure(command=callback)
+        return widgets
+    
+    def update_row(self, key, data, actions=None, estado_colors=None):
+        """
+        Reemplazar los datos de una fila sin tocar las demás
         
-        self.rows.append(row_frame)
-        return row_frame
+        Returns:
+            True si la fila estaba en la tabla
+        """
+        position = self.index_of(key)
+        if position is None:
+            return False
+        if self._widgets[position] is None:
+            self._pending[key] = (data, actions, estado_colors)
+            return True
+        widgets = self._update_row(self._widgets[position], (data, actions, estado_colors))
+        self._widgets[position] = widgets
+        self.rows[position] = widgets.frame
+        return True
+    
+    def remove_row(self, key):
+        """
+        Quitar una fila sin tocar las demás
+        
+        Returns:
+            True si la fila estaba en la tabla
+        """
+        position = self.index_of(key)
+        if position is None:
+            return False
+        self._forget_key(position)
+        widgets = self._widgets.pop(position)
+        if widgets is None:
+            del self._pending[key]
+        else:
+            widgets.frame.destroy()
+        del self.rows[position]
+        return True
+    
+    def sync(self, rows):
+        """
+        Reconciliar la tabla con una lista de filas con clave
+        
+        Solo se crean las filas nuevas, se destruyen las que ya no están, se
+        reubican las que cambiaron de lugar y se reconfiguran las celdas que
+        cambiaron; el resto de los widgets no se toca. Las filas nuevas se
+        crean por tandas (la primera pantalla enseguida); un sync posterior
+        cancela las que falten.
+        
+        Args:
+            rows: Iterable de (key, data, actions, estado_colors)
+        
+        Returns:
+            RowChanges con las claves insertadas, quitadas, movidas y actualizadas
+        """
+        self._renderer.cancel()
+        # Solo cuentan las filas ya creadas (las pendientes se vuelven a calcular)
+        shown = [(key, widgets) for key, widgets in zip(self.keys, self._widgets) if widgets is not None]
+        old_widgets = {key: widgets for key, widgets in shown if key is not None}
+        changes, keys, entries = diff_rows(
+            [key for key, _ in shown], [widgets.entry for _, widgets in shown], rows
+        )
+        
+        for key, widgets in shown:
+            if key is None:
+                widgets.frame.destroy()
+        for key in changes.removed:
+            old_widgets.pop(key).frame.destroy()
+        
+        # Las filas que quedan se acomodan ya; las nuevas se ubican al crearse
+        moved = set(changes.moved)
+        previous = self.header
+        self._widgets = []
+        self._pending = {}
+        for key, entry in zip(keys, entries):
+            widgets = old_widgets.pop(key, None)
+            if widgets is None:
+                self._pending[key] = entry
+            else:
+                widgets = self._update_row(widgets, entry)
+                if key in moved:
+                    widgets.frame.pack(fill="x", pady=2, padx=5, after=previous)
+                previous = widgets.frame
+            self._widgets.append(widgets)
+        
+        self.keys = keys
+        self._positions = None
+        self.rows = [widgets.frame if widgets else None for widgets in self._widgets]
+        self._renderer.start(self._create_pending(), immediate=self._screenful)
+        return changes
+    
+    def _create_pending(self):
+        """Crear las filas pendientes en orden, una por paso"""
+        while self._pending:
+            key = next(iter(self._pending))
+            entry = self._pending.pop(key)
+            position = self.index_of(key)
+            widgets = self._build_row(entry)
+            widgets.frame.pack(fill="x", pady=2, padx=5, after=self._frame_before(position))
+            self._widgets[position] = widgets
+            self.rows[position] = widgets.frame
+            yield
+    
+    def _frame_before(self, position):
+        """Frame de la fila creada más cercana por arriba (o el encabezado)"""
+        for idx in range(position - 1, -1, -1):
+            if self._widgets[idx] is not None:
+                return self._widgets[idx].frame
+        return self.header
     
     def clear(self):
         """Limpiar todas las filas"""
+        self._renderer.cancel()
         for row in self.rows:
-            row.destroy()
+            if row is not None:
+                row.destroy()
+        self.rows = []
+        self.keys = []
+        self._widgets = []
+        self._positions = None
+        self._pending = {}
+    
+    def destroy(self):
+        self._renderer.cancel()
+        super().destroy()
+
+
+def _action_styles(actions):
+    """Íconos y colores de las acciones (lo que se ve de los botones)"""
+    return [(icon, color) for icon, _, color in actions or []]
+
+
+class _RowWidgets:
+    """Widgets de una fila de la tabla"""
+    
+    def __init__(self, frame, cells, actions_frame):
+        self.frame = frame
+        self.cells = cells
+        self.actions_frame = actions_frame
+        self.buttons = []
+        self.entry = None  # Datos mostrados (para no reconfigurar si no cambian)
+
+
+class ScrollingTable(_TableRows, ctk.CTkFrame, metaclass=abc.ABCMeta):
+    """
+    Base de las tablas que guardan los datos y solo dibujan las filas visibles
+    
+    Misma API de filas que DataTable (add_row, update_row, remove_row, sync,
+    index_of, clear). Las subclases definen _fully_visible() y _refresh(),
+    que muestra self.rows desde self._first.
+    """
+    
+    SCROLL_STEP = 3   # Filas por paso de la rueda del mouse
+    
+    def __init__(self, parent, columns, theme=None):
+        super().__init__(parent, fg_color="transparent")
+        
+        self.columns = columns
+        self.theme = theme
+        self.rows = []          # (data, actions, estado_colors) de cada fila
+        self.keys = []          # Clave de cada fila (None si se agregó sin clave)
+        self._positions = None  # Clave -> posición (se arma al consultarla)
+        self._first = 0         # Primera fila visible
+        self._refresh_job = None
+        
+        self.scrollbar = ctk.CTkScrollbar(self, command=self._on_scrollbar)
+        self.scrollbar.pack(side="right", fill="y")
+        self.scrollbar.set(0, 1)
+    
+    def add_row(self, data, actions=None, estado_colors=None, key=None):
+        """
+        Agregar fila (mismos argumentos que DataTable.add_row)
+        
+        Returns:
+            None: las filas no tienen widgets propios
+        """
+        self._append_key(key)
+        self.rows.append((data, actions, estado_colors))
+        self._schedule_refresh()
+    
+    def update_row(self, key, data, actions=None, estado_colors=None):
+        """
+        Reemplazar los datos de una fila; solo se redibuja si está a la vista
+        
+        Returns:
+            True si la fila estaba en la tabla
+        """
+        position = self.index_of(key)
+        if position is None:
+            return False
+        self.rows[position] = (data, actions, estado_colors)
+        if self._first <= position <= self._first + self._fully_visible():
+            self._schedule_refresh()
+        return True
+    
+    def remove_row(self, key):
+        """
+        Quitar una fila
+        
+        Returns:
+            True si la fila estaba en la tabla
+        """
+        position = self.index_of(key)
+        if position is None:
+            return False
+        self._forget_key(position)
+        del self.rows[position]
+        if position <= self._first + self._fully_visible():
+            self._schedule_refresh()
+        return True
+    
+    def sync(self, rows):
+        """
+        Reconciliar la tabla con una lista de filas con clave
+        
+        Solo cambian los datos guardados; al redibujar, las filas visibles
+        reconfiguran únicamente las celdas que cambiaron. La vista se queda
+        en la misma fila de arriba si sigue en la lista.
+        
+        Args:
+            rows: Iterable de (key, data, actions, estado_colors)
+        
+        Returns:
+            RowChanges con las claves insertadas, quitadas, movidas y actualizadas
+        """
+        anchor = self.keys[self._first] if self._first < len(self.keys) else None
+        changes, self.keys, self.rows = diff_rows(self.keys, self.rows, rows)
+        self._positions = None
+        first = self.index_of(anchor) if anchor is not None else None
+        self._first = first or 0
+        self._schedule_refresh()
+        return changes
+    
+    def clear(self):
+        """Limpiar todas las filas"""
         self.rows = []
+        self.keys = []
+        self._positions = None
+        self._first = 0
+        self._schedule_refresh()
+    
+    def destroy(self):
+        if self._refresh_job is not None:
+            self.after_cancel(self._refresh_job)
+            self._refresh_job = None
+        super().destroy()
+    
+    def scroll_to(self, index):
+        """Desplazar la vista para que la fila indicada sea la primera"""
+        first = max(0, min(index, len(self.rows) - self._fully_visible()))
+        if first != self._first:
+            self._first = first
+            self._refresh()
+    
+    def _schedule_refresh(self):
+        """Redibujar una vez, después de una serie de add_row"""
+        if self._refresh_job is None:
+            self._refresh_job = self.after_idle(self._refresh)
+    
+    @abc.abstractmethod
+    def _fully_visible(self):
+        """Filas que caben enteras en la vista"""
+    
+    @abc.abstractmethod
+    def _refresh(self):
+        """Mostrar las filas visibles"""
+    
+    def _visible_slice(self):
+        """Ajustar la primera fila y la barra; devuelve cuántas filas mostrar"""
+        total = len(self.rows)
+        visible = self._fully_visible()
+        self._first = max(0, min(self._first, total - visible))
+        if total:
+            self.scrollbar.set(self._first / total, min(1, (self._first + visible) / total))
+        else:
+            self.scrollbar.set(0, 1)
+        # Una más que las que caben: la última puede verse cortada
+        return min(visible + 1, total - self._first)
+    
+    def _on_mousewheel(self, event):
+        """Rueda del mouse (delta en Windows/macOS, botones 4 y 5 en Linux)"""
+        up = event.num == 4 or getattr(event, "delta", 0) > 0
+        self.scroll_to(self._first + (-self.SCROLL_STEP if up else self.SCROLL_STEP))
+    
+    def _on_scrollbar(self, action, value, unit=None):
+        """Comandos de la barra: ('moveto', fracción) o ('scroll', n, 'units'|'pages')"""
+        if action == "moveto":
+            self.scroll_to(int(float(value) * len(self.rows)))
+        elif action == "scroll":
+            step = self._fully_visible() if unit == "pages" else 1
+            self.scroll_to(self._first + int(value) * step)
+
+
+class VirtualDataTable(ScrollingTable):
+    """
+    Tabla que solo crea los widgets de las filas visibles
+    
+    add_row solo guarda los datos; un grupo fijo de filas, tantas como caben
+    en la vista, se vuelve a llenar al desplazarse. Crear la tabla cuesta lo
+    mismo con 50 que con 50.000 filas.
+    """
+    
+    ROW_HEIGHT = 46   # Alto de cada fila (incluida la separación)
+    
+    def __init__(self, parent, columns, theme=None, height=400):
+        super().__init__(parent, columns, theme)
+        self._viewport_height = height
+        self._pool = []         # Filas de widgets reutilizables
+        self._cells = None      # Columnas de datos (se fija con la primera fila)
+        
+        surface = theme.COLORS["surface"] if theme else "white"
+        viewport = ctk.CTkFrame(self, fg_color=surface)
+        viewport.pack(side="left", fill="both", expand=True)
+        self._create_header(viewport, uniform="columna")
+        
+        # Las filas se ubican con place() dentro del cuerpo
+        self.body = ctk.CTkFrame(viewport, fg_color=surface, height=height)
+        self.body.pack(fill="both", expand=True)
+        self.body.bind("<Configure>", lambda event: self._schedule_refresh(), add="+")
+        self._bind_wheel(self.body)
+    
+    def _row_pixels(self):
+        """Alto de una fila en píxeles (con el escalado de CustomTkinter)"""
+        return self.ROW_HEIGHT * self._get_widget_scaling()
+    
+    def _fully_visible(self):
+        """Filas que caben enteras en la vista"""
+        height = self.body.winfo_height()
+        if height <= 1:
+            # Todavía sin dibujar: se usa el alto pedido
+            height = self._viewport_height * self._get_widget_scaling()
+        return max(1, int(height // self._row_pixels()))
+    
+    def _refresh(self):
+        """Asociar las filas del grupo a los datos visibles"""
+        self._refresh_job = None
+        if not self.winfo_exists():
+            return
+        
+        shown = self._visible_slice()
+        if self._cells is None and self.rows:
+            # La primera fila fija cuántas columnas de datos hay
+            data, actions, _ = self.rows[0]
+            self._cells = min(len(data), len(self.columns) - (1 if actions else 0))
+        while len(self._pool) < shown:
+            self._pool.append(self._create_pooled_row())
+        
+        for position, row in enumerate(self._pool):
+            if position < shown:
+                self._bind_row(row, self.rows[self._first + position])
+                row.frame.place(x=0, y=position * self.ROW_HEIGHT, relwidth=1)
+            else:
+                row.frame.place_forget()
+                row.entry = None
+    
+    def _create_pooled_row(self):
+        """Crear los widgets de una fila vacía"""
+        frame = ctk.CTkFrame(
+            self.body,
+            fg_color=self.theme.COLORS["bg_card"] if self.theme else "white",
+            corner_radius=8
+        )
+        cells = []
+        for idx in range(self._cells or 0):
+            if self.columns[idx] == "Estado":
+                cell = ctk.CTkLabel(
+                    frame,
+                    text="",
+                    font=VeterinariaTheme.font(master=self, size=11, weight="bold"),
+                    corner_radius=12,
+                    height=25,
+                    width=100
+                )
+                cell.grid(row=0, column=idx, padx=5, pady=8)
+            else:
+                cell = ctk.CTkLabel(
+                    frame,
+                    text="",
+                    font=VeterinariaTheme.font(master=self, size=11),
+                    text_color=self.theme.TEXT_PRIMARY if self.theme else "#1e293b",
+                    anchor="center"
+                )
+                cell.grid(row=0, column=idx, padx=5, pady=8, sticky="ew")
+            self._bind_wheel(cell)
+            cells.append(cell)
+        
+        for idx in range(len(self.columns)):
+            frame.grid_columnconfigure(idx, weight=1, uniform="columna")
+        
+        actions_frame = ctk.CTkFrame(frame, fg_color="transparent")
+        actions_frame.grid(row=0, column=len(cells), padx=5, pady=8)
+        self._bind_wheel(frame)
+        return _RowWidgets(frame, cells, actions_frame)
+    
+    def _bind_row(self, row, entry):
+        """Mostrar los datos de una fila en los widgets del grupo (solo lo que cambia)"""
+        if row.entry is entry:
+            return
+        fresh = row.entry is None
+        old_data, old_actions, old_colors = row.entry or ((), None, None)
+        row.entry = entry
+        data, actions, estado_colors = entry
+        
+        for idx, cell in enumerate(row.cells):
+            value = data[idx] if idx < len(data) else ""
+            same = idx < len(old_data) and old_data[idx] == value
+            if self.columns[idx] == "Estado":
+                if not same or estado_colors != old_colors:
+                    bg_color, text_color = self._estado_colors(value, estado_colors)
+                    cell.configure(text=value, fg_color=bg_color, text_color=text_color)
+            elif not same:
+                cell.configure(text=str(value))
+        
+        actions = actions or []
+        old_actions = old_actions or []
+        while len(row.buttons) < len(actions):
+            button = ctk.CTkButton(row.actions_frame, text="", width=35, height=30)
+            self._bind_wheel(button)
+            row.buttons.append(button)
+        for idx, button in enumerate(row.buttons):
+            if idx < len(actions):
+                icon, callback, color = actions[idx]
+                if idx >= len(old_actions):
+                    button.configure(text=icon, fg_color=color, hover_color=color, command=callback)
+                    button.pack(side="left", padx=2)
+                elif old_actions[idx] != actions[idx]:
+                    old_icon, _, old_color = old_actions[idx]
+                    if (old_icon, old_color) != (icon, color):
+                        button.configure(text=icon, fg_color=color, hover_color=color)
+                    button.configure(command=callback)
+            elif idx < len(old_actions) or fresh:
+                button.pack_forget()
+    
+    def _bind_wheel(self, widget):
+        """Desplazar con la rueda del mouse sobre cualquier parte de la tabla"""
+        widget.bind("<MouseWheel>", self._on_mousewheel, add="+")
+        widget.bind("<Button-4>", self._on_mousewheel, add="+")
+        widget.bind("<Button-5>", self._on_mousewheel, add="+")
+
+
+def create_table(parent, columns, theme=None, height=400):
+    """Tabla de un listado con el backend configurado en VETERINARIA_TABLAS"""
+    if TABLE_BACKEND == "canvas":
+        from views.components.canvas_table import CanvasDataTable
+        return CanvasDataTable(parent, columns, theme=theme, height=height)
+    return VirtualDataTable(parent, columns, theme=theme, height=height)
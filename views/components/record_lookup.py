@@ -0,0 +1,106 @@
+"""
+Campo de búsqueda con sugerencias para elegir un registro activo
+"""
+
+from itertools import islice
+
+import customtkinter as ctk
+
+from utils.indexes import get_indexes
+from utils.search import DebouncedSearch, SearchSession
+
+
+class RecordLookup(ctk.CTkFrame):
+    """
+    Entry que sugiere registros activos mientras se escribe
+
+    Busca con SearchSession en los índices de la aplicación (texto y, para
+    clientes, DNI/teléfono), así abrir un formulario no carga la tabla
+    entera: solo se leen las coincidencias y se muestran las primeras.
+    """
+
+    LIMIT = 6  # sugerencias visibles
+
+    def __init__(self, parent, entity, label, theme, placeholder="", on_select=None, **kwargs):
+        super().__init__(parent, fg_color="transparent", **kwargs)
+        self.records = getattr(get_indexes(), entity)
+        self.label = label
+        self.theme = theme
+        self.on_select = on_select
+        self.selected = None
+        self.session = SearchSession(entity)
+
+        self.entry = ctk.CTkEntry(self, height=40, placeholder_text=placeholder)
+        self.entry.pack(fill="x")
+        self.results_frame = ctk.CTkFrame(self, fg_color="transparent")
+        self.results_frame.pack(fill="x")
+
+        self.search = DebouncedSearch(self.entry, self._search, self._show, prepare=self.entry.get)
+        self.entry.bind('<KeyRelease>', self._on_key)
+
+    def _on_key(self, event=None):
+        """Al cambiar el texto se descarta la selección y se buscan sugerencias"""
+        if self.selected is not None and self.entry.get() == self.label(self.selected):
+            return
+        self.selected = None
+        self.search.schedule()
+
+    def _active(self, matches):
+        """Registros activos entre las coincidencias"""
+        return [r for r in self.records.get_many(matches) if r['estado'] == 'Activo']
+
+    def _search(self, query, token):
+        """Primeras sugerencias para el texto"""
+        query = query.strip()
+        if not query:
+            return list(islice((r for r in self.records.ordered() if r['estado'] == 'Activo'), self.LIMIT))
+        return self.session.results(query, None, self._active)[:self.LIMIT]
+
+    def _show(self, records):
+        """Dibujar las sugerencias"""
+        self._clear()
+        if not records:
+            ctk.CTkLabel(self.results_frame, text="Sin resultados", text_color="gray").pack(anchor="w", pady=3)
+            return
+        for record in records:
+            ctk.CTkButton(
+                self.results_frame,
+                text=self.label(record),
+                command=lambda r=record: self._choose(r),
+                anchor="w",
+                fg_color="transparent",
+                border_width=1,
+                border_color=self.theme.COLORS["border"],
+                text_color=self.theme.TEXT_PRIMARY,
+                hover_color=self.theme.COLORS["hover"],
+                height=28
+            ).pack(fill="x", pady=1)
+
+    def _clear(self):
+        """Quitar las sugerencias"""
+        for widget in self.results_frame.winfo_children():
+            widget.destroy()
+
+    def _choose(self, record):
+        """Elegir una sugerencia"""
+        self.set(record)
+        if self.on_select:
+            self.on_select(record)
+
+    def set(self, record):
+        """Mostrar un registro como elegido"""
+        self.search.cancel()
+        self._clear()
+        self.selected = record
+        self.entry.delete(0, 'end')
+        self.entry.insert(0, self.label(record))
+
+    def get(self):
+        """Registro elegido (None si el texto no corresponde a una sugerencia)"""
+        return self.selected
+
+    def disable(self):
+        """Solo lectura"""
+        self.search.cancel()
+        self._clear()
+        self.entry.configure(state="disabled")
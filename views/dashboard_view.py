@@ -3,12 +3,17 @@ Vista del Dashboard principal
 """
 
 import customtkinter as ctk
-from utils.mock_data import CLIENTES, MASCOTAS, CITAS, VETERINARIOS
+from datetime import date
+from utils.executor import get_query_executor
+from utils.indexes import get_indexes, index_lock
+from utils.mock_data import get_citas_by_fecha, get_mascota_by_id, get_veterinario_by_id
 
 
 class DashboardView(ctk.CTkScrollableFrame):
     """Vista del dashboard con estadísticas"""
     
+    AGENDA_MAX = 8
+    
     def __init__(self, parent, app):
         super().__init__(parent, fg_color=app.theme.COLORS["bg"])
         self.app = app
@@ -32,21 +37,21 @@ class DashboardView(ctk.CTkScrollableFrame):
         ctk.CTkLabel(
             welcome_content,
             text="BIENVENIDO/A 🤓",
-            font=ctk.CTkFont(size=28, weight="bold"),
+            font=self.theme.font(master=self, size=28, weight="bold"),
             text_color=self.theme.COLORS["text"]
         ).pack(anchor="w")
         
         ctk.CTkLabel(
             welcome_content,
             text="RECEPCIONISTA",
-            font=ctk.CTkFont(size=20, weight="bold"),
+            font=self.theme.font(master=self, size=20, weight="bold"),
             text_color=self.theme.COLORS["primary"]
         ).pack(anchor="w", pady=(5, 0))
         
         ctk.CTkLabel(
             welcome_content,
             text="Colitas Felices - Veterinaria 🧑🏻‍💻",
-            font=ctk.CTkFont(size=14),
+            font=self.theme.font(master=self, size=14),
             text_color=self.theme.COLORS["text_secondary"]
         ).pack(anchor="w", pady=(5, 0))
         
@@ -57,42 +62,61 @@ class DashboardView(ctk.CTkScrollableFrame):
         # Grid para las tarjetas
         stats_container.grid_columnconfigure((0, 1, 2, 3), weight=1)
         
-        # Calcular estadísticas
+        # Tarjetas de estadísticas (los conteos se calculan en el ejecutor)
         stats_data = [
             {
+                "key": "mascotas",
+                "estado": "Activo",
                 "title": "Mascotas registradas",
-                "value": len([m for m in MASCOTAS if m["estado"] == "Activo"]),
                 "icon": "🐾",
                 "color": self.theme.get_stat_color("mascotas")
             },
             {
+                "key": "citas",
+                "estado": "Programada",
                 "title": "Citas programadas",
-                "value": len([c for c in CITAS if c["estado"] == "Programada"]),
                 "icon": "📅",
                 "color": self.theme.get_stat_color("citas")
             },
             {
+                "key": "clientes",
+                "estado": "Activo",
                 "title": "Clientes activos",
-                "value": len([c for c in CLIENTES if c["estado"] == "Activo"]),
                 "icon": "👥",
                 "color": self.theme.get_stat_color("clientes")
             },
             {
+                "key": "veterinarios",
+                "estado": "Activo",
                 "title": "Veterinarios disponibles",
-                "value": len([v for v in VETERINARIOS if v["estado"] == "Activo"]),
                 "icon": "👨‍⚕️",
                 "color": self.theme.get_stat_color("veterinarios")
             }
         ]
         
+        self.stat_labels = {}
         for idx, stat in enumerate(stats_data):
-            self._create_stat_card(stats_container, stat, idx)
+            self.stat_labels[stat["key"]] = self._create_stat_card(stats_container, stat, idx)
+        self._load_stats(stats_data)
+        
+        # Agenda de hoy (se completa después de dibujar el dashboard)
+        self.agenda_frame = ctk.CTkFrame(self, fg_color=self.theme.COLORS["bg_card"], corner_radius=15)
+        self.agenda_frame.pack(fill="x", padx=40, pady=(10, 0))
+        
+        self.agenda_title = ctk.CTkLabel(
+            self.agenda_frame,
+            text="📅 Agenda de hoy",
+            font=self.theme.font(master=self, size=18, weight="bold"),
+            text_color=self.theme.COLORS["text"]
+        )
+        self.agenda_title.pack(anchor="w", padx=20, pady=(15, 10))
+        self.after(50, self._load_agenda)
             
         # Accesos rápidos
         quick_access_title = ctk.CTkLabel(
             self,
             text="Accesos Rápidos",
-            font=ctk.CTkFont(size=20, weight="bold"),
+            font=self.theme.font(master=self, size=20, weight="bold"),
             text_color=self.theme.COLORS["text"]
         )
         quick_access_title.pack(anchor="w", padx=30, pady=(30, 15))
@@ -113,8 +137,82 @@ class DashboardView(ctk.CTkScrollableFrame):
         for idx, (text, icon, command, color) in enumerate(actions):
             self._create_action_button(actions_container, text, icon, command, color, idx)
             
+    def _load_stats(self, stats_data):
+        """Contar los registros por estado fuera del hilo de Tk (índices en memoria)"""
+        counts = get_indexes().counts
+        queries = [(stat["key"], counts[stat["key"]], stat["estado"]) for stat in stats_data]
+        
+        def count(token):
+            with index_lock.read():
+                return {key: index.count(estado) for key, index, estado in queries}
+        
+        get_query_executor().submit(self, count, self._show_stats)
+    
+    def _show_stats(self, values):
+        """Mostrar los conteos en las tarjetas"""
+        for key, value in values.items():
+            self.stat_labels[key].configure(text=str(value).zfill(2))
+    
+    def _load_agenda(self):
+        """Listar las citas de hoy (índice por fecha)"""
+        if not self.winfo_exists():
+            return
+        
+        citas = get_citas_by_fecha(date.today())
+        self.agenda_title.configure(text=f"📅 Agenda de hoy ({len(citas)} citas)")
+        
+        if not citas:
+            ctk.CTkLabel(
+                self.agenda_frame,
+                text="No hay citas para hoy",
+                font=self.theme.font(master=self, size=13),
+                text_color=self.theme.COLORS["text_secondary"]
+            ).pack(anchor="w", padx=20, pady=(0, 15))
+            return
+        
+        for cita in citas[:self.AGENDA_MAX]:
+            mascota = get_mascota_by_id(cita['id_mascota'])
+            vet = get_veterinario_by_id(cita['id_veterinario'])
+            mascota_nom = mascota['nombre_mascota'] if mascota else "Desconocido"
+            vet_nom = f"{vet['nombres']} {vet['apellidos']}" if vet else "Sin asignar"
+            
+            row = ctk.CTkFrame(self.agenda_frame, fg_color="transparent")
+            row.pack(fill="x", padx=20, pady=2)
+            
+            ctk.CTkLabel(
+                row,
+                text=cita['hora'],
+                font=self.theme.font(master=self, size=13, weight="bold"),
+                text_color=self.theme.COLORS["primary"],
+                width=60,
+                anchor="w"
+            ).pack(side="left")
+            
+            ctk.CTkLabel(
+                row,
+                text=f"🐾 {mascota_nom}  ·  {vet_nom}  ·  {cita['motivo']}",
+                font=self.theme.font(master=self, size=13),
+                text_color=self.theme.COLORS["text"],
+                anchor="w"
+            ).pack(side="left", padx=10)
+            
+            ctk.CTkLabel(
+                row,
+                text=cita['estado'],
+                font=self.theme.font(master=self, size=12),
+                text_color=self.theme.COLORS["text_secondary"]
+            ).pack(side="right")
+        
+        restantes = len(citas) - self.AGENDA_MAX
+        ctk.CTkLabel(
+            self.agenda_frame,
+            text=f"… y {restantes} más en Gestionar Citas" if restantes > 0 else "",
+            font=self.theme.font(master=self, size=12),
+            text_color=self.theme.COLORS["text_secondary"]
+        ).pack(anchor="w", padx=20, pady=(5, 15))
+            
     def _create_stat_card(self, parent, stat, column):
-        """Crear una tarjeta de estadística"""
+        """Crear una tarjeta de estadística (devuelve la etiqueta del valor)"""
         card = ctk.CTkFrame(
             parent,
             fg_color=self.theme.COLORS["bg_card"],
@@ -130,15 +228,15 @@ class DashboardView(ctk.CTkScrollableFrame):
         icon_label = ctk.CTkLabel(
             content,
             text=stat["icon"],
-            font=ctk.CTkFont(size=40),
+            font=self.theme.font(master=self, size=40),
         )
         icon_label.pack(pady=(0, 10))
         
         # Valor
         value_label = ctk.CTkLabel(
             content,
-            text=str(stat["value"]).zfill(2),
-            font=ctk.CTkFont(size=36, weight="bold"),
+            text="…",
+            font=self.theme.font(master=self, size=36, weight="bold"),
             text_color=stat["color"]
         )
         value_label.pack()
@@ -147,11 +245,12 @@ class DashboardView(ctk.CTkScrollableFrame):
         title_label = ctk.CTkLabel(
             content,
             text=stat["title"],
-            font=ctk.CTkFont(size=13),
+            font=self.theme.font(master=self, size=13),
             text_color=self.theme.COLORS["text_secondary"],
             wraplength=150
         )
         title_label.pack(pady=(5, 0))
+        return value_label
         
     def _create_action_button(self, parent, text, icon, command, color, column):
         """Crear un botón de acción rápida"""
@@ -161,7 +260,7 @@ class DashboardView(ctk.CTkScrollableFrame):
         btn = ctk.CTkButton(
             btn_frame,
             text=f"{icon}\n{text}",
-            font=ctk.CTkFont(size=14, weight="bold"),
+            font=self.theme.font(master=self, size=14, weight="bold"),
             fg_color=color,
             hover_color=self._darken_color(color),
             height=100,
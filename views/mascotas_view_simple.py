@@ -4,10 +4,15 @@ Vista de mascotas - Versión Simplificada y FUNCIONAL
 
 import customtkinter as ctk
 from tkinter import messagebox
-from utils.mock_data import MASCOTAS, CLIENTES, get_cliente_by_id, get_nombre_completo_cliente
-from views.components.data_table import DataTable
+from utils.mock_data import get_cliente_by_id, get_nombre_completo_cliente
+from utils.database import get_database
+from utils.indexes import get_indexes
+from views.components.data_table import create_table
+from views.components.record_lookup import RecordLookup
 from utils.animations import NotificationManager
+from utils.exporter import export_view
 from utils.event_manager import AppContext, AppEvents
+from utils.search import DebouncedSearch, SearchSession
 
 
 class MascotaFormDialog(ctk.CTkToplevel):
@@ -57,7 +62,7 @@ class MascotaFormDialog(ctk.CTkToplevel):
         ctk.CTkLabel(
             title_frame,
             text={'add': '➕ NUEVA MASCOTA', 'edit': '✏️ EDITAR MASCOTA', 'view': '👁️ VER MASCOTA'}[self.mode],
-            font=ctk.CTkFont(size=16, weight="bold"),
+            font=self.theme.font(master=self, size=16, weight="bold"),
             text_color="white"
         ).pack(pady=15)
         
@@ -66,29 +71,29 @@ class MascotaFormDialog(ctk.CTkToplevel):
         form.pack(fill="both", expand=True)
         
         # Nombre
-        ctk.CTkLabel(form, text="Nombre (*)", anchor="w", font=ctk.CTkFont(weight="bold")).pack(fill="x", pady=(5, 2))
+        ctk.CTkLabel(form, text="Nombre (*)", anchor="w", font=self.theme.font(master=self, weight="bold")).pack(fill="x", pady=(5, 2))
         self.nombre_entry = ctk.CTkEntry(form, height=40)
         self.nombre_entry.pack(fill="x", pady=(0, 10))
         
         # Especie
-        ctk.CTkLabel(form, text="Especie (*)", anchor="w", font=ctk.CTkFont(weight="bold")).pack(fill="x", pady=(5, 2))
+        ctk.CTkLabel(form, text="Especie (*)", anchor="w", font=self.theme.font(master=self, weight="bold")).pack(fill="x", pady=(5, 2))
         self.especie_combo = ctk.CTkComboBox(form, values=["Perro", "Gato", "Ave", "Conejo", "Otro"], state="readonly", height=40)
         self.especie_combo.set("Perro")
         self.especie_combo.pack(fill="x", pady=(0, 10))
         
         # Raza
-        ctk.CTkLabel(form, text="Raza (*)", anchor="w", font=ctk.CTkFont(weight="bold")).pack(fill="x", pady=(5, 2))
+        ctk.CTkLabel(form, text="Raza (*)", anchor="w", font=self.theme.font(master=self, weight="bold")).pack(fill="x", pady=(5, 2))
         self.raza_entry = ctk.CTkEntry(form, height=40)
         self.raza_entry.pack(fill="x", pady=(0, 10))
         
         # Sexo
-        ctk.CTkLabel(form, text="Sexo (*)", anchor="w", font=ctk.CTkFont(weight="bold")).pack(fill="x", pady=(5, 2))
+        ctk.CTkLabel(form, text="Sexo (*)", anchor="w", font=self.theme.font(master=self, weight="bold")).pack(fill="x", pady=(5, 2))
         self.sexo_combo = ctk.CTkComboBox(form, values=["Macho", "Hembra"], state="readonly", height=40)
         self.sexo_combo.set("Macho")
         self.sexo_combo.pack(fill="x", pady=(0, 10))
         
         # Color
-        ctk.CTkLabel(form, text="Color (*)", anchor="w", font=ctk.CTkFont(weight="bold")).pack(fill="x", pady=(5, 2))
+        ctk.CTkLabel(form, text="Color (*)", anchor="w", font=self.theme.font(master=self, weight="bold")).pack(fill="x", pady=(5, 2))
         self.color_entry = ctk.CTkEntry(form, height=40)
         self.color_entry.pack(fill="x", pady=(0, 10))
         
@@ -98,33 +103,30 @@ class MascotaFormDialog(ctk.CTkToplevel):
         
         edad_left = ctk.CTkFrame(edad_frame, fg_color="transparent")
         edad_left.pack(side="left", fill="both", expand=True, padx=(0, 5))
-        ctk.CTkLabel(edad_left, text="Edad (años) (*)", anchor="w", font=ctk.CTkFont(weight="bold")).pack(fill="x")
+        ctk.CTkLabel(edad_left, text="Edad (años) (*)", anchor="w", font=self.theme.font(master=self, weight="bold")).pack(fill="x")
         self.edad_años_entry = ctk.CTkEntry(edad_left, height=40)
         self.edad_años_entry.pack(fill="x")
         
         edad_right = ctk.CTkFrame(edad_frame, fg_color="transparent")
         edad_right.pack(side="right", fill="both", expand=True, padx=(5, 0))
-        ctk.CTkLabel(edad_right, text="Meses", anchor="w", font=ctk.CTkFont(weight="bold")).pack(fill="x")
+        ctk.CTkLabel(edad_right, text="Meses", anchor="w", font=self.theme.font(master=self, weight="bold")).pack(fill="x")
         self.edad_meses_entry = ctk.CTkEntry(edad_right, height=40)
         self.edad_meses_entry.insert(0, "0")
         self.edad_meses_entry.pack(fill="x")
         
         # Peso
-        ctk.CTkLabel(form, text="Peso (kg) (*)", anchor="w", font=ctk.CTkFont(weight="bold")).pack(fill="x", pady=(5, 2))
+        ctk.CTkLabel(form, text="Peso (kg) (*)", anchor="w", font=self.theme.font(master=self, weight="bold")).pack(fill="x", pady=(5, 2))
         self.peso_entry = ctk.CTkEntry(form, height=40)
         self.peso_entry.pack(fill="x", pady=(0, 10))
         
         # Cliente
-        ctk.CTkLabel(form, text="Dueño (*)", anchor="w", font=ctk.CTkFont(weight="bold")).pack(fill="x", pady=(5, 2))
-        clientes_activos = [c for c in CLIENTES if c['estado'] == 'Activo']
-        opciones = [f"{c['nombres']} {c['apellidos']} ({c['dni']})" for c in clientes_activos]
-        self.cliente_combo = ctk.CTkComboBox(form, values=opciones, state="readonly", height=40)
-        if opciones:
-            self.cliente_combo.set(opciones[0])
-        self.cliente_combo.pack(fill="x", pady=(0, 10))
+        ctk.CTkLabel(form, text="Dueño (*)", anchor="w", font=self.theme.font(master=self, weight="bold")).pack(fill="x", pady=(5, 2))
+        self.cliente_lookup = RecordLookup(form, 'clientes', lambda c: f"{c['nombres']} {c['apellidos']} ({c['dni']})",
+                                           self.theme, placeholder="🔍 DNI, teléfono o nombre del dueño...")
+        self.cliente_lookup.pack(fill="x", pady=(0, 10))
         
         # Estado
-        ctk.CTkLabel(form, text="Estado", anchor="w", font=ctk.CTkFont(weight="bold")).pack(fill="x", pady=(5, 2))
+        ctk.CTkLabel(form, text="Estado", anchor="w", font=self.theme.font(master=self, weight="bold")).pack(fill="x", pady=(5, 2))
         self.estado_combo = ctk.CTkComboBox(form, values=["Activo", "Inactivo"], state="readonly", height=40)
         self.estado_combo.set("Activo")
         self.estado_combo.pack(fill="x", pady=(0, 10))
@@ -156,15 +158,15 @@ class MascotaFormDialog(ctk.CTkToplevel):
             # Seleccionar cliente
             cliente = get_cliente_by_id(self.mascota.get('id_cliente'))
             if cliente:
-                valor = f"{cliente['nombres']} {cliente['apellidos']} ({cliente['dni']})"
-                self.cliente_combo.set(valor)
+                self.cliente_lookup.set(cliente)
     
     def _disable_fields(self):
         """Deshabilitar campos"""
         for widget in [self.nombre_entry, self.raza_entry, self.color_entry, self.edad_años_entry, self.edad_meses_entry, self.peso_entry]:
             widget.configure(state="disabled")
-        for combo in [self.especie_combo, self.sexo_combo, self.cliente_combo, self.estado_combo]:
+        for combo in [self.especie_combo, self.sexo_combo, self.estado_combo]:
             combo.configure(state="disabled")
+        self.cliente_lookup.disable()
     
     def _save(self):
         """Guardar mascota"""
@@ -187,13 +189,10 @@ class MascotaFormDialog(ctk.CTkToplevel):
             messagebox.showerror("Error", "Edad y peso deben ser números válidos")
             return
         
-        # Obtener ID del cliente seleccionado
-        cliente_str = self.cliente_combo.get()
-        dni = cliente_str.split('(')[-1].replace(')', '')
-        cliente = next((c for c in CLIENTES if c['dni'] == dni), None)
-        
+        # Cliente elegido en la búsqueda
+        cliente = self.cliente_lookup.get()
         if not cliente:
-            messagebox.showerror("Error", "Cliente no encontrado")
+            messagebox.showerror("Error", "Elija el dueño entre las sugerencias de la búsqueda")
             return
         
         # Crear resultado
@@ -211,11 +210,12 @@ class MascotaFormDialog(ctk.CTkToplevel):
         }
         
         if self.mode == 'add':
-            self.result['id_mascota'] = max([m.get('id_mascota', 0) for m in MASCOTAS] + [0]) + 1
+            self.result = get_database().mascotas.add(self.result)
             self.event_manager.emit(AppEvents.MASCOTA_ADDED, {'mascota': self.result})
             NotificationManager.show_success(self.master, "✓ Mascota agregada")
         else:
             self.result['id_mascota'] = self.mascota['id_mascota']
+            get_database().mascotas.update(self.result)
             self.event_manager.emit(AppEvents.MASCOTA_UPDATED, {'mascota': self.result})
             NotificationManager.show_success(self.master, "✓ Mascota actualizada")
         
@@ -229,8 +229,12 @@ class MascotasViewSimple(ctk.CTkScrollableFrame):
         super().__init__(parent, fg_color=app.theme.COLORS["bg"])
         self.app = app
         self.theme = app.theme
-        self.mascotas = MASCOTAS.copy()
-        self.filtered_mascotas = self.mascotas.copy()
+        self.database = get_database()
+        self.indexes = get_indexes()
+        self.filtered_mascotas = list(self.indexes.mascotas.ordered())
+        self.search_session = SearchSession('mascotas')
+        self.search_controller = DebouncedSearch(self, self._filter, self._show_filtered,
+                                                 prepare=self._filter_state, background=True)
         
         # Contexto
         self.context = AppContext()
@@ -247,22 +251,25 @@ class MascotasViewSimple(ctk.CTkScrollableFrame):
     def _on_mascota_added(self, event):
         mascota = event.data.get('mascota')
         if mascota:
-            self.mascotas.append(mascota)
+            self.search_session.invalidate()
             self._apply_filters()
     
     def _on_mascota_updated(self, event):
         mascota = event.data.get('mascota')
         if mascota:
-            for i, m in enumerate(self.mascotas):
-                if m['id_mascota'] == mascota['id_mascota']:
-                    self.mascotas[i].update(mascota)
-                    break
+            # El índice ya tiene los cambios; la fila se corrige al instante y el filtro la reubica si hace falta
+            m = self.indexes.mascotas.get(mascota['id_mascota'])
+            position = self.table.index_of(mascota['id_mascota'])
+            if m is not None and position is not None:
+                self.table.update_row(*self._table_row(position + 1, m))
+            self.search_session.invalidate()
             self._apply_filters()
     
     def _on_mascota_deleted(self, event):
         mascota_id = event.data.get('mascota_id')
         if mascota_id:
-            self.mascotas = [m for m in self.mascotas if m['id_mascota'] != mascota_id]
+            self.table.remove_row(mascota_id)
+            self.search_session.invalidate()
             self._apply_filters()
     
     def _create_widgets(self):
@@ -271,7 +278,7 @@ class MascotasViewSimple(ctk.CTkScrollableFrame):
         header = ctk.CTkFrame(self, fg_color="transparent")
         header.pack(fill="x", padx=20, pady=(20, 10))
         
-        title = ctk.CTkLabel(header, text="GESTIÓN DE MASCOTAS 🐾", font=ctk.CTkFont(size=24, weight="bold"), text_color=self.theme.PRIMARY)
+        title = ctk.CTkLabel(header, text="GESTIÓN DE MASCOTAS 🐾", font=self.theme.font(master=self, size=24, weight="bold"), text_color=self.theme.PRIMARY)
         title.pack(side="left")
         
         btn_frame = ctk.CTkFrame(header, fg_color="transparent")
@@ -279,6 +286,7 @@ class MascotasViewSimple(ctk.CTkScrollableFrame):
         
         ctk.CTkButton(btn_frame, text="🔄", command=self._refresh, width=50, fg_color=self.theme.ACCENT, hover_color="#6d28d9").pack(side="right", padx=5)
         ctk.CTkButton(btn_frame, text="➕ Nueva Mascota", command=self._add_mascota, fg_color="#10b981", hover_color="#059669", width=160).pack(side="right", padx=5)
+        ctk.CTkButton(btn_frame, text="📤 Exportar", command=self._export, fg_color="#6b7280", hover_color="#4b5563", width=120).pack(side="right", padx=5)
         
         # Búsqueda
         search_frame = ctk.CTkFrame(self, fg_color="transparent")
@@ -286,7 +294,7 @@ class MascotasViewSimple(ctk.CTkScrollableFrame):
         
         self.search_entry = ctk.CTkEntry(search_frame, placeholder_text="🔍 Buscar por nombre...", height=40)
         self.search_entry.pack(side="left", fill="x", expand=True, padx=(0, 10))
-        self.search_entry.bind('<KeyRelease>', lambda e: self._apply_filters())
+        self.search_entry.bind('<KeyRelease>', self.search_controller.schedule)
         
         self.filter_combo = ctk.CTkComboBox(search_frame, values=["Todas las especies", "Perro", "Gato", "Ave", "Conejo", "Otro"], command=lambda v: self._apply_filters(), width=200)
         self.filter_combo.set("Todas las especies")
@@ -299,69 +307,76 @@ class MascotasViewSimple(ctk.CTkScrollableFrame):
         self.table_container.pack(fill="both", expand=True, padx=20, pady=10)
         
         # Contador
-        self.count_label = ctk.CTkLabel(self.table_container, text="", font=ctk.CTkFont(size=12), text_color=self.theme.TEXT_SECONDARY)
-        self.count_label.pack(pady=10)
-    
-    def _update_table(self):
-        """Actualizar tabla"""
-        # Limpiar tabla anterior
-        for widget in self.table_container.winfo_children():
-            if isinstance(widget, DataTable):
-                widget.destroy()
-        
+        self.count_label = ctk.CTkLabel(self.table_container, text="", font=self.theme.font(master=self, size=12), text_color=self.theme.TEXT_SECONDARY)
         self.count_label.pack(pady=10)
-        self.count_label.configure(text=f"Mostrando {len(self.filtered_mascotas)} de {len(self.mascotas)} mascotas")
         
-        # Crear tabla
+        # Tabla (se crea una vez; cada filtro la reconcilia)
         columns = ["N°", "Nombre", "Especie", "Raza", "Sexo", "Edad", "Peso (kg)", "Dueño", "Estado", "Acciones"]
         
-        self.table = DataTable(
+        self.table = create_table(
             self.table_container,
             columns=columns,
             theme=self.theme,
             height=400
         )
         self.table.pack(fill="both", expand=True, padx=10, pady=(0, 10))
-        
-        # Poblar datos
-        for idx, mascota in enumerate(self.filtered_mascotas, 1):
-            cliente = get_cliente_by_id(mascota['id_cliente'])
-            cliente_nombre = get_nombre_completo_cliente(mascota['id_cliente']) if cliente else "N/A"
-            edad_str = f"{mascota['edad_años']}a {mascota['edad_meses']}m"
-            
-            row_data = [
-                str(idx),
-                mascota['nombre_mascota'],
-                mascota['especie'],
-                mascota['raza'],
-                mascota['sexo'],
-                edad_str,
-                f"{mascota['peso_kg']} kg",
-                cliente_nombre,
-                mascota['estado']
-            ]
-            
-            actions = [
-                ("👁️", lambda m=mascota: self._view_mascota(m), self.theme.INFO),
-                ("✏️", lambda m=mascota: self._edit_mascota(m), self.theme.ACCENT),
-                ("🗑️", lambda m=mascota: self._delete_mascota(m), self.theme.DANGER)
-            ]
-            
-            self.table.add_row(row_data, actions)
     
-    def _apply_filters(self):
-        """Aplicar filtros"""
-        search = self.search_entry.get().lower()
-        especie = self.filter_combo.get()
+    def _update_table(self):
+        """Actualizar tabla (solo las filas que entran, salen o cambian)"""
+        self.count_label.configure(text=f"Mostrando {len(self.filtered_mascotas)} de {len(self.indexes.mascotas)} mascotas")
+        self.table.sync(self._table_row(idx, mascota) for idx, mascota in enumerate(self.filtered_mascotas, 1))
+    
+    def _table_row(self, number, mascota):
+        """Fila de la tabla de una mascota: (ID, datos, acciones, colores)"""
+        cliente = get_cliente_by_id(mascota['id_cliente'])
+        cliente_nombre = get_nombre_completo_cliente(mascota['id_cliente']) if cliente else "N/A"
+        edad_str = f"{mascota['edad_años']}a {mascota['edad_meses']}m"
+        
+        row_data = [
+            str(number),
+            mascota['nombre_mascota'],
+            mascota['especie'],
+            mascota['raza'],
+            mascota['sexo'],
+            edad_str,
+            f"{mascota['peso_kg']} kg",
+            cliente_nombre,
+            mascota['estado']
+        ]
         
-        self.filtered_mascotas = [
-            m for m in self.mascotas
-            if (search in m['nombre_mascota'].lower() or search in m['raza'].lower())
-            and (especie == "Todas las especies" or m['especie'] == especie)
+        actions = [
+            ("👁️", lambda m=mascota: self._view_mascota(m), self.theme.INFO),
+            ("✏️", lambda m=mascota: self._edit_mascota(m), self.theme.ACCENT),
+            ("🗑️", lambda m=mascota: self._delete_mascota(m), self.theme.DANGER)
         ]
         
+        return mascota['id_mascota'], row_data, actions, None
+    
+    def _filter_state(self):
+        """Texto de búsqueda, filtros y tupla inmutable de registros (se leen en el hilo de Tk)"""
+        return self.search_entry.get(), self.filter_combo.get(), self.indexes.mascotas.ordered()
+    
+    def _filter(self, state, token):
+        """Lista filtrada según la búsqueda y los filtros (corre en el ejecutor)"""
+        query, especie, todas = state
+        
+        def compute(matches):
+            # Con texto solo se traen los registros que coinciden
+            mascotas = todas if matches is None else self.indexes.mascotas.get_many(matches)
+            return [m for m in mascotas if especie == "Todas las especies" or m['especie'] == especie]
+        
+        return (self.search_session.results(query, (especie,), compute)
+                or self.search_session.similar(query, compute))
+    
+    def _show_filtered(self, mascotas):
+        """Mostrar el resultado de la búsqueda"""
+        self.filtered_mascotas = mascotas
         self._update_table()
     
+    def _apply_filters(self):
+        """Aplicar filtros"""
+        self.search_controller.run_now()
+    
     def _clear_filters(self):
         """Limpiar filtros"""
         self.search_entry.delete(0, 'end')
@@ -370,10 +385,14 @@ class MascotasViewSimple(ctk.CTkScrollableFrame):
     
     def _refresh(self):
         """Refrescar"""
-        self.filtered_mascotas = self.mascotas.copy()
+        self.filtered_mascotas = list(self.indexes.mascotas.ordered())
         self._update_table()
         NotificationManager.show_success(self, "✓ Datos actualizados")
     
+    def _export(self):
+        """Exportar las filas que se están mostrando"""
+        export_view(self, 'mascotas', self.filtered_mascotas)
+    
     def _add_mascota(self):
         """Agregar mascota"""
         dialog = MascotaFormDialog(self, 'add', None, self.theme, self.event_manager)
@@ -392,5 +411,6 @@ class MascotasViewSimple(ctk.CTkScrollableFrame):
     def _delete_mascota(self, mascota):
         """Eliminar mascota"""
         if messagebox.askyesno("Confirmar", f"¿Eliminar a {mascota['nombre_mascota']}?"):
+            self.database.mascotas.delete(mascota['id_mascota'])
             self.event_manager.emit(AppEvents.MASCOTA_DELETED, {'mascota_id': mascota['id_mascota']})
             NotificationManager.show_success(self, "✓ Mascota eliminada")
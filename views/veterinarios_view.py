@@ -4,8 +4,9 @@ Vista de veterinarios
 
 import customtkinter as ctk
 from tkinter import messagebox
-from utils.mock_data import VETERINARIOS
-from views.components.data_table import DataTable
+from utils.indexes import get_indexes
+from utils.search import DebouncedSearch, SearchSession
+from views.components.data_table import create_table
 
 
 class VeterinariosView(ctk.CTkScrollableFrame):
@@ -15,8 +16,11 @@ class VeterinariosView(ctk.CTkScrollableFrame):
         super().__init__(parent, fg_color=app.theme.COLORS["bg"])
         self.app = app
         self.theme = app.theme
-        self.veterinarios = VETERINARIOS.copy()
-        self.filtered_veterinarios = self.veterinarios.copy()
+        self.indexes = get_indexes()
+        self.filtered_veterinarios = list(self.indexes.veterinarios.ordered())
+        self.search_session = SearchSession('veterinarios')
+        self.search_controller = DebouncedSearch(self, self._filter, self._show_filtered,
+                                                 prepare=self._filter_state, background=True)
         
         self._create_widgets()
         self._update_table()
@@ -31,14 +35,14 @@ class VeterinariosView(ctk.CTkScrollableFrame):
         ctk.CTkLabel(
             header,
             text="VETERINARIOS 👨‍⚕️",
-            font=ctk.CTkFont(size=24, weight="bold"),
+            font=self.theme.font(master=self, size=24, weight="bold"),
             text_color=self.theme.COLORS["text"]
         ).pack(anchor="w")
         
         ctk.CTkLabel(
             header,
             text="Lista de veterinarios disponibles en la clínica",
-            font=ctk.CTkFont(size=13),
+            font=self.theme.font(master=self, size=13),
             text_color=self.theme.COLORS["text_secondary"]
         ).pack(anchor="w", pady=(5, 0))
         
@@ -55,13 +59,13 @@ class VeterinariosView(ctk.CTkScrollableFrame):
         search_frame.grid(row=0, column=0, sticky="ew", padx=(0, 10))
         
         self.search_var = ctk.StringVar()
-        self.search_var.trace("w", lambda *args: self._apply_filters())
+        self.search_var.trace("w", lambda *args: self.search_controller.schedule())
         
         self.search_entry = ctk.CTkEntry(
             search_frame,
             placeholder_text="🔍 Buscar por nombre o especialidad...",
             height=40,
-            font=ctk.CTkFont(size=13),
+            font=self.theme.font(master=self, size=13),
             textvariable=self.search_var
         )
         self.search_entry.pack(fill="x")
@@ -76,7 +80,7 @@ class VeterinariosView(ctk.CTkScrollableFrame):
             values=["Todos los estados", "Activo", "Inactivo"],
             variable=self.estado_var,
             height=40,
-            font=ctk.CTkFont(size=13),
+            font=self.theme.font(master=self, size=13),
             command=lambda x: self._apply_filters()
         )
         estado_menu.pack()
@@ -86,7 +90,7 @@ class VeterinariosView(ctk.CTkScrollableFrame):
             filters_content,
             text="Limpiar filtros",
             height=40,
-            font=ctk.CTkFont(size=13),
+            font=self.theme.font(master=self, size=13),
             fg_color=self.theme.COLORS["text_secondary"],
             hover_color=self.theme.COLORS["border_dark"],
             command=self._clear_filters
@@ -103,14 +107,14 @@ class VeterinariosView(ctk.CTkScrollableFrame):
         ctk.CTkLabel(
             table_header,
             text="LISTA DE VETERINARIOS",
-            font=ctk.CTkFont(size=16, weight="bold"),
+            font=self.theme.font(master=self, size=16, weight="bold"),
             text_color=self.theme.COLORS["text"]
         ).pack(side="left")
         
         self.results_label = ctk.CTkLabel(
             table_header,
             text="",
-            font=ctk.CTkFont(size=12),
+            font=self.theme.font(master=self, size=12),
             text_color=self.theme.COLORS["text_secondary"]
         )
         self.results_label.pack(side="right")
@@ -119,17 +123,11 @@ class VeterinariosView(ctk.CTkScrollableFrame):
         self.table_container = ctk.CTkFrame(table_frame, fg_color="transparent")
         self.table_container.pack(fill="both", expand=True, padx=20, pady=(0, 20))
         
-    def _update_table(self):
-        """Actualizar la tabla de veterinarios"""
-        # Limpiar tabla anterior
-        for widget in self.table_container.winfo_children():
-            widget.destroy()
-            
         # Definir columnas
         columns = ["N°", "DNI", "Nombre Completo", "Especialidad", "Colegiatura", "Teléfono", "Email", "Estado", "Acciones"]
         
-        # Crear tabla
-        self.table = DataTable(
+        # Crear tabla (una sola vez; cada filtro la reconcilia)
+        self.table = create_table(
             self.table_container,
             columns=columns,
             theme=self.theme,
@@ -137,33 +135,37 @@ class VeterinariosView(ctk.CTkScrollableFrame):
         )
         self.table.pack(fill="both", expand=True, padx=10, pady=(0, 10))
         
-        # Agregar filas
-        for idx, vet in enumerate(self.filtered_veterinarios, 1):
-            nombre_completo = f"{vet['nombres']} {vet['apellidos']}"
-            
-            row_data = [
-                str(idx),
-                vet.get('dni', 'N/A'),
-                nombre_completo,
-                vet['especialidad'],
-                vet.get('num_colegiatura', 'N/A'),
-                vet.get('telefono', 'N/A'),
-                vet.get('email', 'N/A'),
-                vet['estado']
-            ]
-            
-            actions = [
-                ("👁️", lambda v=vet: self._view_veterinario(v), self.theme.INFO)
-            ]
-            
-            self.table.add_row(row_data, actions)
+    def _update_table(self):
+        """Actualizar la tabla de veterinarios (solo las filas que cambian)"""
+        self.table.sync(self._table_row(idx, vet) for idx, vet in enumerate(self.filtered_veterinarios, 1))
         
         # Actualizar etiqueta de resultados
         self._update_results_label()
         
+    def _table_row(self, number, vet):
+        """Fila de la tabla de un veterinario: (ID, datos, acciones, colores)"""
+        nombre_completo = f"{vet['nombres']} {vet['apellidos']}"
+        
+        row_data = [
+            str(number),
+            vet.get('dni', 'N/A'),
+            nombre_completo,
+            vet['especialidad'],
+            vet.get('num_colegiatura', 'N/A'),
+            vet.get('telefono', 'N/A'),
+            vet.get('email', 'N/A'),
+            vet['estado']
+        ]
+        
+        actions = [
+            ("👁️", lambda v=vet: self._view_veterinario(v), self.theme.INFO)
+        ]
+        
+        return vet['id'], row_data, actions, None
+        
     def _update_results_label(self):
         """Actualizar etiqueta de resultados"""
-        total = len(self.veterinarios)
+        total = len(self.indexes.veterinarios)
         filtered = len(self.filtered_veterinarios)
         
         if filtered < total:
@@ -171,27 +173,35 @@ class VeterinariosView(ctk.CTkScrollableFrame):
         else:
             self.results_label.configure(text=f"Total: {total} veterinarios")
             
+    def _filter_state(self):
+        """Texto de búsqueda, filtros y tupla inmutable de registros (se leen en el hilo de Tk)"""
+        return self.search_var.get(), self.estado_var.get(), self.indexes.veterinarios.ordered()
+    
+    def _filter(self, state, token):
+        """Lista filtrada según la búsqueda y los filtros (corre en el ejecutor)"""
+        query, estado, todos = state
+        
+        def compute(matches):
+            # Filtro de búsqueda (solo se traen los registros que coinciden)
+            if matches is None:
+                veterinarios = todos
+            else:
+                veterinarios = self.indexes.veterinarios.get_many(matches)
+            # Filtro de estado
+            if estado in ["Activo", "Inactivo"]:
+                veterinarios = [v for v in veterinarios if v['estado'] == estado]
+            return veterinarios
+        
+        return self.search_session.results(query, (estado,), compute)
+    
+    def _show_filtered(self, veterinarios):
+        """Mostrar el resultado de la búsqueda"""
+        self.filtered_veterinarios = veterinarios
+        self._update_table()
+    
     def _apply_filters(self):
         """Aplicar filtros a la lista de veterinarios"""
-        search = self.search_var.get().lower()
-        estado = self.estado_var.get()
-        
-        self.filtered_veterinarios = self.veterinarios.copy()
-        
-        # Filtro de búsqueda
-        if search:
-            self.filtered_veterinarios = [
-                v for v in self.filtered_veterinarios
-                if search in v['nombres'].lower() or
-                   search in v['apellidos'].lower() or
-                   search in v['especialidad'].lower()
-            ]
-            
-        # Filtro de estado
-        if estado in ["Activo", "Inactivo"]:
-            self.filtered_veterinarios = [v for v in self.filtered_veterinarios if v['estado'] == estado]
-            
-        self._update_table()
+        self.search_controller.run_now()
         
     def _clear_filters(self):
         """Limpiar todos los filtros"""